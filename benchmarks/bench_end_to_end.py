@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark for gmail-cli.
+
+Runs the full `gmail-cli` flow (list, metadata fetch, table formatting and
+rendering) against the local Gmail emulator at several inbox sizes, each in
+a fresh interpreter. Records wall time, emails/sec, API calls, HTTP
+requests, bytes transferred and peak RSS, and compares them with a stored
+baseline so regressions of the hot path are flagged. Only the metrics that
+do not depend on the host are compared unless --compare-host is given.
+
+OAuth is skipped by pointing the CLI at the emulator, and the Gmail quota
+pacing of the rate limiter is stubbed out, since it would measure Gmail's
+limits rather than gmail-cli.
+
+Usage:
+    poetry run python benchmarks/bench_end_to_end.py [--sizes 10 1000]
+    poetry run python benchmarks/bench_end_to_end.py --save-baseline
+    poetry run python benchmarks/bench_end_to_end.py --compare
+    poetry run python benchmarks/bench_end_to_end.py --compare --compare-host
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from gmail_cli.gmail_emulator import GmailEmulator
+
+SIZES = (10, 100, 1000, 10_000, 100_000)
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline_end_to_end.json")
+# Relative change of a metric flagged as a regression
+THRESHOLD = 0.25
+# For each compared metric, whether higher values are better. These only
+# depend on the code, so they compare across machines.
+METRICS = {
+    "api_calls": False,
+    "http_requests": False,
+    "bytes_transferred": False,
+}
+# Metrics depending on the speed and platform of the host, only comparable
+# with a baseline recorded on the same machine
+HOST_METRICS = {
+    "emails_per_sec": True,
+    "peak_rss_mb": False,
+}
+
+
+def run_worker(root_url, size, concurrency, metrics_path):
+    """Run the CLI in this interpreter and print wall time and peak RSS."""
+    # pylint: disable=import-outside-toplevel
+    from gmail_cli.main import main as cli
+    from gmail_cli.rate_limiter import TokenBucket
+
+    args = [
+        "--root-url",
+        root_url,
+        "--max-results",
+        str(size),
+        "--concurrency",
+        str(concurrency),
+        "--no-cache",
+        "--no-index",
+        # Files kept next to the token must not land in the working
+        # directory, nor carry over between runs
+        "--token",
+        os.path.join(os.path.dirname(metrics_path), "token.json"),
+        "--metrics-json",
+        metrics_path,
+    ]
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with patch.object(TokenBucket, "acquire", return_value=0.0):
+            with contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                cli.main(args, standalone_mode=False)
+                wall = time.perf_counter() - started
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 / (1024 if sys.platform == "darwin" else 1)
+    print(json.dumps({"wall_s": wall, "peak_rss_mb": rss_mb}))
+
+
+def run_size(size, concurrency):
+    """Benchmark one inbox size against a fresh emulator."""
+    with GmailEmulator(message_count=size) as server:
+        with tempfile.TemporaryDirectory() as directory:
+            metrics_path = os.path.join(directory, "metrics.json")
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--worker",
+                    server.root_url,
+                    "--sizes",
+                    str(size),
+                    "--concurrency",
+                    str(concurrency),
+                    "--metrics-json",
+                    metrics_path,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            with open(metrics_path, "r", encoding="utf-8") as metrics_file:
+                timings = json.load(metrics_file)["timings"]
+        worker = json.loads(result.stdout.splitlines()[-1])
+        calls = server.calls
+        traffic = server.traffic
+
+    return {
+        "wall_s": round(worker["wall_s"], 3),
+        "emails_per_sec": round(size / worker["wall_s"], 1),
+        "api_calls": sum(n for name, n in calls.items() if name != "batch"),
+        "http_requests": traffic["requests"],
+        "bytes_transferred": traffic["bytes_received"] + traffic["bytes_sent"],
+        "peak_rss_mb": round(worker["peak_rss_mb"], 1),
+        "render_ms": round(timings.get("render", {}).get("total_ms", 0), 1),
+    }
+
+
+def compare(results, baseline, threshold, metrics=None):
+    """Return regressions of results against a baseline, as messages."""
+    regressions = []
+    for size, measured in results.items():
+        expected = baseline.get(size)
+        if expected is None:
+            continue
+        for name, higher_is_better in (metrics or METRICS).items():
+            old, new = expected.get(name), measured[name]
+            if not old:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(
+                    f"{size} emails: {name} {old} -> {new} ({change:+.0%})"
+                )
+    return regressions
+
+
+def main():
+    """Run the benchmark, print JSON results and check the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--output", help="Also write the results here")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument(
+        "--compare-host",
+        action="store_true",
+        help="With --compare, also compare emails/sec and peak RSS, for "
+        "a baseline recorded on this machine",
+    )
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--metrics-json", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(
+            args.worker, args.sizes[0], args.concurrency, args.metrics_json
+        )
+        return
+
+    results = {
+        str(size): run_size(size, args.concurrency) for size in args.sizes
+    }
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline:
+            json.dump(results, baseline, indent=2)
+            baseline.write("\n")
+    if args.compare:
+        with open(args.baseline, "r", encoding="utf-8") as baseline:
+            regressions = compare(
+                results,
+                json.load(baseline),
+                args.threshold,
+                {**METRICS, **HOST_METRICS} if args.compare_host else METRICS,
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for gmail-cli.
+
+Times `gmail-cli --version` and `gmail-cli --help` in fresh interpreters,
+next to the bare cost of importing the Google client libraries, and checks
+that neither command imports them.
+
+Usage:
+    poetry run python benchmarks/bench_startup.py [--runs N]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+GOOGLE_MODULES = ("googleapiclient", "google_auth_oauthlib")
+
+COMMANDS = {
+    "gmail-cli --version": [
+        sys.executable,
+        "-m",
+        "gmail_cli.main",
+        "--version",
+    ],
+    "gmail-cli --help": [sys.executable, "-m", "gmail_cli.main", "--help"],
+    "import google client libraries": [
+        sys.executable,
+        "-c",
+        "import googleapiclient.discovery, google_auth_oauthlib.flow",
+    ],
+}
+
+CHECK_IMPORTS = (
+    "import sys\n"
+    "from click.testing import CliRunner\n"
+    "from gmail_cli.main import main\n"
+    "CliRunner().invoke(main, [{flag!r}])\n"
+    "print(sorted(m for m in sys.modules "
+    "if m.split('.')[0] in {modules!r}))\n"
+)
+
+
+def time_command(command, runs):
+    """Return wall times in seconds of running a command several times."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def google_imports(flag):
+    """Return the Google client modules imported by a CLI invocation."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CHECK_IMPORTS.format(flag=flag, modules=GOOGLE_MODULES),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def main():
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    results = {}
+    for name, command in COMMANDS.items():
+        timings = time_command(command, args.runs)
+        results[name] = {
+            "min_ms": round(min(timings) * 1000, 1),
+            "median_ms": round(statistics.median(timings) * 1000, 1),
+        }
+    for flag in ("--version", "--help"):
+        results[f"gmail-cli {flag}"]["google_imports"] = google_imports(flag)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Asyncio Gmail API client for accessing unread emails.
+
+Requires the optional httpx dependency (``pip install gmail-cli[async]``).
+"""
+
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+import httpx
+from google.auth.transport.requests import Request
+from .credential_manager import CredentialManager
+from .email_summary import EmailSummary
+from .gmail_client import GmailClient, report_errors
+from .rate_limiter import GmailRateLimiter
+
+
+class AsyncGmailClient:  # pylint: disable=too-many-instance-attributes
+    """Asyncio client for the Gmail REST API over a pooled HTTP connection."""
+
+    API_ROOT = "https://gmail.googleapis.com/gmail/v1/users/me/"
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        credentials_file: str = "credentials.json",
+        token_file: str = "token.json",
+        concurrency: int = 10,
+        api_root: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[GmailRateLimiter] = None,
+    ):
+        """
+        Initialize the async Gmail client.
+
+        Args:
+            credentials_file: Path to OAuth credentials JSON file
+            token_file: Path to store OAuth token
+            concurrency: Maximum number of requests in flight, which is
+                also the size of the keep-alive connection pool
+            api_root: Base URL of the Gmail user API, for local servers
+            transport: httpx transport, for tests
+            rate_limiter: Limiter whose quota bucket and retry policy every
+                API call follows, defaults to one sized for Gmail's
+                per-user quota
+        """
+        self.credentials_file = credentials_file
+        self.token_file = token_file
+        self.concurrency = max(1, concurrency)
+        self.api_root = api_root or self.API_ROOT
+        self.credentials = None
+        self._transport = transport
+        self.rate_limiter = rate_limiter or GmailRateLimiter()
+        self._http: Optional[httpx.AsyncClient] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncGmailClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def authenticate(self) -> bool:
+        """
+        Authenticate with Gmail API using OAuth 2.0.
+
+        The blocking token load and refresh run in a worker thread.
+
+        Returns:
+            True if authentication successful, False otherwise
+        """
+        manager = CredentialManager.shared(
+            self.credentials_file, self.token_file, GmailClient.SCOPES
+        )
+        creds = await asyncio.to_thread(manager.get_credentials)
+        if not creds:
+            return False
+
+        self.credentials = creds
+        self._refresh_lock = asyncio.Lock()
+        self._http = httpx.AsyncClient(
+            base_url=self.api_root,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            transport=self._transport,
+        )
+        return True
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def get_unread_emails(
+        self, max_results: int = 50
+    ) -> List[EmailSummary]:
+        """
+        Retrieve unread emails from Gmail.
+
+        Args:
+            max_results: Maximum number of emails to retrieve
+
+        Returns:
+            List of email records
+        """
+        if self._http is None:
+            print("Gmail service not initialized. Please authenticate first.")
+            return []
+
+        emails: List[EmailSummary] = []
+        with report_errors(httpx.HTTPStatusError):
+            emails = [
+                email async for email in self.iter_unread_emails(max_results)
+            ]
+            if not emails:
+                print("No unread messages found.")
+        return emails
+
+    async def iter_unread_emails(
+        self, max_results: Optional[int] = None
+    ) -> AsyncIterator[EmailSummary]:
+        """
+        Lazily yield unread emails across all result pages.
+
+        The next page is listed while metadata for the current page is
+        fetched, with at most `concurrency` requests in flight.
+
+        Args:
+            max_results: Maximum number of emails to yield, None for all
+
+        Yields:
+            Email records
+
+        Raises:
+            httpx.HTTPStatusError: If a Gmail API call fails
+        """
+        if self._http is None:
+            print("Gmail service not initialized. Please authenticate first.")
+            return
+
+        remaining = max_results
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        def _page_size() -> int:
+            if remaining is None:
+                return GmailClient.PAGE_SIZE
+            return min(GmailClient.PAGE_SIZE, remaining)
+
+        async def _fetch(message_id: str) -> EmailSummary:
+            async with semaphore:
+                return EmailSummary.from_message(
+                    await self._get(
+                        "messages.get",
+                        f"messages/{message_id}",
+                        {
+                            "format": "metadata",
+                            "metadataHeaders": GmailClient.METADATA_HEADERS,
+                        },
+                    )
+                )
+
+        results = await self._list_page(None, _page_size())
+        while True:
+            message_ids = [m["id"] for m in results.get("messages", [])]
+            if remaining is not None:
+                message_ids = message_ids[:remaining]
+                remaining -= len(message_ids)
+
+            page_token = results.get("nextPageToken")
+            next_page = None
+            if page_token and (remaining is None or remaining > 0):
+                next_page = asyncio.ensure_future(
+                    self._list_page(page_token, _page_size())
+                )
+
+            try:
+                emails = await asyncio.gather(
+                    *(_fetch(message_id) for message_id in message_ids)
+                )
+            except BaseException:
+                if next_page is not None:
+                    next_page.cancel()
+                raise
+
+            for email in emails:
+                yield email
+
+            if next_page is None:
+                return
+            results = await next_page
+
+    async def _list_page(
+        self, page_token: Optional[str], page_size: int
+    ) -> Dict:
+        """
+        List one page of unread message IDs.
+
+        Args:
+            page_token: Token of the page to list, None for the first page
+            page_size: Maximum number of IDs in the page
+
+        Returns:
+            messages.list response
+        """
+        params = {"labelIds": "UNREAD", "maxResults": page_size}
+        if page_token:
+            params["pageToken"] = page_token
+        return await self._get("messages.list", "messages", params)
+
+    async def _get(self, method: str, path: str, params: Dict) -> Dict:
+        """
+        Send an authorized GET request and decode the JSON response.
+
+        Requests are paced by the rate limiter's quota bucket, and
+        throttled or transient errors are retried with its backoff policy,
+        honoring Retry-After, without blocking the event loop.
+
+        Args:
+            method: Gmail method name, used for quota
+            path: Path relative to the user API root
+            params: Query parameters
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            httpx.HTTPStatusError: If Gmail answers with a non-retryable
+                error status or the request runs out of retries
+        """
+        limiter = self.rate_limiter
+        units = limiter.units(method)
+        attempt = 0
+        while True:
+            delay = limiter.bucket.try_acquire(units)
+            while delay:
+                await asyncio.sleep(delay)
+                delay = limiter.bucket.try_acquire(units)
+
+            if not self.credentials.valid:
+                async with self._refresh_lock:
+                    # Another request may have refreshed while we waited
+                    if not self.credentials.valid:
+                        await asyncio.to_thread(
+                            self.credentials.refresh, Request()
+                        )
+
+            response = await self._http.get(
+                path,
+                params=params,
+                headers={"Authorization": f"Bearer {self.credentials.token}"},
+            )
+            if (
+                response.is_error
+                and attempt < limiter.max_retries
+                and limiter.is_retryable(
+                    response.status_code, response.content
+                )
+            ):
+                limiter.throttled += 1
+                await asyncio.sleep(
+                    limiter.retry_delay(
+                        attempt, response.headers.get("retry-after")
+                    )
+                )
+                attempt += 1
+                continue
+            response.raise_for_status()
+            return response.json()
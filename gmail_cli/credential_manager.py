@@ -0,0 +1,318 @@
+"""
+Shared OAuth credentials with locked refresh and atomic token file writes.
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+try:
+    import fcntl
+except ImportError:  # Windows, token refreshes are only locked in-process
+    fcntl = None
+
+
+class ManagedCredentials(Credentials):
+    """Credentials whose refreshes go through their CredentialManager.
+
+    Every Gmail service built on the same instance, including those of
+    worker threads, refreshes through the manager, so concurrent requests
+    that find the token expired trigger a single refresh.
+    """
+
+    manager: Optional["CredentialManager"] = None
+
+    def refresh(self, request) -> None:
+        """
+        Refresh the access token through the manager.
+
+        Args:
+            request: google.auth transport request used for the refresh
+        """
+        if self.manager is None:
+            super().refresh(request)
+        else:
+            self.manager.refresh(self, request)
+
+
+class CredentialManager:
+    """Process-wide holder of the OAuth credentials of one token file."""
+
+    # Tokens this close to expiry are refreshed before use
+    REFRESH_MARGIN = timedelta(minutes=5)
+
+    _shared: Dict[str, "CredentialManager"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        credentials_file: str,
+        token_file: str,
+        scopes: List[str],
+        request_factory: Callable[[], Request] = Request,
+    ):
+        """
+        Initialize the manager; nothing is loaded until first use.
+
+        Args:
+            credentials_file: Path to OAuth credentials JSON file
+            token_file: Path to store OAuth token
+            scopes: OAuth scopes to request
+            request_factory: Builds the transport used for refreshes, for
+                tests
+        """
+        self.credentials_file = credentials_file
+        self.token_file = token_file
+        self.scopes = scopes
+        self.credentials: Optional[ManagedCredentials] = None
+        self.refresh_count = 0
+        self._request_factory = request_factory
+        self._lock = threading.RLock()
+
+    @classmethod
+    def shared(
+        cls, credentials_file: str, token_file: str, scopes: List[str]
+    ) -> "CredentialManager":
+        """
+        Return the manager of a token file, shared within the process.
+
+        Args:
+            credentials_file: Path to OAuth credentials JSON file
+            token_file: Path to store OAuth token
+            scopes: OAuth scopes to request
+
+        Returns:
+            The same manager for every call with the same token file
+        """
+        key = os.path.abspath(token_file)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(credentials_file, token_file, scopes)
+            return cls._shared[key]
+
+    def get_credentials(self) -> Optional[ManagedCredentials]:
+        """
+        Return valid credentials, refreshing or logging in when needed.
+
+        The in-memory token is reused until it is within REFRESH_MARGIN of
+        its expiry. Refreshes and logins happen under a lock on the token
+        file, so concurrent processes reuse each other's new token instead
+        of each calling the OAuth endpoint.
+
+        Returns:
+            Valid credentials, or None if they could not be obtained
+        """
+        with self._lock:
+            if self.credentials is not None and not self._needs_refresh(
+                self.credentials
+            ):
+                return self.credentials
+
+            with self._file_lock():
+                creds = self._load_token()
+                if creds is not None and self._needs_refresh(creds):
+                    creds = self._refresh_token(creds, self._request_factory())
+                if creds is None:
+                    creds = self._login()
+                    # Reload the saved token as managed credentials
+                    if creds is not None:
+                        creds = (
+                            self._load_token() if self._save(creds) else None
+                        )
+
+            if creds is not None:
+                self._adopt(creds)
+            return self.credentials if creds is not None else None
+
+    def refresh(self, creds: ManagedCredentials, request) -> None:
+        """
+        Refresh credentials handed out by this manager.
+
+        Called by ManagedCredentials.refresh, also when Gmail rejected a
+        token the local clock still considers valid, e.g. a revoked one.
+        A caller that waited for another thread's or process's refresh
+        reuses its token instead.
+
+        Args:
+            creds: Credentials to update in place
+            request: google.auth transport request used for the refresh
+
+        Raises:
+            google.auth.exceptions.RefreshError: If the refresh fails
+        """
+        # The token the caller found wanting, before waiting for the lock
+        rejected = creds.token
+        with self._lock:
+            with self._file_lock():
+                stored = self._load_token()
+                if (
+                    stored is not None
+                    and stored.token != rejected
+                    and not self._needs_refresh(stored)
+                ):
+                    creds.token = stored.token
+                    creds.expiry = stored.expiry
+                    return
+                Credentials.refresh(creds, request)
+                self.refresh_count += 1
+                self._save(creds)
+
+    def _adopt(self, creds: ManagedCredentials) -> None:
+        """
+        Make creds the manager's credentials, keeping handed-out objects.
+
+        Services hold on to the credentials they were built with, so a new
+        token is copied into the existing object rather than replacing it.
+
+        Args:
+            creds: Freshly loaded, refreshed or obtained credentials
+        """
+        if self.credentials is None:
+            creds.manager = self
+            self.credentials = creds
+        else:
+            self.credentials.token = creds.token
+            self.credentials.expiry = creds.expiry
+
+    def _needs_refresh(self, creds: Credentials) -> bool:
+        """
+        Tell whether a token is missing, expired or about to expire.
+
+        Args:
+            creds: Credentials to check
+
+        Returns:
+            True if the token should be refreshed before use
+        """
+        if not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.expiry - now < self.REFRESH_MARGIN
+
+    def _load_token(self) -> Optional[ManagedCredentials]:
+        """
+        Load the stored token.
+
+        Returns:
+            Stored credentials, or None if there are none or they are
+            unreadable
+        """
+        if not os.path.exists(self.token_file):
+            return None
+        try:
+            return ManagedCredentials.from_authorized_user_file(
+                self.token_file, self.scopes
+            )
+        except Exception as e:
+            print(f"Error loading existing token: {e}", file=sys.stderr)
+            return None
+
+    def _refresh_token(
+        self, creds: ManagedCredentials, request
+    ) -> Optional[ManagedCredentials]:
+        """
+        Refresh a stored token and save it.
+
+        Args:
+            creds: Stored credentials
+            request: google.auth transport request used for the refresh
+
+        Returns:
+            Refreshed credentials, or None if they cannot be refreshed
+        """
+        if not creds.refresh_token:
+            return None
+        try:
+            Credentials.refresh(creds, request)
+        except Exception as e:
+            print(f"Error refreshing token: {e}", file=sys.stderr)
+            return None
+        self.refresh_count += 1
+        return creds if self._save(creds) else None
+
+    def _login(self) -> Optional[Credentials]:
+        """
+        Run the interactive OAuth flow in the browser.
+
+        Returns:
+            New credentials, or None if the flow failed
+        """
+        if not os.path.exists(self.credentials_file):
+            print(
+                f"Credentials '{self.credentials_file}' not found!",
+                file=sys.stderr,
+            )
+            print(
+                "Download your OAuth 2.0 credentials from GCP Console",
+                file=sys.stderr,
+            )
+            print(
+                "and save as 'credentials.json' in the project root.",
+                file=sys.stderr,
+            )
+            return None
+
+        try:
+            # Only needed for the first login, and slow to import
+            # pylint: disable=import-outside-toplevel
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
+            flow = InstalledAppFlow.from_client_secrets_file(
+                self.credentials_file, self.scopes
+            )
+            return flow.run_local_server(port=0)
+        except Exception as e:
+            print(f"Error during authentication: {e}", file=sys.stderr)
+            return None
+
+    def _save(self, creds: Credentials) -> bool:
+        """
+        Write the token atomically, readable by the current user only.
+
+        The token is written to a temporary file in the same directory and
+        renamed over the old one, so readers never see a partial file.
+
+        Args:
+            creds: Credentials to save
+
+        Returns:
+            True if the token was saved
+        """
+        directory = os.path.dirname(os.path.abspath(self.token_file))
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                dir=directory, prefix=".token-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as token:
+                    token.write(creds.to_json())
+                os.replace(temp_path, self.token_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except Exception as e:
+            print(f"Error saving token: {e}", file=sys.stderr)
+            return False
+        return True
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the token file's lock file."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.token_file}.lock", "a", encoding="utf-8") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,103 @@
+"""
+Date header normalization for displaying Gmail emails.
+"""
+
+import email.utils
+import functools
+import re
+from datetime import datetime
+from typing import List
+
+
+class DateFormatter:  # pylint: disable=too-few-public-methods
+    """Memoized conversion of email Date headers to display strings."""
+
+    OUTPUT_FORMAT = "%Y-%m-%d %H:%M"
+    # Canonical RFC 2822 shape, e.g. "Mon, 1 Jan 2024 12:00:00 +0000",
+    # with optional weekday, seconds and trailing zone comment
+    _RFC2822 = re.compile(
+        r"(?:[A-Z][a-z]{2}, )?(\d{1,2}) ([A-Z][a-z]{2}) (\d{4}) "
+        r"(\d{2}):(\d{2})(?::\d{2})? (?:[+-]\d{4}|GMT|UT)(?: \(.*\))?"
+    )
+    _MONTHS = {
+        "Jan": "01",
+        "Feb": "02",
+        "Mar": "03",
+        "Apr": "04",
+        "May": "05",
+        "Jun": "06",
+        "Jul": "07",
+        "Aug": "08",
+        "Sep": "09",
+        "Oct": "10",
+        "Nov": "11",
+        "Dec": "12",
+    }
+
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the formatter.
+
+        Args:
+            cache_size: Number of distinct Date headers memoized
+        """
+        self.errors: List[str] = []
+        self._cached_format = functools.lru_cache(maxsize=cache_size)(
+            self._format
+        )
+
+    def format(self, date_string: str) -> str:
+        """
+        Format a Date header for display, memoized by raw header.
+
+        Args:
+            date_string: Raw Date header
+
+        Returns:
+            Formatted date string or original string if parsing fails
+        """
+        return self._cached_format(date_string)
+
+    def format_timestamp(self, timestamp_ms: int) -> str:
+        """
+        Format a Gmail internalDate for display, in local time.
+
+        Args:
+            timestamp_ms: Epoch time in milliseconds
+
+        Returns:
+            Formatted date string
+        """
+        return datetime.fromtimestamp(timestamp_ms / 1000).strftime(
+            self.OUTPUT_FORMAT
+        )
+
+    def _format(self, date_string: str) -> str:
+        """
+        Format a Date header without memoization.
+
+        The canonical RFC 2822 shape is formatted straight from the regex
+        match; anything else goes through the stdlib parser. Headers that
+        fail to parse are recorded in errors and returned unchanged.
+
+        Args:
+            date_string: Raw Date header
+
+        Returns:
+            Formatted date string or original string if parsing fails
+        """
+        match = self._RFC2822.fullmatch(date_string)
+        if match:
+            day, month_name, year, hour, minute = match.groups()
+            month = self._MONTHS.get(month_name)
+            # Days past 28 may not exist in the month, let the stdlib
+            # parser reject those
+            if month and 1 <= int(day) <= 28 and hour < "24" and minute < "60":
+                return f"{year}-{month}-{int(day):02d} {hour}:{minute}"
+
+        try:
+            parsed_date = email.utils.parsedate_to_datetime(date_string)
+            return parsed_date.strftime(self.OUTPUT_FORMAT)
+        except Exception:
+            self.errors.append(date_string)
+            return date_string
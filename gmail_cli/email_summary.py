@@ -0,0 +1,224 @@
+"""
+Compact record of the metadata shown for one Gmail message.
+"""
+
+import operator
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class EmailSummary:  # pylint: disable=too-many-instance-attributes
+    """Slotted email record built straight from a Gmail API response.
+
+    Fields can also be read dictionary-style under their display keys
+    ('from', 'subject', 'date', 'internal_date', ...), so code written
+    against the former email dictionaries keeps working.
+    """
+
+    __slots__ = (
+        "id",
+        "thread_id",
+        "sender",
+        "subject",
+        "date",
+        "internal_date",
+        "account",
+        "message_count",
+        "snippet",
+        "headers",
+    )
+
+    # Dictionary key for each field, used by to_dict() and item access
+    _KEYS = {
+        "id": "id",
+        "thread_id": "thread_id",
+        "from": "sender",
+        "subject": "subject",
+        "date": "date",
+        "internal_date": "internal_date",
+        "account": "account",
+        "message_count": "message_count",
+        "snippet": "snippet",
+        "headers": "headers",
+    }
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    # pylint: disable=redefined-builtin
+    def __init__(
+        self,
+        id: str = "",
+        thread_id: str = "",
+        sender: str = "",
+        subject: str = "",
+        date: str = "",
+        internal_date: Optional[int] = None,
+        account: Optional[str] = None,
+        message_count: int = 1,
+        snippet: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the record.
+
+        Args:
+            id: Gmail message ID
+            thread_id: Gmail thread ID
+            sender: From header
+            subject: Subject header
+            date: Date header
+            internal_date: Receive time in epoch milliseconds
+            account: Name of the account the message belongs to
+            message_count: Number of unread messages summarized, for
+                thread records
+            snippet: Start of the message body, as shown by Gmail; None
+                if it was not fetched
+            headers: Fetched headers other than From, Subject and Date
+        """
+        self.id = id
+        self.thread_id = thread_id
+        self.sender = sender
+        self.subject = subject
+        self.date = date
+        self.internal_date = internal_date
+        self.account = account
+        self.message_count = message_count
+        self.snippet = snippet
+        self.headers = headers
+
+    @classmethod
+    def from_message(cls, msg: Dict) -> "EmailSummary":
+        """
+        Build a record from a metadata response.
+
+        Only the header values are kept, so the response, with its full
+        headers list, can be freed as soon as this returns. Headers besides
+        From, Subject and Date, fetched on request, go to headers.
+
+        Args:
+            msg: Gmail message resource in metadata format
+
+        Returns:
+            Email record
+        """
+        sender = subject = date = ""
+        headers = None
+        for header in msg["payload"]["headers"]:
+            name = header["name"]
+            if name == "From":
+                sender = sender or header["value"]
+            elif name == "Subject":
+                subject = subject or header["value"]
+            elif name == "Date":
+                date = date or header["value"]
+            else:
+                if headers is None:
+                    headers = {}
+                headers.setdefault(name, header["value"])
+
+        internal_date = msg.get("internalDate")
+        return cls(
+            msg.get("id", ""),
+            msg.get("threadId", ""),
+            sender,
+            subject,
+            date,
+            int(internal_date) if internal_date is not None else None,
+            snippet=msg.get("snippet"),
+            headers=headers,
+        )
+
+    @classmethod
+    def from_thread(cls, thread: Dict) -> "EmailSummary":
+        """
+        Build a record summarizing a thread from a metadata response.
+
+        The record holds the headers of the thread's latest unread message
+        and the number of unread messages in the thread.
+
+        Args:
+            thread: Gmail thread resource in metadata format
+
+        Returns:
+            Email record
+        """
+        messages = thread.get("messages", [])
+        unread = [
+            m for m in messages if "UNREAD" in m.get("labelIds", [])
+        ] or messages
+        latest = max(unread, key=lambda m: int(m.get("internalDate", 0)))
+        summary = cls.from_message(latest)
+        summary.message_count = len(unread)
+        return summary
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EmailSummary":
+        """
+        Build a record from its dictionary form.
+
+        Args:
+            data: Dictionary as returned by to_dict()
+
+        Returns:
+            Email record
+        """
+        return cls(
+            **{
+                field: data[key]
+                for key, field in cls._KEYS.items()
+                if key in data
+            }
+        )
+
+    @classmethod
+    def getter(cls, *keys: str) -> Callable[["EmailSummary"], Tuple]:
+        """
+        Return a fast reader of several fields by their dictionary keys.
+
+        Args:
+            *keys: Display keys, e.g. 'from'; at least two
+
+        Returns:
+            Function returning the field values of a record, in keys order
+        """
+        return operator.attrgetter(*(cls._KEYS[key] for key in keys))
+
+    def to_dict(self) -> Dict:
+        """
+        Convert the record to a dictionary, e.g. for JSON serialization.
+
+        Returns:
+            Dictionary keyed by display keys
+        """
+        return {key: getattr(self, field) for key, field in self._KEYS.items()}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Read a field by its dictionary key.
+
+        Args:
+            key: Display key, e.g. 'from'
+            default: Value returned for unknown keys
+
+        Returns:
+            Field value or default
+        """
+        field = self._KEYS.get(key)
+        return default if field is None else getattr(self, field)
+
+    def __getitem__(self, key: str) -> Any:
+        field = self._KEYS.get(key)
+        if field is None:
+            raise KeyError(key)
+        return getattr(self, field)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EmailSummary):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field)
+            for field in self.__slots__
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"EmailSummary({self.id!r}, subject={self.subject!r})"
@@ -2,134 +2,300 @@
 Table formatter for displaying Gmail emails in CLI.
 """
 
-import email.utils
-from typing import List, Dict
-from rich.console import Console
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+from rich.console import Console, Group, RenderableType
+from rich.markup import escape
 from rich.table import Table
 from rich.panel import Panel
+from .date_formatter import DateFormatter
+from .email_summary import EmailSummary
+from .metrics import Metrics
+
+# Emails are EmailSummary records or dictionaries with the same keys
+Email = Union[EmailSummary, Dict]
 
 
 class EmailTableFormatter:  # pylint: disable=too-few-public-methods
     """Formatter for displaying emails in a rich CLI table."""
 
-    def __init__(self):
-        """Initialize the formatter with a console."""
+    def __init__(
+        self,
+        metrics: Optional[Metrics] = None,
+        headers: Sequence[str] = (),
+        snippet: bool = False,
+    ):
+        """
+        Initialize the formatter with a console.
+
+        Args:
+            metrics: Collects the time spent rendering tables, by default
+                without keeping the individual samples
+            headers: Extra headers shown as columns after the date
+            snippet: Show the snippet of every email below its subject
+        """
         self.console = Console()
+        self.date_formatter = DateFormatter()
+        self.metrics = metrics or Metrics(keep_samples=False)
+        self.headers = tuple(headers)
+        self.snippet = snippet
 
     def display_emails(
-        self, emails: List[Dict], max_results: int = 50
+        self,
+        emails: List[Email],
+        max_results: int = 50,
+        title: str = "📧 Unread Gmail Messages",
     ) -> None:
         """
         Display emails in a formatted table.
 
         Args:
-            emails: List of email dictionaries
+            emails: List of email records or dictionaries
+            max_results: Maximum number of emails to display
+            title: Table title
+        """
+        with self.metrics.timer("render"):
+            if not emails:
+                self.console.print(self._empty_panel())
+                return
+
+            # Display the table
+            self.console.print(self._build_table(emails, title))
+
+            # Show summary
+            self.console.print(self._summary(len(emails), max_results))
+
+    def display_emails_stream(
+        self,
+        emails: Iterable[Email],
+        max_results: int = 50,
+        title: str = "📧 Unread Gmail Messages",
+        page_size: int = 25,
+    ) -> int:
+        """
+        Display emails progressively, one table per page of rows.
+
+        Rows are printed as soon as a page fills up, so the first rows show
+        up before the remaining emails are fetched and only one page is
+        held in memory.
+
+        Args:
+            emails: Iterable of email records or dictionaries, e.g. a
+                generator
+            max_results: Maximum number of emails requested
+            title: Title of the first page's table
+            page_size: Number of rows per printed table
+
+        Returns:
+            Number of emails displayed
+        """
+        count = 0
+        page: List[Email] = []
+        for _email in emails:
+            page.append(_email)
+            if len(page) >= page_size:
+                self._print_page(page, title if count == 0 else None)
+                count += len(page)
+                page = []
+
+        if page:
+            self._print_page(page, title if count == 0 else None)
+            count += len(page)
+
+        if not count:
+            self.console.print(self._empty_panel())
+            return 0
+
+        self.console.print(self._summary(count, max_results))
+        return count
+
+    def render(
+        self,
+        emails: List[Email],
+        max_results: int = 50,
+        title: str = "📧 Unread Gmail Messages",
+    ) -> RenderableType:
+        """
+        Build the full email view as a single renderable.
+
+        Used to redraw the view in place, e.g. inside a rich Live display.
+
+        Args:
+            emails: List of email records or dictionaries
             max_results: Maximum number of emails to display
+            title: Table title
+
+        Returns:
+            Renderable holding the table and its summary
         """
-        if not emails:
-            self.console.print(
-                Panel(
-                    "No unread emails found! 📭",
-                    style="blue",
-                    border_style="blue",
-                )
+        with self.metrics.timer("render"):
+            if not emails:
+                return self._empty_panel()
+            return Group(
+                self._build_table(emails, title),
+                self._summary(len(emails), max_results),
             )
-            return
 
-        # Create the table
+    def _print_page(self, page: List[Email], title: Optional[str]) -> None:
+        """
+        Print one page of a streamed table.
+
+        Args:
+            page: Emails of the page
+            title: Table title, None for no title
+        """
+        with self.metrics.timer("render"):
+            self.console.print(self._build_table(page, title))
+
+    def _empty_panel(self) -> Panel:
+        """
+        Build the panel shown when there are no emails.
+
+        Returns:
+            Panel with the empty inbox message
+        """
+        return Panel(
+            "No unread emails found! 📭",
+            style="blue",
+            border_style="blue",
+        )
+
+    def _build_table(self, emails: List[Email], title: Optional[str]) -> Table:
+        """
+        Build the email table.
+
+        Args:
+            emails: List of email records or dictionaries
+            title: Table title, None for no title
+
+        Returns:
+            Table with one row per email
+        """
+        # Create the table, with a blank line between rows
         table = Table(
-            title="📧 Unread Gmail Messages",
+            title=title,
             show_header=True,
             header_style="bold magenta",
             border_style="blue",
             title_style="bold cyan",
+            leading=1,
         )
 
         # Add columns
         table.add_column("From", style="cyan", width=30, no_wrap=True)
         table.add_column("Subject", style="white", width=50, no_wrap=False)
         table.add_column("Date", style="green", width=20, no_wrap=True)
+        for name in self.headers:
+            table.add_column(name, style="yellow", width=25, no_wrap=True)
 
         # Add rows
+        format_sender = self._format_sender
+        format_subject = self._format_subject
+        format_date = self._format_date
+        add_row = table.add_row
+        headers = self.headers
+        snippet = self.snippet
         for _email in emails:
-            from_text = self._format_sender(_email.get("from", ""))
-            subject_text = self._format_subject(_email.get("subject", ""))
-            date_text = self._format_date(_email.get("date", ""))
+            extra = _email.get("headers") or {}
+            add_row(
+                format_sender(
+                    _email.get("from", ""), _email.get("message_count", 1)
+                ),
+                format_subject(
+                    _email.get("subject", ""),
+                    _email.get("snippet") if snippet else None,
+                ),
+                format_date(
+                    _email.get("date", ""), _email.get("internal_date")
+                ),
+                *(escape(extra.get(name, "")) for name in headers),
+            )
+
+        return table
 
-            table.add_row(from_text, subject_text, date_text)
-            # Don't add empty row after the last email
-            if _email != emails[-1]:
-                table.add_row("", "", "")
+    def _summary(self, count: int, max_results: int) -> str:
+        """
+        Build the summary line shown below the table.
 
-        # Display the table
-        self.console.print(table)
+        Args:
+            count: Number of emails displayed
+            max_results: Maximum number of emails requested
 
-        # Show summary
-        count = len(emails)
+        Returns:
+            Summary markup string
+        """
         if count < max_results:
-            self.console.print(
-                f"\n[bold green]Found {count} unread email(s)[/bold green]"
-            )
-        else:
-            self.console.print(
-                f"\n[bold green]Showing {count} unread email(s)[/bold green]"
-            )
+            return f"\n[bold green]Found {count} unread email(s)[/bold green]"
+        return f"\n[bold green]Showing {count} unread email(s)[/bold green]"
 
-    def _format_sender(self, sender: str) -> str:
+    def _format_sender(self, sender: str, message_count: int = 1) -> str:
         """
         Format sender email for display.
 
         Args:
             sender: Raw sender string
+            message_count: Number of unread messages in the row's thread,
+                shown after the sender when above one
 
         Returns:
             Formatted sender string
         """
+        count = f" ({message_count})" if message_count > 1 else ""
         if not sender:
-            return "Unknown"
+            return f"Unknown{count}"
 
         # Extract name from "Name <email@domain.com>" format
         if "<" in sender and ">" in sender:
-            name = sender.split("<")[0].strip()
-            email_address = sender.split("<")[1].split(">")[0].strip()
+            name, _, address_part = sender.partition("<")
+            name = name.strip()
+            email_address = address_part.partition(">")[0].strip()
             if name:
-                return f"{name}\n[dim]{email_address}[/dim]"
-            return email_address
+                return f"{name}{count}\n[dim]{email_address}[/dim]"
+            return f"{email_address}{count}"
 
-        return sender
+        return f"{sender}{count}"
 
-    def _format_subject(self, subject: str) -> str:
+    def _format_subject(
+        self, subject: str, snippet: Optional[str] = None
+    ) -> str:
         """
         Format subject line for display.
 
         Args:
             subject: Raw subject string
+            snippet: Snippet shown dimmed below the subject, if any
 
         Returns:
             Formatted subject string
         """
         if not subject:
-            return "[dim](No subject)[/dim]"
-
-        # Truncate long subjects
-        if len(subject) > 85:
-            return subject[:82] + "..."
+            subject = "[dim](No subject)[/dim]"
+        elif len(subject) > 85:
+            # Truncate long subjects
+            subject = subject[:82] + "..."
 
+        if snippet:
+            if len(snippet) > 85:
+                snippet = snippet[:82] + "..."
+            return f"{subject}\n[dim]{escape(snippet)}[/dim]"
         return subject
 
-    def _format_date(self, date_string: str) -> str:
+    def _format_date(
+        self, date_string: str, internal_date: Optional[int] = None
+    ) -> str:
         """
         Format email date for display.
 
+        Gmail's internalDate is used when present; the sender-controlled
+        Date header is only parsed as a fallback, with parse failures
+        collected in date_formatter.errors.
+
         Args:
             date_string: Raw date string from email
+            internal_date: Gmail internalDate in epoch milliseconds
 
         Returns:
             Formatted date string or original string if parsing fails
         """
-        try:
-            parsed_date = email.utils.parsedate_to_datetime(date_string)
-            return parsed_date.strftime("%Y-%m-%d %H:%M")
-        except Exception:
-            print(f"Error parsing date: {date_string}")
-            return date_string
+        if internal_date is not None:
+            return self.date_formatter.format_timestamp(internal_date)
+        return self.date_formatter.format(date_string)
@@ -2,24 +2,176 @@
 Gmail API client for accessing unread emails.
 """
 
-import os
-from typing import List, Dict, Optional
-from google.auth.transport.requests import Request
+# pylint: disable=too-many-lines
+
+import contextlib
+import functools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
+from googleapiclient.model import JsonModel
+from .credential_manager import CredentialManager
+from .email_summary import EmailSummary
+from .metadata_cache import MetadataCache
+from .metrics import Metrics
+from .rate_limiter import GmailRateLimiter
+from .response_model import FastJsonModel
+from .search_index import SearchIndex
+from .sync_state import SyncState
+
+
+def build_search_query(
+    since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> Optional[str]:
+    """
+    Build a Gmail search query restricting messages to a time window.
+
+    Gmail evaluates after:/before: with epoch seconds against the
+    message's internalDate, so the window is applied server-side.
+
+    Args:
+        since: Only messages received at or after this time
+        until: Only messages received before this time
+
+    Returns:
+        Gmail search string, or None when no bound is given
+    """
+    terms = []
+    if since is not None:
+        terms.append(f"after:{int(since.timestamp())}")
+    if until is not None:
+        terms.append(f"before:{int(until.timestamp())}")
+    return " ".join(terms) or None
+
+
+@functools.lru_cache(maxsize=None)
+def _discovery_document(root_url: Optional[str] = None) -> Optional[Dict]:
+    """
+    Load the Gmail v1 discovery document bundled with googleapiclient.
+
+    The document is read and parsed once per process and root URL, and
+    shared by every service object built afterwards.
+
+    Args:
+        root_url: Server to send requests to instead of Gmail, e.g. a
+            local emulator; batches are sent there as well
 
+    Returns:
+        Parsed discovery document, or None if it is not bundled
+    """
+    document = get_static_doc("gmail", "v1")
+    if not document:
+        return None
+    document = json.loads(document)
+    if root_url is not None:
+        document["rootUrl"] = document["mtlsRootUrl"] = root_url
+        document["baseUrl"] = root_url + document["servicePath"]
+    return document
 
-class GmailClient:
+
+@contextlib.contextmanager
+def report_errors(api_error: Type[Exception]) -> Iterator[None]:
+    """
+    Print errors raised while retrieving emails instead of raising them.
+
+    Args:
+        api_error: Exception type of failed Gmail API calls
+    """
+    try:
+        yield
+    except api_error as error:
+        print(f"Gmail API error: {error}")
+    except Exception as e:
+        print(f"Error retrieving emails: {e}")
+
+
+class _CountingHttp:  # pylint: disable=too-few-public-methods
+    """HTTP transport wrapper counting the response bytes received."""
+
+    def __init__(self, http, metrics: Metrics):
+        """
+        Wrap a transport.
+
+        Args:
+            http: httplib2-compatible transport
+            metrics: Metrics whose bytes.received counter is increased
+        """
+        self.http = http
+        self.metrics = metrics
+
+    def request(self, *args, **kwargs) -> Tuple[Any, bytes]:
+        """
+        Send a request through the wrapped transport.
+
+        Returns:
+            Response and body, as returned by the wrapped transport
+        """
+        response, content = self.http.request(*args, **kwargs)
+        self.metrics.increment("bytes.received", len(content or b""))
+        return response, content
+
+    def __getattr__(self, name: str) -> Any:
+        # googleapiclient reads e.g. the credentials of the transport
+        return getattr(self.http, name)
+
+
+class GmailClient:  # pylint: disable=too-many-instance-attributes
     """Client for interacting with Gmail API."""
 
     SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
+    METADATA_HEADERS = ["From", "Subject", "Date"]
+    # Partial response masks; everything else Gmail would send, e.g.
+    # labelIds, sizeEstimate, historyId and payload padding, is dropped
+    MESSAGE_FIELDS = "id,threadId,internalDate,payload/headers"
+    HISTORY_FIELDS = (
+        "history(messagesAdded/message(id,labelIds),"
+        "messagesDeleted/message/id,"
+        "labelsAdded(message(id,labelIds),labelIds),"
+        "labelsRemoved(message(id,labelIds),labelIds)),"
+        "nextPageToken,historyId"
+    )
+    # Labels of messages that messages.list leaves out by default
+    HIDDEN_LABELS = frozenset(("SPAM", "TRASH"))
+    # Gmail accepts at most 100 calls in a single batch request
+    BATCH_SIZE = 100
+    # Largest page size accepted by messages().list
+    PAGE_SIZE = 500
 
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
     def __init__(
         self,
         credentials_file: str = "credentials.json",
         token_file: str = "token.json",
+        concurrency: int = 1,
+        cache: Optional[MetadataCache] = None,
+        rate_limiter: Optional[GmailRateLimiter] = None,
+        credential_manager: Optional[CredentialManager] = None,
+        metrics: Optional[Metrics] = None,
+        root_url: Optional[str] = None,
+        search_index: Optional[SearchIndex] = None,
+        extra_headers: Sequence[str] = (),
+        snippet: bool = False,
+        measure_savings: bool = False,
+        response_model: Optional[JsonModel] = None,
     ):
         """
         Initialize Gmail client.
@@ -27,10 +179,63 @@ class GmailClient:
         Args:
             credentials_file: Path to OAuth credentials JSON file
             token_file: Path to store OAuth token
+            concurrency: Number of worker threads fetching message
+                metadata; 1 uses the batch endpoint instead
+            cache: Metadata cache consulted before fetching messages
+            rate_limiter: Limiter every API call goes through, defaults to
+                one sized for Gmail's per-user quota
+            credential_manager: Source of OAuth credentials, defaults to
+                the manager shared by all clients of token_file
+            metrics: Collects timings of authentication and API calls,
+                by default without keeping the individual samples
+            root_url: Root URL of a Gmail-compatible server to use instead
+                of Gmail, e.g. gmail_cli.gmail_emulator; requests to it
+                are sent without OAuth credentials
+            search_index: Local full-text index fed with every fetched
+                message
+            extra_headers: Headers fetched besides From, Subject and Date,
+                kept in EmailSummary.headers
+            snippet: Also fetch the snippet of every message
+            measure_savings: Estimate the bytes saved by partial response
+                masks, at the cost of two extra calls, into the bytes.saved
+                counter
+            response_model: Model decoding API responses, by default a
+                FastJsonModel
         """
         self.credentials_file = credentials_file
         self.token_file = token_file
-        self.service = None
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.rate_limiter = rate_limiter or GmailRateLimiter(
+            max_concurrency=self.concurrency
+        )
+        self.credential_manager = (
+            credential_manager
+            or CredentialManager.shared(
+                credentials_file, token_file, self.SCOPES
+            )
+        )
+        self.credentials = None
+        self._service = None
+        self.request_latencies: List[float] = []
+        self.metrics = metrics or Metrics(keep_samples=False)
+        self.root_url = root_url
+        self.search_index = search_index
+        self.extra_headers = tuple(
+            h for h in extra_headers if h not in self.METADATA_HEADERS
+        )
+        self.metadata_headers = self.METADATA_HEADERS + list(
+            self.extra_headers
+        )
+        self.snippet = snippet
+        self.measure_savings = measure_savings
+        self._saved_per_message: Optional[int] = None
+        self.response_model = response_model or FastJsonModel()
+        self._local = threading.local()
+        # Worker threads, and the services they own, live as long as the
+        # client so later pages and polls reuse their warm connections
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lister: Optional[ThreadPoolExecutor] = None
 
     def authenticate(self) -> bool:
         """
@@ -39,134 +244,903 @@ class GmailClient:
         Returns:
             True if authentication successful, False otherwise
         """
-        creds = None
-
-        def _load_existing_token() -> Optional[Credentials]:
-            if os.path.exists(self.token_file):
-                try:
-                    return Credentials.from_authorized_user_file(
-                        self.token_file, self.SCOPES
-                    )
-                except Exception as e:
-                    print(f"Error loading existing token: {e}")
-                    return None
-            return None
-
-        creds = _load_existing_token()
-
-        # If no valid credentials available, let the user log in
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                except Exception as e:
-                    print(f"Error refreshing token: {e}")
-                    creds = None
-
-            if not creds:
-                if not os.path.exists(self.credentials_file):
-                    print(f"Credentials '{self.credentials_file}' not found!")
-                    print(
-                        "Download your OAuth 2.0 credentials from GCP Console"
-                    )
-                    print(
-                        "and save as 'credentials.json' in the project root."
-                    )
-                    return False
-
-                try:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_file, self.SCOPES
-                    )
-                    creds = flow.run_local_server(port=0)
-                except Exception as e:
-                    print(f"Error during authentication: {e}")
-                    return False
-
-            # Save the credentials for the next run
-            try:
-                with open(self.token_file, "w", encoding="utf-8") as token:
-                    token.write(creds.to_json())
-            except Exception as e:
-                print(f"Error saving token: {e}")
-                return False
-
-        # Build the Gmail service
-        try:
-            self.service = build("gmail", "v1", credentials=creds)
+        if self.root_url is not None:
+            # Local servers such as the emulator need no OAuth token
+            self._service = None
             return True
-        except Exception as e:
-            print(f"Error building Gmail service: {e}")
+
+        with self.metrics.timer("auth"):
+            creds = self.load_credentials()
+        if not creds:
             return False
 
-    def get_unread_emails(self, max_results: int = 50) -> List[Dict]:
+        # The Gmail service itself is built lazily on first use
+        self.credentials = creds
+        self._service = None
+        return True
+
+    @property
+    def service(self):
+        """Gmail API service resource, built on first access."""
+        if self._service is None and (
+            self.credentials is not None or self.root_url is not None
+        ):
+            self._service = self._build_service()
+        return self._service
+
+    @service.setter
+    def service(self, service) -> None:
+        self._service = service
+
+    def close(self) -> None:
+        """Stop the worker threads of concurrent fetches and listings."""
+        for executor in (self._executor, self._lister):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._executor = self._lister = None
+
+    def load_credentials(self) -> Optional[Credentials]:
+        """
+        Load, refresh or obtain OAuth 2.0 credentials and save the token.
+
+        Goes through the credential manager, which is shared by every
+        client of the same token file in the process.
+
+        Returns:
+            Valid credentials, or None if they could not be obtained
         """
-        Retrieve unread emails from Gmail.
+        return self.credential_manager.get_credentials()
+
+    def get_unread_emails(
+        self,
+        max_results: int = 50,
+        sync_state: Optional[SyncState] = None,
+        query: Optional[str] = None,
+        label_ids: Optional[List[str]] = None,
+    ) -> List[EmailSummary]:
+        """
+        Retrieve unread emails from Gmail, newest first.
 
         Args:
             max_results: Maximum number of emails to retrieve
+            sync_state: Incremental sync state; when given, the unread set
+                is updated from Gmail history instead of relisted
+            query: Gmail search string narrowing the listing, e.g.
+                "from:alice has:attachment"; ignored when sync_state is given
+            label_ids: Label IDs the messages must carry besides UNREAD;
+                ignored when sync_state is given
 
         Returns:
-            List of email dictionaries with 'from', 'subject', 'date' keys
+            List of email records, sorted by internal_date
         """
+        if not self.service:
+            print("Gmail service not initialized. Please authenticate first.")
+            return []
 
-        def _extract_header(headers: List[Dict], name: str) -> str:
-            for header in headers:
-                if header["name"] == name:
-                    return header["value"]
-            return ""
+        emails: List[EmailSummary] = []
+        with report_errors(HttpError):
+            # Same order as the Gmail web interface
+            emails = sorted(
+                self.iter_unread_emails(
+                    max_results, sync_state, query, label_ids
+                ),
+                key=lambda e: e.internal_date or 0,
+                reverse=True,
+            )
+            if not emails:
+                print("No unread messages found.")
+        return emails
 
+    def iter_unread_emails(
+        self,
+        max_results: Optional[int] = None,
+        sync_state: Optional[SyncState] = None,
+        query: Optional[str] = None,
+        label_ids: Optional[List[str]] = None,
+    ) -> Iterator[EmailSummary]:
+        """
+        Lazily yield unread emails across all result pages.
+
+        The next page of message IDs is listed in the background while
+        metadata for the current page is fetched, and only one page is held
+        in memory at a time.
+
+        Args:
+            max_results: Maximum number of emails to yield, None for all
+            sync_state: Incremental sync state; when given, the unread set
+                is updated from Gmail history instead of relisted
+            query: Gmail search string narrowing the listing, e.g.
+                "from:alice has:attachment"; ignored when sync_state is given
+            label_ids: Label IDs the messages must carry besides UNREAD;
+                ignored when sync_state is given
+
+        Yields:
+            Email records
+
+        Raises:
+            HttpError: If a Gmail API call fails
+        """
+        if not self.service:
+            print("Gmail service not initialized. Please authenticate first.")
+            return
+
+        self.request_latencies = []
+
+        if sync_state is not None:
+            message_ids = self.sync_unread_ids(sync_state)[:max_results]
+            for start in range(0, len(message_ids), self.PAGE_SIZE):
+                end = start + self.PAGE_SIZE
+                yield from self._fetch_emails(message_ids[start:end])
+            return
+
+        yield from self._iter_listed(
+            "messages", self._fetch_emails, max_results, query, label_ids
+        )
+
+    def get_unread_threads(
+        self,
+        max_results: int = 50,
+        query: Optional[str] = None,
+        label_ids: Optional[List[str]] = None,
+    ) -> List[EmailSummary]:
+        """
+        Retrieve threads with unread messages from Gmail, newest first.
+
+        Args:
+            max_results: Maximum number of threads to retrieve
+            query: Gmail search string narrowing the listing
+            label_ids: Label IDs the messages must carry besides UNREAD
+
+        Returns:
+            One record per thread, for its latest unread message, with
+            message_count set to the thread's number of unread messages
+        """
         if not self.service:
             print("Gmail service not initialized. Please authenticate first.")
             return []
 
-        try:
-            # Get unread message IDs
-            results = (
+        threads: List[EmailSummary] = []
+        with report_errors(HttpError):
+            threads = sorted(
+                self.iter_unread_threads(max_results, query, label_ids),
+                key=lambda t: t.internal_date or 0,
+                reverse=True,
+            )
+            if not threads:
+                print("No unread messages found.")
+        return threads
+
+    def iter_unread_threads(
+        self,
+        max_results: Optional[int] = None,
+        query: Optional[str] = None,
+        label_ids: Optional[List[str]] = None,
+    ) -> Iterator[EmailSummary]:
+        """
+        Lazily yield threads with unread messages across all result pages.
+
+        Each thread costs one threads.get call instead of one messages.get
+        per unread message.
+
+        Args:
+            max_results: Maximum number of threads to yield, None for all
+            query: Gmail search string narrowing the listing
+            label_ids: Label IDs the messages must carry besides UNREAD
+
+        Yields:
+            One record per thread, see get_unread_threads
+
+        Raises:
+            HttpError: If a Gmail API call fails
+        """
+        if not self.service:
+            print("Gmail service not initialized. Please authenticate first.")
+            return
+
+        self.request_latencies = []
+        yield from self._iter_listed(
+            "threads", self._fetch_threads, max_results, query, label_ids
+        )
+
+    def sync_unread_ids(self, state: SyncState) -> List[str]:
+        """
+        Bring the local unread set up to date and save it.
+
+        Only the history since the stored historyId is read. Without a
+        stored historyId, or once Gmail has expired it, the unread set is
+        rebuilt from a full listing.
+
+        Args:
+            state: Sync state to update in place
+
+        Returns:
+            Unread message IDs, newest first
+
+        Raises:
+            HttpError: If a Gmail API call fails
+        """
+        synced = False
+        if state.history_id:
+            try:
+                self._apply_history(state)
+                synced = True
+            except HttpError as error:
+                # Gmail answers 404 once the start historyId is too old
+                if error.resp.status != 404:
+                    raise
+
+        if not synced:
+            self._full_resync(state)
+
+        state.save()
+        return state.unread_ids
+
+    def _full_resync(self, state: SyncState) -> None:
+        """
+        Rebuild the unread set by listing every unread message.
+
+        Args:
+            state: Sync state to update in place
+        """
+        # Read the historyId first so changes made while listing are
+        # replayed on the next sync
+        profile = self._execute(
+            # pylint: disable=no-member
+            self.service.users().getProfile(userId="me", fields="historyId"),
+            "getProfile",
+        )
+
+        state.unread_ids = self._list_ids(self.service)
+        state.history_id = profile["historyId"]
+
+    def _apply_history(self, state: SyncState) -> None:
+        """
+        Apply UNREAD changes recorded since the stored historyId.
+
+        Like a full relist, the unread set leaves out spam and trash: moving
+        a message there removes it and restoring it adds it back.
+
+        Args:
+            state: Sync state to update in place
+        """
+        unread = dict.fromkeys(state.unread_ids)
+        added: Dict[str, None] = {}
+
+        def _add(message_id: str) -> None:
+            unread.pop(message_id, None)
+            added.pop(message_id, None)
+            added[message_id] = None
+
+        def _remove(message_id: str) -> None:
+            unread.pop(message_id, None)
+            added.pop(message_id, None)
+
+        def _listed(message: Dict) -> bool:
+            # Whether a full relist would return the message
+            labels = message.get("labelIds", [])
+            return "UNREAD" in labels and self.HIDDEN_LABELS.isdisjoint(labels)
+
+        def _relabel(item: Dict) -> None:
+            changed = item.get("labelIds", [])
+            if "UNREAD" not in changed and self.HIDDEN_LABELS.isdisjoint(
+                changed
+            ):
+                return
+            message = item["message"]
+            if not _listed(message):
+                _remove(message["id"])
+            elif message["id"] not in unread and message["id"] not in added:
+                _add(message["id"])
+
+        page_token = None
+        while True:
+            results = self._execute(
                 # pylint: disable=no-member
                 self.service.users()
-                .messages()
-                .list(userId="me", labelIds=["UNREAD"], maxResults=max_results)
-                .execute()
+                .history()
+                .list(
+                    userId="me",
+                    startHistoryId=state.history_id,
+                    historyTypes=[
+                        "messageAdded",
+                        "messageDeleted",
+                        "labelAdded",
+                        "labelRemoved",
+                    ],
+                    pageToken=page_token,
+                    fields=self.HISTORY_FIELDS,
+                ),
+                "history.list",
             )
 
-            messages = results.get("messages", [])
+            for record in results.get("history", []):
+                for item in record.get("messagesAdded", []):
+                    if _listed(item["message"]):
+                        _add(item["message"]["id"])
+                for item in record.get("messagesDeleted", []):
+                    _remove(item["message"]["id"])
+                for item in record.get("labelsAdded", []):
+                    _relabel(item)
+                for item in record.get("labelsRemoved", []):
+                    _relabel(item)
 
-            if not messages:
-                print("No unread messages found.")
-                return []
-
-            emails = []
-
-            # Get full message details for each unread email
-            for message in messages:
-                msg = (
-                    # pylint: disable=no-member
-                    self.service.users()
-                    .messages()
-                    .get(
-                        userId="me",
-                        id=message["id"],
-                        format="metadata",
-                        metadataHeaders=["From", "Subject", "Date"],
-                    )
-                    .execute()
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+
+        # History is chronological, so the last added message is the newest
+        state.unread_ids = list(reversed(added)) + list(unread)
+        state.history_id = results["historyId"]
+
+    def list_unread_ids(self, max_results: Optional[int] = None) -> List[str]:
+        """
+        List unread message IDs using the calling thread's own service.
+
+        Safe to call from worker threads of a shared executor.
+
+        Args:
+            max_results: Maximum number of IDs to list, None for all
+
+        Returns:
+            Unread message IDs, newest first
+
+        Raises:
+            HttpError: If a Gmail API call fails
+        """
+        return self._list_ids(self._thread_service(), max_results)
+
+    def fetch_email(self, message_id: str) -> EmailSummary:
+        """
+        Fetch one email using the calling thread's own service.
+
+        Safe to call from worker threads of a shared executor.
+
+        Args:
+            message_id: Gmail message ID
+
+        Returns:
+            Email record
+
+        Raises:
+            HttpError: If the Gmail API call fails
+        """
+        request = self._metadata_request(self._thread_service(), message_id)
+        return self._parse_message(self._execute(request, "messages.get"))
+
+    def _list_ids(
+        self, service, max_results: Optional[int] = None
+    ) -> List[str]:
+        """
+        List unread message IDs across all pages.
+
+        Args:
+            service: Gmail API service resource to list with
+            max_results: Maximum number of IDs to list, None for all
+
+        Returns:
+            Unread message IDs, newest first
+        """
+        message_ids: List[str] = []
+        page_token = None
+        while max_results is None or len(message_ids) < max_results:
+            page_size = self.PAGE_SIZE
+            if max_results is not None:
+                page_size = min(page_size, max_results - len(message_ids))
+            results = self._list_page(service, page_token, page_size)
+            message_ids.extend(m["id"] for m in results.get("messages", []))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+        return message_ids[:max_results]
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _iter_listed(
+        self,
+        resource: str,
+        fetch: Callable[[List[str]], List[EmailSummary]],
+        max_results: Optional[int],
+        query: Optional[str],
+        label_ids: Optional[List[str]],
+    ) -> Iterator[EmailSummary]:
+        """
+        Walk the unread listing of a resource page by page.
+
+        The next page of IDs is listed in the background while the current
+        page is fetched, and only one page is held in memory at a time.
+
+        Args:
+            resource: "messages" or "threads"
+            fetch: Callable fetching the records of a page of IDs
+            max_results: Maximum number of IDs to fetch, None for all
+            query: Gmail search string narrowing the listing
+            label_ids: Label IDs the messages must carry besides UNREAD
+
+        Yields:
+            Records returned by fetch
+        """
+        remaining = max_results
+
+        def _page_size() -> int:
+            if remaining is None:
+                return self.PAGE_SIZE
+            return min(self.PAGE_SIZE, remaining)
+
+        def _list_in_background(page_token: str, page_size: int) -> Dict:
+            return self._list_page(
+                self._thread_service(),
+                page_token,
+                page_size,
+                query,
+                label_ids,
+                resource,
+            )
+
+        # The first page is listed on the caller's service, later ones on
+        # the lister thread's own service
+        results = self._list_page(
+            self.service, None, _page_size(), query, label_ids, resource
+        )
+
+        if self._lister is None:
+            self._lister = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="gmail-lister"
+            )
+        while True:
+            ids = [item["id"] for item in results.get(resource, [])]
+            if remaining is not None:
+                ids = ids[:remaining]
+                remaining -= len(ids)
+
+            page_token = results.get("nextPageToken")
+            next_page = None
+            if page_token and (remaining is None or remaining > 0):
+                next_page = self._lister.submit(
+                    _list_in_background, page_token, _page_size()
                 )
 
-                headers = msg["payload"]["headers"]
-                email_data = {
-                    "from": _extract_header(headers, "From"),
-                    "subject": _extract_header(headers, "Subject"),
-                    "date": _extract_header(headers, "Date"),
-                }
+            yield from fetch(ids)
+
+            if next_page is None:
+                return
+            results = next_page.result()
 
-                emails.append(email_data)
+    def _list_page(
+        self,
+        service,
+        page_token: Optional[str],
+        page_size: int,
+        query: Optional[str] = None,
+        label_ids: Optional[List[str]] = None,
+        resource: str = "messages",
+    ) -> Dict:
+        """
+        List one page of unread message or thread IDs.
 
-            return emails
+        Args:
+            service: Gmail API service resource to list with
+            page_token: Token of the page to list, None for the first page
+            page_size: Maximum number of IDs in the page
+            query: Gmail search string narrowing the listing
+            label_ids: Label IDs the messages must carry besides UNREAD
+            resource: "messages" or "threads"
 
-        except HttpError as error:
-            print(f"Gmail API error: {error}")
+        Returns:
+            messages().list or threads().list response
+        """
+        return self._execute(
+            getattr(service.users(), resource)().list(
+                userId="me",
+                labelIds=["UNREAD", *(label_ids or [])],
+                maxResults=page_size,
+                pageToken=page_token,
+                q=query,
+                fields=f"{resource}/id,nextPageToken",
+            ),
+            f"{resource}.list",
+        )
+
+    def _fetch_emails(self, message_ids: List[str]) -> List[EmailSummary]:
+        """
+        Fetch metadata for a page of messages.
+
+        Cached messages are served from the metadata cache and only the
+        remaining IDs hit the network.
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            Email records in the same order as message_ids
+        """
+        if not message_ids:
             return []
-        except Exception as e:
-            print(f"Error retrieving emails: {e}")
+
+        cached = (
+            self.cache.get_many(message_ids) if self.cache is not None else {}
+        )
+        # Entries cached without the extra fields requested now are refetched
+        cached = {i: e for i, e in cached.items() if self._is_complete(e)}
+        missing = [i for i in message_ids if i not in cached]
+        if self.cache is not None:
+            self.metrics.increment("cache.hits", len(cached))
+            self.metrics.increment("cache.misses", len(missing))
+
+        # The search index covers snippets, so they are also requested for
+        # messages the index lacks them for, shown or not
+        index_snippets = (
+            self.search_index.without_snippet(missing)
+            if missing and self.search_index is not None and not self.snippet
+            else set()
+        )
+
+        def _request(service, message_id: str) -> HttpRequest:
+            return self._metadata_request(
+                service, message_id, snippet=message_id in index_snippets
+            )
+
+        if not missing:
+            summaries = []
+        elif self.concurrency > 1:
+            summaries = self._concurrent_execute(
+                _request, missing, parse=self._parse_message
+            )
+        else:
+            summaries = self._batch_execute(
+                _request, missing, parse=self._parse_message
+            )
+        if missing and self.measure_savings:
+            self.metrics.increment(
+                "bytes.saved", self._mask_savings(missing[0]) * len(missing)
+            )
+
+        fetched = dict(zip(missing, summaries))
+        if self.cache is not None:
+            self.cache.put_many(fetched)
+
+        emails = [
+            cached[i] if i in cached else fetched[i] for i in message_ids
+        ]
+        if self.search_index is not None:
+            # Cached messages too, in case they predate the index
+            with self.metrics.timer("index"):
+                self.search_index.add_many(emails)
+        return emails
+
+    def _fetch_threads(self, thread_ids: List[str]) -> List[EmailSummary]:
+        """
+        Fetch metadata for a page of threads.
+
+        Threads gain messages over time, so they bypass the metadata cache.
+
+        Args:
+            thread_ids: Gmail thread IDs
+
+        Returns:
+            One record per thread, in the same order as thread_ids
+        """
+        if not thread_ids:
             return []
+        if self.concurrency > 1:
+            return self._concurrent_execute(
+                self._thread_request,
+                thread_ids,
+                method="threads.get",
+                parse=self._parse_thread,
+            )
+        return self._batch_execute(
+            self._thread_request,
+            thread_ids,
+            method="threads.get",
+            parse=self._parse_thread,
+        )
+
+    def _message_fields(self, snippet: bool = False) -> str:
+        """
+        Return the partial response mask of one message.
+
+        Args:
+            snippet: Request the snippet even if the output does not show it
+
+        Returns:
+            Gmail `fields` mask, relative to a message resource
+        """
+        with_snippet = self.snippet or snippet
+        return self.MESSAGE_FIELDS + (",snippet" if with_snippet else "")
+
+    def _parse_message(self, message: Dict) -> EmailSummary:
+        """
+        Build a record from a message, filling in absent requested fields.
+
+        Gmail omits headers a message does not carry and may omit an empty
+        snippet; recording them as empty marks the record as complete for
+        the metadata cache.
+
+        Args:
+            message: Gmail message resource in metadata format
+
+        Returns:
+            Email record
+        """
+        return self._complete(EmailSummary.from_message(message))
+
+    def _parse_thread(self, thread: Dict) -> EmailSummary:
+        """
+        Build a record from a thread, filling in absent requested fields.
+
+        Args:
+            thread: Gmail thread resource in metadata format
+
+        Returns:
+            Email record
+        """
+        return self._complete(EmailSummary.from_thread(thread))
+
+    def _complete(self, email_data: EmailSummary) -> EmailSummary:
+        """
+        Record absent requested headers and snippet as empty strings.
+
+        Args:
+            email_data: Email record to update in place
+
+        Returns:
+            The updated email record
+        """
+        if self.snippet and email_data.snippet is None:
+            email_data.snippet = ""
+        if self.extra_headers:
+            headers = email_data.headers or {}
+            for name in self.extra_headers:
+                headers.setdefault(name, "")
+            email_data.headers = headers
+        return email_data
+
+    def _is_complete(self, email_data: EmailSummary) -> bool:
+        """
+        Check whether a record holds every requested header and snippet.
+
+        Args:
+            email_data: Email record
+
+        Returns:
+            True if nothing requested is missing from the record
+        """
+        if self.snippet and email_data.snippet is None:
+            return False
+        headers = email_data.headers or {}
+        return all(name in headers for name in self.extra_headers)
+
+    def _mask_savings(self, message_id: str) -> int:
+        """
+        Estimate the bytes a partial response mask saves per message.
+
+        Fetches one message with and without the mask, once per client, and
+        compares the sizes of both responses.
+
+        Args:
+            message_id: Gmail message ID of the sample message
+
+        Returns:
+            Bytes saved per message, never negative
+        """
+        if self._saved_per_message is None:
+            masked = self._metadata_request(self.service, message_id)
+            full = self._metadata_request(
+                self.service, message_id, masked=False
+            )
+            sizes = [
+                len(json.dumps(self._execute(request, "messages.get")))
+                for request in (full, masked)
+            ]
+            self._saved_per_message = max(sizes[0] - sizes[1], 0)
+        return self._saved_per_message
+
+    def _build_service(self):
+        """
+        Build a Gmail service object from the stored credentials.
+
+        Uses the bundled discovery document, so no discovery request is
+        made and the document is only parsed once per process. Services of
+        a root_url server are built unauthenticated.
+
+        Returns:
+            Gmail API service resource
+        """
+        document = _discovery_document(self.root_url)
+        if self.root_url is not None:
+            http = build_http()
+        else:
+            http = AuthorizedHttp(self.credentials, http=build_http())
+        http = _CountingHttp(http, self.metrics)
+        if document is None:
+            return build("gmail", "v1", http=http, model=self.response_model)
+        return build_from_document(
+            document, http=http, model=self.response_model
+        )
+
+    def _thread_service(self):
+        """
+        Return the service object owned by the calling thread.
+
+        The httplib2 transport behind a service is not thread-safe, so
+        every worker thread builds and keeps its own.
+
+        Returns:
+            Gmail API service resource for the current thread
+        """
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._build_service()
+            self._local.service = service
+        return service
+
+    def _metadata_request(
+        self,
+        service,
+        message_id: str,
+        masked: bool = True,
+        snippet: bool = False,
+    ) -> HttpRequest:
+        """
+        Build the metadata request for a single message.
+
+        Args:
+            service: Gmail API service resource to build the request on
+            message_id: Gmail message ID
+            masked: Request only the fields of the output, see
+                MESSAGE_FIELDS
+            snippet: Request the snippet even if the output does not show it
+
+        Returns:
+            Unexecuted request for the message metadata
+        """
+        return (
+            # pylint: disable=no-member
+            service.users()
+            .messages()
+            .get(
+                userId="me",
+                id=message_id,
+                format="metadata",
+                metadataHeaders=self.metadata_headers,
+                fields=self._message_fields(snippet) if masked else None,
+            )
+        )
+
+    def _execute(self, request, method: str, calls: int = 1) -> Any:
+        """
+        Execute a request through the rate limiter and time it.
+
+        Batches are timed separately from single calls of the same method,
+        and every call in a batch is counted.
+
+        Args:
+            request: Request, or batch request, with an execute() method
+            method: Gmail method name, used for quota and metrics
+            calls: Number of API calls in the request, for batches
+
+        Returns:
+            Result of the request
+        """
+        self.metrics.increment(f"calls.{method}", calls)
+        name = method if calls == 1 else f"{method} (batch)"
+        with self.metrics.timer(name):
+            return self.rate_limiter.execute(request, method, calls)
+
+    def _thread_request(self, service, thread_id: str) -> HttpRequest:
+        """
+        Build the metadata request for a single thread.
+
+        Args:
+            service: Gmail API service resource to build the request on
+            thread_id: Gmail thread ID
+
+        Returns:
+            Unexecuted request for the metadata of the thread's messages
+        """
+        return (
+            # pylint: disable=no-member
+            service.users()
+            .threads()
+            .get(
+                userId="me",
+                id=thread_id,
+                format="metadata",
+                metadataHeaders=self.metadata_headers,
+                fields=f"messages({self._message_fields()},labelIds)",
+            )
+        )
+
+    def _concurrent_execute(
+        self,
+        build_request: Callable[..., HttpRequest],
+        ids: List[str],
+        method: str = "messages.get",
+        parse: Optional[Callable[[Dict], Any]] = None,
+    ) -> List[Any]:
+        """
+        Execute one request per ID across the client's thread pool.
+
+        The pool is kept between calls, so its threads keep their services
+        and connections. At most `concurrency` requests are in flight at
+        any time. The latency of every request is appended to
+        request_latencies.
+
+        Args:
+            build_request: Callable building the request for a service and ID
+            ids: IDs to fetch
+            method: Gmail method name of the requests, for quota accounting
+            parse: Conversion applied to each response as it arrives, so
+                raw responses are not held until all requests finish
+
+        Returns:
+            Responses, or parsed responses, in the same order as ids
+        """
+
+        def _fetch(item_id: str) -> Tuple[Any, float]:
+            request = build_request(self._thread_service(), item_id)
+            started = time.perf_counter()
+            response = self._execute(request, method)
+            latency = time.perf_counter() - started
+            return (parse(response) if parse else response), latency
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="gmail-fetch"
+            )
+        results = list(self._executor.map(_fetch, ids))
+
+        self.request_latencies.extend(latency for _, latency in results)
+        return [response for response, _ in results]
+
+    def _batch_execute(
+        self,
+        build_request: Callable[..., HttpRequest],
+        ids: List[str],
+        method: str = "messages.get",
+        parse: Optional[Callable[[Dict], Any]] = None,
+    ) -> List[Any]:
+        """
+        Execute one request per ID through the Gmail batch endpoint.
+
+        Requests are sent in chunks of BATCH_SIZE. Sub-requests that fail
+        inside a batch are retried individually afterwards.
+
+        Args:
+            build_request: Callable building the request for a service and ID
+            ids: IDs to fetch
+            method: Gmail method name of the requests, for quota accounting
+            parse: Conversion applied to each response as it arrives, so
+                raw responses are not held until all requests finish
+
+        Returns:
+            Responses, or parsed responses, in the same order as ids
+        """
+        responses: List[Any] = [None] * len(ids)
+        failed: List[int] = []
+
+        def _callback(request_id, response, exception):
+            index = int(request_id)
+            if exception is not None:
+                failed.append(index)
+            else:
+                responses[index] = parse(response) if parse else response
+
+        for start in range(0, len(ids), self.BATCH_SIZE):
+            # pylint: disable=no-member
+            batch = self.service.new_batch_http_request(callback=_callback)
+            end = min(start + self.BATCH_SIZE, len(ids))
+            for index in range(start, end):
+                batch.add(
+                    build_request(self.service, ids[index]),
+                    request_id=str(index),
+                )
+            self._execute(batch, method, calls=end - start)
+
+        # Retry failed sub-requests one at a time, with backoff
+        for index in sorted(failed):
+            response = self._execute(
+                build_request(self.service, ids[index]), method
+            )
+            responses[index] = parse(response) if parse else response
+
+        return responses
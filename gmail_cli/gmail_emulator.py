@@ -0,0 +1,592 @@
+"""
+Local stand-in for the Gmail API, for offline load and integration tests.
+
+Serves messages.list, messages.get, threads.list, threads.get,
+history.list, getProfile and the batch endpoint over HTTP from a synthetic
+inbox. Point GmailClient at it with
+``GmailClient(root_url=emulator.root_url)``, or run it standalone with
+``python -m gmail_cli.gmail_emulator --messages 1000000``.
+"""
+
+import bisect
+import email.parser
+import email.policy
+import functools
+import json
+import random
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import click
+
+# Synthetic message n is received n minutes after this instant
+EPOCH_MS = 1_700_000_000_000
+LABELS = ["UNREAD", "INBOX"]
+API_PREFIX = "/gmail/v1/users/me/"
+BATCH_PATH = "/batch"
+# Gmail accepts at most 100 calls in a single batch request
+MAX_BATCH_SIZE = 100
+# Page size limits of messages.list and history.list
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+SNIPPET_FILLER = (
+    "Hi, following up on our conversation from last week, here are the "
+    "notes and the next steps we agreed on"
+)
+
+Response = Tuple[int, Dict]
+
+
+class GmailEmulator:  # pylint: disable=too-many-instance-attributes
+    """Gmail API server backed by a synthetic, lazily generated inbox."""
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        message_count: int = 1000,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the emulator; the server starts with start().
+
+        Messages are generated from their index on request, so inboxes of
+        millions of messages cost no memory up front.
+
+        Args:
+            message_count: Number of unread messages in the inbox
+            latency: Seconds added to every HTTP request
+            error_rate: Fraction of API calls, including calls inside a
+                batch, answered with error_status instead
+            error_status: HTTP status of injected errors
+            seed: Seed of the error injection, for reproducible runs
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free one
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.calls: Dict[str, int] = {}
+        self.traffic = {"requests": 0, "bytes_received": 0, "bytes_sent": 0}
+        self._message_count = message_count
+        self._read: set = set()
+        self._history_ids: List[int] = []
+        self._history: List[Dict] = []
+        self._history_id = 1000
+        self._oldest_history_id = self._history_id
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.emulator = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "GmailEmulator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def root_url(self) -> str:
+        """Root URL to pass to GmailClient, e.g. http://127.0.0.1:8080/."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def api_root(self) -> str:
+        """Base URL of the user API, to pass to AsyncGmailClient."""
+        return f"{self.root_url}{API_PREFIX.lstrip('/')}"
+
+    def start(self) -> None:
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        """Serve requests from the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def deliver(self, count: int = 1) -> List[str]:
+        """
+        Add new unread messages, recorded in the history.
+
+        Args:
+            count: Number of messages to add
+
+        Returns:
+            IDs of the new messages, oldest first
+        """
+        with self._lock:
+            message_ids = []
+            for _ in range(count):
+                message_id = _message_id(self._message_count)
+                self._message_count += 1
+                message_ids.append(message_id)
+                self._record(
+                    {"messagesAdded": [{"message": _message_stub(message_id)}]}
+                )
+            return message_ids
+
+    def mark_read(self, message_id: str) -> None:
+        """
+        Remove the UNREAD label of a message, recorded in the history.
+
+        Args:
+            message_id: ID of the message
+        """
+        with self._lock:
+            self._read.add(message_id)
+            self._record(
+                {
+                    "labelsRemoved": [
+                        {
+                            "message": _message_stub(
+                                message_id,
+                                [
+                                    label
+                                    for label in LABELS
+                                    if label != "UNREAD"
+                                ],
+                            ),
+                            "labelIds": ["UNREAD"],
+                        }
+                    ]
+                }
+            )
+
+    def expire_history(self) -> None:
+        """Forget the recorded history, as Gmail does after about a week."""
+        with self._lock:
+            self._history_ids.clear()
+            self._history.clear()
+            self._oldest_history_id = self._history_id
+
+    def record_traffic(self, received: int, sent: int) -> None:
+        """
+        Count one HTTP exchange in traffic.
+
+        Args:
+            received: Bytes of the request, headers included
+            sent: Bytes of the response body
+        """
+        with self._lock:
+            self.traffic["requests"] += 1
+            self.traffic["bytes_received"] += received
+            self.traffic["bytes_sent"] += sent
+
+    def handle(self, method: str, target: str) -> Response:
+        """
+        Answer one API call.
+
+        Args:
+            method: HTTP method
+            target: Request path with its query string
+
+        Returns:
+            HTTP status and JSON body
+        """
+        url = urllib.parse.urlsplit(target)
+        params = urllib.parse.parse_qs(url.query)
+        path = url.path
+        if method != "GET" or not path.startswith(API_PREFIX):
+            return _error(404, "Not Found")
+        route = path.replace(API_PREFIX, "", 1).split("/")
+
+        handler: Callable[[Dict[str, List[str]]], Response]
+        if route == ["messages"]:
+            name, handler = "messages.list", self._list_messages
+        elif len(route) == 2 and route[0] == "messages":
+            name = "messages.get"
+            handler = functools.partial(self._get_message, route[1])
+        elif route == ["threads"]:
+            name = "threads.list"
+            handler = functools.partial(self._list_messages, key="threads")
+        elif len(route) == 2 and route[0] == "threads":
+            name = "threads.get"
+            handler = functools.partial(self._get_thread, route[1])
+        elif route == ["history"]:
+            name, handler = "history.list", self._list_history
+        elif route == ["profile"]:
+            name, handler = "getProfile", self._get_profile
+        else:
+            return _error(404, "Not Found")
+
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                return _error(self.error_status, "Injected error")
+            status, body = handler(params)
+        if status == 200 and "fields" in params:
+            body = _select_fields(body, _parse_fields(params["fields"][0])[0])
+        return status, body
+
+    def handle_batch(
+        self, content_type: str, body: bytes
+    ) -> Tuple[str, bytes]:
+        """
+        Answer a multipart/mixed batch of API calls.
+
+        Args:
+            content_type: Content-Type header of the batch request
+            body: Body of the batch request
+
+        Returns:
+            Content-Type and body of the multipart/mixed response
+        """
+        with self._lock:
+            self.calls["batch"] = self.calls.get("batch", 0) + 1
+        message = email.parser.BytesParser(
+            policy=email.policy.HTTP
+        ).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body
+        )
+        parts = list(message.iter_parts())
+        if len(parts) > MAX_BATCH_SIZE:
+            raise ValueError(f"Too many calls in batch: {len(parts)}")
+
+        boundary = "batch_emulator"
+        chunks = []
+        for part in parts:
+            request_line = part.get_payload().split("\n", 1)[0].strip()
+            method, target = request_line.split(" ")[:2]
+            status, payload = self.handle(method, target)
+            content_id = part["Content-ID"].strip("<>")
+            chunks.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {_reason(status)}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n")
+        return (
+            f"multipart/mixed; boundary={boundary}",
+            "".join(chunks).encode("utf-8"),
+        )
+
+    def _list_messages(
+        self, params: Dict[str, List[str]], key: str = "messages"
+    ) -> Response:
+        """
+        List unread message or thread IDs, newest first.
+
+        Page tokens are the index of the next message to consider, so
+        listing is as cheap on the millionth message as on the first.
+        Every thread holds a single message, with the message's ID.
+        """
+        labels = params.get("labelIds", [])
+        if any(label not in LABELS for label in labels):
+            return 200, {"resultSizeEstimate": 0}
+
+        page_size = _page_size(params)
+        index = int(params.get("pageToken", [self._message_count])[0]) - 1
+        messages = []
+        while index >= 0 and len(messages) < page_size:
+            message_id = _message_id(index)
+            if message_id not in self._read:
+                messages.append({"id": message_id, "threadId": message_id})
+            index -= 1
+
+        body: Dict = {"resultSizeEstimate": len(messages)}
+        if messages:
+            body[key] = messages
+        if index >= 0:
+            body["nextPageToken"] = str(index + 1)
+        return 200, body
+
+    def _get_message(
+        self, message_id: str, params: Dict[str, List[str]]
+    ) -> Response:
+        """Return a message in metadata format."""
+        try:
+            index = int(message_id, 16)
+        except ValueError:
+            return _error(400, "Invalid id value")
+        if index >= self._message_count:
+            return _error(404, "Requested entity was not found.")
+
+        received = datetime.fromtimestamp(
+            (EPOCH_MS + index * 60_000) / 1000, timezone.utc
+        )
+        headers = {
+            "From": f"Sender {index % 997} <sender{index % 997}@example.com>",
+            "To": "Me <me@example.com>",
+            "Subject": f"Synthetic message {index}",
+            "Date": format_datetime(received),
+        }
+        # Every third message comes from a mailing list
+        if index % 3 == 0:
+            headers["List-Id"] = f"<list{index % 7}.example.com>"
+        wanted = params.get("metadataHeaders") or list(headers)
+        labels = [
+            label
+            for label in LABELS
+            if label != "UNREAD" or message_id not in self._read
+        ]
+        return 200, {
+            **_message_stub(message_id, labels),
+            "snippet": f"Body of synthetic message {index}. {SNIPPET_FILLER}",
+            "sizeEstimate": 2048 + index % 4096,
+            "historyId": str(self._history_id),
+            "internalDate": str(EPOCH_MS + index * 60_000),
+            "payload": {
+                "partId": "",
+                "mimeType": "text/plain",
+                "filename": "",
+                "headers": [
+                    {"name": name, "value": value}
+                    for name, value in headers.items()
+                    if name in wanted
+                ],
+                "body": {"size": 1024 + index % 2048},
+            },
+        }
+
+    def _get_thread(
+        self, thread_id: str, params: Dict[str, List[str]]
+    ) -> Response:
+        """Return a thread, holding its single message, in metadata format."""
+        status, message = self._get_message(thread_id, params)
+        if status != 200:
+            return status, message
+        return 200, {
+            "id": thread_id,
+            "historyId": message["historyId"],
+            "messages": [message],
+        }
+
+    def _get_profile(self, _params: Dict[str, List[str]]) -> Response:
+        """Return the mailbox profile with the current historyId."""
+        return 200, {
+            "emailAddress": "me@example.com",
+            "messagesTotal": self._message_count,
+            "historyId": str(self._history_id),
+        }
+
+    def _list_history(self, params: Dict[str, List[str]]) -> Response:
+        """List history records after startHistoryId."""
+        start = int(params.get("startHistoryId", ["0"])[0])
+        if start < self._oldest_history_id:
+            return _error(404, "Requested entity was not found.")
+
+        first = bisect.bisect_right(
+            self._history_ids, int(params.get("pageToken", [start])[0])
+        )
+        end = first + _page_size(params)
+        body: Dict = {"historyId": str(self._history_id)}
+        if self._history[first:end]:
+            body["history"] = self._history[first:end]
+        if end < len(self._history):
+            body["nextPageToken"] = str(self._history_ids[end - 1])
+        return 200, body
+
+    def _record(self, change: Dict) -> None:
+        """Append a change to the history under a new historyId."""
+        self._history_id += 1
+        self._history_ids.append(self._history_id)
+        self._history.append({"id": str(self._history_id), **change})
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a GmailEmulator."""
+
+    # Keep connections alive, as Google's front ends do
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't wait for ACKs
+    disable_nagle_algorithm = True
+    _body = b""
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Answer a single API call."""
+        # The handler serves every request of a keep-alive connection;
+        # don't count the body of a previous POST again
+        self._body = b""
+        emulator = self.server.emulator  # type: ignore[attr-defined]
+        self._delay(emulator)
+        status, payload = emulator.handle("GET", self.path)
+        self._send(
+            status,
+            "application/json; charset=UTF-8",
+            json.dumps(payload).encode("utf-8"),
+        )
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Answer a batch request."""
+        emulator = self.server.emulator  # type: ignore[attr-defined]
+        self._body = self.rfile.read(
+            int(self.headers.get("Content-Length", 0))
+        )
+        self._delay(emulator)
+        if urllib.parse.urlsplit(self.path).path != BATCH_PATH:
+            status, payload = _error(404, "Not Found")
+            self._send(
+                status, "application/json", json.dumps(payload).encode()
+            )
+            return
+        try:
+            content_type, content = emulator.handle_batch(
+                self.headers["Content-Type"], self._body
+            )
+        except ValueError as e:
+            status, payload = _error(400, str(e))
+            self._send(
+                status, "application/json", json.dumps(payload).encode()
+            )
+            return
+        self._send(200, content_type, content)
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=W0622
+        """Keep test and benchmark output quiet."""
+
+    def _delay(self, emulator: GmailEmulator) -> None:
+        """Sleep for the emulator's configured latency."""
+        if emulator.latency:
+            time.sleep(emulator.latency)
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        """Write a complete response and count the exchange."""
+        emulator = self.server.emulator  # type: ignore[attr-defined]
+        emulator.record_traffic(
+            len(self.raw_requestline)
+            + len(self.headers.as_bytes())
+            + len(self._body),
+            len(body),
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _message_id(index: int) -> str:
+    """Gmail-style 16 hex digit ID of synthetic message index."""
+    return f"{index:016x}"
+
+
+def _message_stub(message_id: str, labels: Optional[List[str]] = None) -> Dict:
+    """Message ID, thread ID and labels, as found in list and history."""
+    return {
+        "id": message_id,
+        "threadId": message_id,
+        "labelIds": list(LABELS if labels is None else labels),
+    }
+
+
+def _parse_fields(
+    mask: str, pos: int = 0, tree: Optional[Dict] = None
+) -> Tuple[Dict, int]:
+    """
+    Parse a partial response mask such as "id,payload/headers,a(b,c)".
+
+    Args:
+        mask: Value of the fields parameter
+        pos: Position to parse from, for nested selections
+        tree: Tree to add the selected keys to
+
+    Returns:
+        Tree of selected keys, where an empty dict selects a whole value,
+        and the position where parsing stopped
+    """
+    tree = {} if tree is None else tree
+    while pos < len(mask):
+        node = tree
+        while True:
+            start = pos
+            while pos < len(mask) and mask[pos] not in ",/()":
+                pos += 1
+            node = node.setdefault(mask[start:pos].strip(), {})
+            if pos < len(mask) and mask[pos] == "/":
+                pos += 1
+                continue
+            if pos < len(mask) and mask[pos] == "(":
+                _, pos = _parse_fields(mask, pos + 1, node)
+                pos += 1
+            break
+        if pos < len(mask) and mask[pos] == ",":
+            pos += 1
+        else:
+            break
+    return tree, pos
+
+
+def _select_fields(value: Any, tree: Dict) -> Any:
+    """
+    Keep the parts of a response selected by a parsed fields mask.
+
+    Args:
+        value: Response body or part of it
+        tree: Tree returned by _parse_fields
+
+    Returns:
+        Partial response
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_select_fields(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: _select_fields(value[key], sub)
+            for key, sub in tree.items()
+            if key in value
+        }
+    return value
+
+
+def _page_size(params: Dict[str, List[str]]) -> int:
+    """Page size requested with maxResults, within Gmail's limits."""
+    requested = int(params.get("maxResults", [DEFAULT_PAGE_SIZE])[0])
+    return max(1, min(requested, MAX_PAGE_SIZE))
+
+
+def _error(status: int, message: str) -> Response:
+    """Gmail-style JSON error body."""
+    return status, {"error": {"code": status, "message": message}}
+
+
+def _reason(status: int) -> str:
+    """HTTP reason phrase of a status code."""
+    return "OK" if status == 200 else "Error"
+
+
+@click.command()
+@click.option("--messages", default=1000, help="Unread messages in inbox")
+@click.option("--port", default=8080, help="Port to listen on")
+@click.option("--latency", default=0.0, help="Seconds added per request")
+@click.option("--error-rate", default=0.0, help="Fraction of failed calls")
+def serve(messages: int, port: int, latency: float, error_rate: float):
+    """Run a local Gmail API emulator until interrupted."""
+    emulator = GmailEmulator(
+        messages, latency=latency, error_rate=error_rate, port=port
+    )
+    click.echo(f"Serving {messages} messages at {emulator.root_url}")
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    serve()  # pylint: disable=no-value-for-parameter
@@ -2,16 +2,62 @@
 Main CLI entry point for Gmail CLI application.
 """
 
+import functools
+import os
 import sys
+import time
+from datetime import datetime
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 import click
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
 from rich.panel import Panel
-from .gmail_client import GmailClient
+from rich.table import Table
+from rich.text import Text
+from .email_summary import EmailSummary
 from .email_table_formatter import EmailTableFormatter
 from .message_utils import MessageUtils
+from .metadata_cache import MetadataCache
+from .metrics import Metrics
+from .output_writers import WRITERS
+from .search_index import SearchIndex
+from .sync_state import SyncState
+
+if TYPE_CHECKING:
+    from .gmail_client import GmailClient
+
+# The Google client libraries are imported inside the functions that use
+# them, so that --help and --version do not pay their import cost.
 
+# Options of the single-account listing that --accounts polling ignores
+_SINGLE_ACCOUNT_OPTIONS = frozenset(
+    (
+        "concurrency",
+        "cache_path",
+        "no_cache",
+        "sync",
+        "watch",
+        "stream",
+        "since",
+        "until",
+        "query",
+        "labels",
+        "extra_headers",
+        "snippet",
+        "root_url",
+    )
+)
 
-@click.command()
+
+@click.group(invoke_without_command=True)
 @click.option(
     "--max-results",
     "-m",
@@ -30,8 +76,155 @@ from .message_utils import MessageUtils
     default="token.json",
     help="Path to OAuth token file (default: token.json)",
 )
+@click.option(
+    "--concurrency",
+    "-n",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of parallel metadata fetches (default: 1, uses batching)",
+)
+@click.option(
+    "--cache-path",
+    default=None,
+    help="Path to the metadata cache (default: next to the token file)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Fetch all message metadata from Gmail, bypassing the cache",
+)
+@click.option(
+    "--no-index",
+    is_flag=True,
+    help="Do not add fetched emails to the local search index",
+)
+@click.option(
+    "--sync",
+    is_flag=True,
+    help="Update the unread set incrementally from Gmail history",
+)
+@click.option(
+    "--accounts",
+    "accounts_config",
+    default=None,
+    help="Poll every account listed in this JSON configuration file",
+)
+@click.option(
+    "--watch",
+    "-w",
+    default=None,
+    type=click.IntRange(min=1),
+    metavar="SECONDS",
+    help="Keep running and refresh the table every SECONDS seconds",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print rows page by page as they are fetched",
+)
+@click.option(
+    "--since",
+    default=None,
+    type=click.DateTime(),
+    help="Only list emails received at or after this date/time",
+)
+@click.option(
+    "--until",
+    default=None,
+    type=click.DateTime(),
+    help="Only list emails received before this date/time",
+)
+@click.option(
+    "--query",
+    "-q",
+    default=None,
+    help='Gmail search string, e.g. "from:alice newer_than:7d"',
+)
+@click.option(
+    "--label",
+    "labels",
+    multiple=True,
+    help="Only list emails carrying this label ID (repeatable)",
+)
+@click.option(
+    "--threads",
+    is_flag=True,
+    help="Show one row per thread with its number of unread messages",
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="table",
+    type=click.Choice(["table", "jsonl", "csv"]),
+    help="Output format; jsonl and csv stream rows to stdout for piping",
+)
+@click.option(
+    "--headers",
+    "extra_headers",
+    default="",
+    callback=lambda _ctx, _param, value: tuple(
+        name.strip() for name in value.split(",") if name.strip()
+    ),
+    metavar="NAMES",
+    help="Comma-separated extra headers to fetch and show, e.g. To,Cc",
+)
+@click.option(
+    "--snippet",
+    is_flag=True,
+    help="Fetch and show the start of every message body",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print a timing breakdown (p50/p95/p99) per call type at exit",
+)
+@click.option(
+    "--metrics-json",
+    default=None,
+    metavar="PATH",
+    help="Write timings and counters of the run as JSON to PATH",
+)
+@click.option(
+    "--measure-savings",
+    is_flag=True,
+    help="With --profile or --metrics-json, estimate the bytes saved by "
+    "field masks, at the cost of two extra calls",
+)
+@click.option(
+    "--root-url",
+    default=None,
+    envvar="GMAIL_CLI_ROOT_URL",
+    help="Use a Gmail-compatible server, e.g. the local emulator, without "
+    "OAuth",
+)
 @click.version_option(version="0.1.0", prog_name="gmail-cli")
-def main(max_results: int, credentials: str, token: str):
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+# pylint: disable=too-many-locals
+def main(
+    max_results: int,
+    credentials: str,
+    token: str,
+    concurrency: int,
+    cache_path: str,
+    no_cache: bool,
+    no_index: bool,
+    sync: bool,
+    accounts_config: str,
+    watch: Optional[int],
+    stream: bool,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    query: Optional[str],
+    labels: Tuple[str, ...],
+    threads: bool,
+    output_format: str,
+    extra_headers: Tuple[str, ...],
+    snippet: bool,
+    profile: bool,
+    metrics_json: Optional[str],
+    measure_savings: bool,
+    root_url: Optional[str],
+):
     """
     Gmail CLI - List unread emails from your Gmail account.
 
@@ -39,30 +232,121 @@ def main(max_results: int, credentials: str, token: str):
     Follow the setup instructions in the README to
     configure OAuth 2.0 credentials.
     """
-    console = Console()
-    formatter = EmailTableFormatter()
-    message_utils = MessageUtils()
+    if click.get_current_context().invoked_subcommand is not None:
+        return
+    _check_options(output_format, watch, accounts_config, threads)
+    # Machine-readable formats own stdout, diagnostics go to stderr
+    machine_output = output_format != "table"
 
-    console.print(
-        Panel(
-            "[bold cyan]Gmail CLI[/bold cyan]\n"
-            "Access your unread Gmail messages from the command line",
-            style="blue",
-            border_style="blue",
+    console = Console(stderr=machine_output)
+    # Percentiles need every sample, which --watch would pile up forever
+    metrics = Metrics(keep_samples=bool(profile or metrics_json))
+    formatter = EmailTableFormatter(metrics, extra_headers, snippet)
+    message_utils = MessageUtils(console)
+    if profile or metrics_json:
+        click.get_current_context().call_on_close(
+            functools.partial(
+                _report_metrics,
+                metrics,
+                time.perf_counter(),
+                console if profile else None,
+                metrics_json,
+            )
+        )
+
+    if not machine_output:
+        console.print(
+            Panel(
+                "[bold cyan]Gmail CLI[/bold cyan]\n"
+                "Access your unread Gmail messages from the command line",
+                style="blue",
+                border_style="blue",
+            )
         )
-    )
 
     try:
-        gmail_client = GmailClient(credentials, token)
+        if accounts_config:
+            _poll_accounts(accounts_config, max_results, formatter)
+            return
+
+        with metrics.timer("import"):
+            # pylint: disable=import-outside-toplevel
+            from .gmail_client import GmailClient, build_search_query
+
+        gmail_client = GmailClient(
+            credentials,
+            token,
+            concurrency,
+            cache=(
+                None
+                if no_cache
+                else MetadataCache(
+                    cache_path or MetadataCache.default_path(token)
+                )
+            ),
+            metrics=metrics,
+            root_url=root_url,
+            search_index=(
+                None
+                if no_index
+                else SearchIndex(SearchIndex.default_path(token))
+            ),
+            extra_headers=extra_headers,
+            snippet=snippet,
+            measure_savings=measure_savings,
+        )
+        click.get_current_context().call_on_close(gmail_client.close)
         if not gmail_client.authenticate():
             message_utils.error(
                 "Authentication failed! Please check your credentials file."
             )
             sys.exit(1)
 
-        message_utils.success("Successfully authenticated with Gmail!")
+        if not machine_output:
+            message_utils.success("Successfully authenticated with Gmail!")
+
+        # Filters are applied server-side; history sync cannot apply them,
+        # nor group threads, so those listings always relist
+        query = (
+            " ".join(filter(None, [query, build_search_query(since, until)]))
+            or None
+        )
+        label_ids = list(labels)
+        sync_state = None
+        if (sync or watch) and not (query or label_ids or threads):
+            sync_state = SyncState.load(SyncState.default_path(token))
+        get_emails, iter_emails = _listing(
+            gmail_client, threads, max_results, sync_state, query, label_ids
+        )
+
+        if watch:
+            _watch(iter_emails, watch, max_results, formatter)
+            return
+
+        if machine_output:
+            _write_output(
+                functools.partial(
+                    WRITERS[output_format],
+                    headers=extra_headers,
+                    snippet=snippet,
+                ),
+                iter_emails(),
+            )
+            return
+
+        if stream:
+            formatter.display_emails_stream(iter_emails(), max_results)
+            return
 
-        emails = gmail_client.get_unread_emails(max_results)
+        emails = get_emails()
+        latencies = gmail_client.request_latencies
+        if latencies:
+            kind = "thread" if threads else "message"
+            message_utils.info(
+                f"Fetched {len(latencies)} {kind}(s) with {concurrency} "
+                f"workers (avg {sum(latencies) / len(latencies) * 1000:.0f} "
+                f"ms, max {max(latencies) * 1000:.0f} ms per request)"
+            )
         formatter.display_emails(emails, max_results)
     except Exception as e:
         message_utils.error(f"An unexpected error occurred: {str(e)}")
@@ -70,6 +354,316 @@ def main(max_results: int, credentials: str, token: str):
         sys.exit(1)
 
 
+@main.command()
+@click.argument("words", nargs=-1, required=True)
+@click.option(
+    "--limit",
+    "-l",
+    default=50,
+    type=click.IntRange(min=1),
+    help="Maximum number of matches (default: 50)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="table",
+    type=click.Choice(["table", "jsonl", "csv"]),
+    help="Output format; jsonl and csv stream rows to stdout for piping",
+)
+def search(words: Tuple[str, ...], limit: int, output_format: str):
+    """
+    Search emails fetched before, without contacting Gmail.
+
+    Every word must match, by prefix, the sender, subject, snippet or date
+    of an email. The index lives next to the --token file and is filled
+    by every listing run.
+    """
+    token = click.get_current_context().find_root().params["token"]
+    path = SearchIndex.default_path(token)
+    machine_output = output_format != "table"
+    message_utils = MessageUtils(Console(stderr=machine_output))
+    if not os.path.exists(path):
+        message_utils.error(
+            "No search index yet, list your emails with gmail-cli first."
+        )
+        sys.exit(1)
+
+    index = SearchIndex(path)
+    started = time.perf_counter()
+    matches = index.search(" ".join(words), limit)
+    elapsed = time.perf_counter() - started
+    index.close()
+
+    if machine_output:
+        _write_output(WRITERS[output_format], matches)
+        return
+    text = " ".join(words)
+    if not matches:
+        message_utils.info(f"No indexed emails match '{text}'.")
+        return
+    EmailTableFormatter(snippet=True).display_emails(
+        matches, limit, title=f"🔍 Emails matching '{text}'"
+    )
+    message_utils.info(
+        f"{len(matches)} match(es) from the local index in "
+        f"{elapsed * 1000:.1f} ms"
+    )
+
+
+def _report_metrics(
+    metrics: Metrics,
+    started: float,
+    console: Optional[Console],
+    metrics_json: Optional[str],
+) -> None:
+    """
+    Print and/or dump the metrics of the run, called when the CLI exits.
+
+    Args:
+        metrics: Metrics of the run
+        started: perf_counter() value when the run started
+        console: Console to print the breakdown to, None to skip it
+        metrics_json: Path to write the JSON summary to, None to skip it
+    """
+    metrics.record("total", time.perf_counter() - started)
+    if metrics_json:
+        metrics.dump(metrics_json)
+    if console is None:
+        return
+
+    summary = metrics.summary()
+    table = Table(
+        title="Profile", title_style="bold cyan", border_style="blue"
+    )
+    table.add_column("Call", style="cyan")
+    for column in ("Count", "Total ms", "p50 ms", "p95 ms", "p99 ms"):
+        table.add_column(column, justify="right")
+    for name, stats in sorted(
+        summary["timings"].items(), key=lambda item: -item[1]["total_ms"]
+    ):
+        table.add_row(
+            name,
+            str(stats["count"]),
+            f"{stats['total_ms']:.1f}",
+            f"{stats['p50_ms']:.1f}",
+            f"{stats['p95_ms']:.1f}",
+            f"{stats['p99_ms']:.1f}",
+        )
+    console.print(table)
+    saved = summary["counters"].get("bytes.saved")
+    if saved:
+        total = saved + summary["counters"].get("bytes.received", 0)
+        console.print(
+            f"Field masks saved ~{saved / 1024:.1f} KB of "
+            f"~{total / 1024:.1f} KB ({saved / total:.0%})",
+            style="bold green",
+        )
+    if summary["counters"]:
+        console.print(
+            "  ".join(
+                f"{name}={value}"
+                for name, value in sorted(summary["counters"].items())
+            ),
+            style="dim",
+        )
+
+
+def _check_options(
+    output_format: str,
+    watch: Optional[int],
+    accounts_config: Optional[str],
+    threads: bool,
+) -> None:
+    """
+    Reject option combinations that cannot work together.
+
+    Args:
+        output_format: Value of --format
+        watch: Value of --watch
+        accounts_config: Value of --accounts
+        threads: Value of --threads
+
+    Raises:
+        click.UsageError: If the options conflict
+    """
+    if output_format != "table" and (watch or accounts_config):
+        raise click.UsageError(
+            f"--format {output_format} cannot be combined with --watch or "
+            "--accounts"
+        )
+    if threads and accounts_config:
+        raise click.UsageError("--threads cannot be combined with --accounts")
+    if accounts_config:
+        ctx = click.get_current_context()
+        ignored = [
+            param.opts[0]
+            for param in ctx.command.params
+            if param.name in _SINGLE_ACCOUNT_OPTIONS
+            and ctx.get_parameter_source(param.name)
+            != click.core.ParameterSource.DEFAULT
+        ]
+        if ignored:
+            raise click.UsageError(
+                f"{', '.join(ignored)} cannot be combined with --accounts"
+            )
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def _listing(
+    gmail_client: "GmailClient",
+    threads: bool,
+    max_results: int,
+    sync_state: Optional[SyncState],
+    query: Optional[str],
+    label_ids: List[str],
+) -> Tuple[
+    Callable[[], List[EmailSummary]], Callable[[], Iterable[EmailSummary]]
+]:
+    """
+    Bind the client calls listing the emails to display.
+
+    Args:
+        gmail_client: Authenticated Gmail client
+        threads: Whether to list one record per thread
+        max_results: Maximum number of emails or threads
+        sync_state: Incremental sync state, ignored for threads
+        query: Gmail search string narrowing the listing
+        label_ids: Label IDs the messages must carry besides UNREAD
+
+    Returns:
+        Callables returning the sorted list and a lazy iterator
+    """
+    if threads:
+        args = (max_results, query, label_ids)
+        return (
+            functools.partial(gmail_client.get_unread_threads, *args),
+            functools.partial(gmail_client.iter_unread_threads, *args),
+        )
+    args = (max_results, sync_state, query, label_ids)
+    return (
+        functools.partial(gmail_client.get_unread_emails, *args),
+        functools.partial(gmail_client.iter_unread_emails, *args),
+    )
+
+
+def _write_output(
+    writer: Callable[[Iterable[EmailSummary], IO[str]], int],
+    emails: Iterable[EmailSummary],
+) -> None:
+    """
+    Stream emails to stdout with a machine-readable writer.
+
+    A reader closing the pipe early, e.g. `| head`, ends the output
+    quietly instead of failing.
+
+    Args:
+        writer: Writer from output_writers.WRITERS
+        emails: Email records, e.g. a generator
+    """
+    try:
+        writer(emails, sys.stdout)
+    except BrokenPipeError:
+        # Python flushes stdout again at exit, point it at devnull so that
+        # flush cannot fail too
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
+def _watch(
+    iter_emails: Callable[[], Iterable[EmailSummary]],
+    interval: int,
+    max_results: int,
+    formatter: EmailTableFormatter,
+) -> None:
+    """
+    Re-poll on an interval and redraw the table in place until interrupted.
+
+    The authenticated client and its connections stay alive between polls,
+    and unless filters are given the unread set is synced incrementally
+    from Gmail history, so a steady-state poll costs a single round trip
+    when nothing changed. A failed poll keeps the last table on screen
+    with the error below it, and the next poll tries again.
+
+    Args:
+        iter_emails: Lists emails through the authenticated client,
+            raising on failure
+        interval: Seconds between polls
+        max_results: Maximum number of emails to display
+        formatter: Table formatter
+    """
+    view: Optional[RenderableType] = None
+    with Live(console=formatter.console, auto_refresh=False) as live:
+        try:
+            while True:
+                updated = time.strftime("%H:%M:%S")
+                try:
+                    # Same order as the Gmail web interface
+                    emails = sorted(
+                        iter_emails(),
+                        key=lambda e: e.get("internal_date") or 0,
+                        reverse=True,
+                    )
+                except Exception as e:
+                    status = Text(
+                        f"Poll failed at {updated}, retrying in "
+                        f"{interval}s: {e}",
+                        style="bold red",
+                    )
+                    live.update(
+                        status if view is None else Group(view, status),
+                        refresh=True,
+                    )
+                else:
+                    view = formatter.render(
+                        emails,
+                        max_results,
+                        title=f"📧 Unread Gmail Messages (updated {updated})",
+                    )
+                    live.update(view, refresh=True)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+
+
+def _poll_accounts(
+    config_path: str, max_results: int, formatter: EmailTableFormatter
+) -> None:
+    """
+    Poll every configured account and display one table per account.
+
+    Args:
+        config_path: Path to the multi-account JSON configuration
+        max_results: Maximum number of emails per account
+        formatter: Table formatter
+    """
+    # pylint: disable=import-outside-toplevel
+    from .multi_account import MultiAccountPoller, load_accounts_config
+
+    message_utils = MessageUtils()
+    config = load_accounts_config(config_path)
+    poller = MultiAccountPoller(config["accounts"], config["max_workers"])
+
+    failed = poller.authenticate()
+    if len(failed) == len(config["accounts"]):
+        message_utils.error(
+            "Authentication failed for every account! "
+            "Please check your credentials files."
+        )
+        sys.exit(1)
+
+    for name in failed:
+        message_utils.error(f"Authentication failed for account '{name}'")
+
+    results = poller.poll(max_results)
+    for name, emails in results.items():
+        if name in poller.errors:
+            message_utils.error(f"{name}: {poller.errors[name]}")
+            continue
+        formatter.display_emails(
+            emails, max_results, title=f"📧 Unread Gmail Messages — {name}"
+        )
+
+
 if __name__ == "__main__":
     # pylint: disable=no-value-for-parameter
     main()
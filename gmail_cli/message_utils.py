@@ -2,6 +2,7 @@
 Message display utilities for CLI applications.
 """
 
+from typing import Optional
 from rich.console import Console
 from rich.panel import Panel
 
@@ -9,9 +10,14 @@ from rich.panel import Panel
 class MessageUtils:
     """Utility class for displaying formatted messages in CLI."""
 
-    def __init__(self):
-        """Initialize the message utils with a console."""
-        self.console = Console()
+    def __init__(self, console: Optional[Console] = None):
+        """
+        Initialize the message utils with a console.
+
+        Args:
+            console: Console to print to, a new stdout console by default
+        """
+        self.console = console or Console()
 
     def error(self, message: str) -> None:
         """
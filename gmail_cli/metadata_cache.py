@@ -0,0 +1,102 @@
+"""
+Persistent on-disk cache of Gmail message metadata.
+"""
+
+import json
+from typing import Dict, List
+from .email_summary import EmailSummary
+from .sqlite_store import SQLiteStore
+
+
+class MetadataCache(SQLiteStore):
+    """SQLite-backed LRU cache of email records keyed by message ID."""
+
+    DEFAULT_FILENAME = "metadata_cache.sqlite3"
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        Open, creating if needed, the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Number of messages kept before the least recently
+                used ones are evicted
+        """
+        self.max_entries = max_entries
+        super().__init__(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+            "last_access INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS messages_last_access "
+            "ON messages (last_access)"
+        )
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(last_access), 0) FROM messages"
+        ).fetchone()
+        self._clock = row[0]
+
+    def get_many(self, message_ids: List[str]) -> Dict[str, EmailSummary]:
+        """
+        Look up cached metadata and mark the hits as recently used.
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            Email records keyed by message ID, for cached IDs only
+        """
+        found: Dict[str, EmailSummary] = {}
+        with self._lock:
+            for start in range(0, len(message_ids), self._CHUNK_SIZE):
+                end = start + self._CHUNK_SIZE
+                chunk = message_ids[start:end]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, data FROM messages "
+                    f"WHERE id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for message_id, data in rows:
+                    found[message_id] = EmailSummary.from_dict(
+                        json.loads(data)
+                    )
+
+            if found:
+                self._clock += 1
+                self._conn.executemany(
+                    "UPDATE messages SET last_access = ? WHERE id = ?",
+                    [(self._clock, message_id) for message_id in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, emails: Dict[str, EmailSummary]) -> None:
+        """
+        Store metadata and evict the least recently used entries.
+
+        Args:
+            emails: Email records keyed by message ID
+        """
+        if not emails:
+            return
+        with self._lock:
+            self._clock += 1
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages (id, data, last_access) "
+                "VALUES (?, ?, ?)",
+                [
+                    (message_id, json.dumps(email.to_dict()), self._clock)
+                    for message_id, email in emails.items()
+                ],
+            )
+            self._conn.execute(
+                "DELETE FROM messages WHERE id NOT IN ("
+                "SELECT id FROM messages "
+                "ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
@@ -0,0 +1,133 @@
+"""
+Timers and counters for profiling where a run spends its time.
+"""
+
+import contextlib
+import json
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterator, List
+
+
+class Metrics:
+    """Thread-safe collection of named timings and counters."""
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        keep_samples: bool = True,
+    ):
+        """
+        Initialize empty metrics.
+
+        Args:
+            clock: Monotonic clock in seconds, for tests
+            keep_samples: Keep every timing sample for percentiles; when
+                False only the count, total and max of each timing are
+                kept, so long-running processes stay in constant memory
+        """
+        self._clock = clock
+        self.keep_samples = keep_samples
+        # Per timing name: [count, total, max] seconds
+        self._totals: Dict[str, List[float]] = {}
+        self._timings: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block, also when it raises.
+
+        Args:
+            name: Timing name, e.g. the Gmail method called
+        """
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Add one timing sample.
+
+        Args:
+            name: Timing name
+            seconds: Duration of the sample
+        """
+        with self._lock:
+            totals = self._totals.setdefault(name, [0, 0.0, seconds])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+            if self.keep_samples:
+                self._timings.setdefault(name, []).append(seconds)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount added
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def summary(self) -> Dict:
+        """
+        Summarize the samples collected so far.
+
+        Returns:
+            Dictionary with 'timings', per name the sample count and the
+            total and max durations in milliseconds, plus the p50/p95/p99
+            durations if samples are kept, and 'counters'
+        """
+        with self._lock:
+            totals = {name: list(t) for name, t in self._totals.items()}
+            timings = {name: sorted(s) for name, s in self._timings.items()}
+            counters = dict(self._counters)
+
+        summary: Dict = {"timings": {}, "counters": counters}
+        for name, (count, total, maximum) in totals.items():
+            stats = {
+                "count": count,
+                "total_ms": total * 1000,
+                "max_ms": maximum * 1000,
+            }
+            if name in timings:
+                for percentile in self.PERCENTILES:
+                    stats[f"p{percentile}_ms"] = (
+                        _percentile(timings[name], percentile) * 1000
+                    )
+            summary["timings"][name] = stats
+        return summary
+
+    def dump(self, path: str) -> None:
+        """
+        Write the summary as JSON, e.g. for monitoring.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, "w", encoding="utf-8") as metrics_file:
+            json.dump(self.summary(), metrics_file, indent=2)
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    """
+    Nearest-rank percentile of sorted samples.
+
+    Args:
+        samples: Non-empty, sorted samples
+        percentile: Percentile between 0 and 100
+
+    Returns:
+        Sample at the percentile
+    """
+    rank = math.ceil(percentile / 100 * len(samples))
+    return samples[max(rank, 1) - 1]
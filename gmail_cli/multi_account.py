@@ -0,0 +1,232 @@
+"""
+Polling of several Gmail accounts on a shared worker pool.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+from .email_summary import EmailSummary
+from .gmail_client import GmailClient
+from .rate_limiter import GmailRateLimiter, TokenBucket
+
+
+class AccountConfig(NamedTuple):
+    """Credential and token files of one account, with its rate limit."""
+
+    name: str
+    credentials: str
+    token: str
+    # Maximum Gmail API requests per second, None for unlimited
+    rate_limit: Optional[float] = None
+
+
+def load_accounts_config(path: str) -> Dict:
+    """
+    Load a multi-account configuration file.
+
+    The file is JSON with an "accounts" list of objects holding "name",
+    "credentials", "token" and optionally "rate_limit", plus an optional
+    top-level "max_workers". Relative paths are resolved against the
+    directory of the configuration file.
+
+    Args:
+        path: Path to the JSON configuration file
+
+    Returns:
+        Dictionary with 'accounts' (list of AccountConfig) and
+        'max_workers' keys
+
+    Raises:
+        ValueError: If the configuration is invalid
+    """
+    with open(path, "r", encoding="utf-8") as config_file:
+        data = json.load(config_file)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    accounts = []
+    for entry in data.get("accounts", []):
+        try:
+            accounts.append(
+                AccountConfig(
+                    name=entry["name"],
+                    credentials=os.path.join(base_dir, entry["credentials"]),
+                    token=os.path.join(base_dir, entry["token"]),
+                    rate_limit=entry.get("rate_limit"),
+                )
+            )
+        except KeyError as e:
+            raise ValueError(f"Account entry missing {e} in {path}") from e
+
+    if not accounts:
+        raise ValueError(f"No accounts configured in {path}")
+
+    return {
+        "accounts": accounts,
+        "max_workers": data.get(
+            "max_workers", MultiAccountPoller.DEFAULT_WORKERS
+        ),
+    }
+
+
+class MultiAccountPoller:
+    """Poll many accounts with one bounded executor shared between them."""
+
+    DEFAULT_WORKERS = 8
+
+    def __init__(
+        self, accounts: List[AccountConfig], max_workers: int = DEFAULT_WORKERS
+    ):
+        """
+        Initialize the poller.
+
+        Args:
+            accounts: Accounts to poll
+            max_workers: Size of the shared worker pool
+        """
+        self.accounts = accounts
+        self.max_workers = max(1, max_workers)
+        # Every account has its own Gmail quota; its limiter must admit as
+        # many requests in flight as the shared pool can run
+        self.clients = {
+            account.name: GmailClient(
+                account.credentials,
+                account.token,
+                rate_limiter=GmailRateLimiter(
+                    max_concurrency=self.max_workers
+                ),
+            )
+            for account in accounts
+        }
+        self.limiters = {
+            account.name: TokenBucket(account.rate_limit)
+            for account in accounts
+            if account.rate_limit
+        }
+        self.errors: Dict[str, str] = {}
+
+    def authenticate(self) -> List[str]:
+        """
+        Authenticate every account, one at a time.
+
+        Accounts run one after another because a first login opens an
+        interactive browser flow.
+
+        Returns:
+            Names of the accounts that failed to authenticate
+        """
+        failed = []
+        for account in self.accounts:
+            if not self.clients[account.name].authenticate():
+                failed.append(account.name)
+                self.errors[account.name] = "Authentication failed"
+        return failed
+
+    def poll(self, max_results: int = 50) -> Dict[str, List[EmailSummary]]:
+        """
+        Fetch unread emails of every authenticated account.
+
+        Listing and metadata requests of all accounts run on one executor.
+        Metadata requests are queued round-robin across accounts, so a
+        large mailbox cannot starve the others, and a request is only
+        queued once its account's rate limit admits it, so a throttled
+        account never holds a worker while it waits.
+
+        Args:
+            max_results: Maximum number of emails per account
+
+        Returns:
+            Email records per account name, each with its account set.
+            Failed accounts map to an empty list and their error is
+            recorded in errors.
+        """
+        names = [a.name for a in self.accounts if self.clients[a.name].service]
+        results: Dict[str, List[EmailSummary]] = {name: [] for name in names}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            listings = self._dispatch(
+                executor, {name: [max_results] for name in names}, "list"
+            )
+
+            id_lists = {}
+            for name, (listing,) in listings.items():
+                try:
+                    id_lists[name] = listing.result()
+                except Exception as e:
+                    self.errors[name] = str(e)
+
+            fetches = self._dispatch(executor, id_lists, "get")
+
+            for name, futures in fetches.items():
+                try:
+                    emails = [future.result() for future in futures]
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    continue
+                for email_data in emails:
+                    email_data.account = name
+                results[name] = emails
+
+        return results
+
+    def _dispatch(
+        self,
+        executor: ThreadPoolExecutor,
+        arguments: Dict[str, List],
+        kind: str,
+    ) -> Dict[str, List[Future]]:
+        """
+        Queue calls round-robin by account, as their rate limits admit them.
+
+        Waiting for a rate limit happens here, in the calling thread, and
+        only when no account can send a request; workers are never held.
+
+        Args:
+            executor: Shared executor
+            arguments: Call arguments per account name, in call order
+            kind: "list" to list unread IDs, "get" to fetch one email
+
+        Returns:
+            Call futures per account name, in argument order
+        """
+        futures: Dict[str, List[Future]] = {name: [] for name in arguments}
+        queues = {
+            name: deque(values) for name, values in arguments.items() if values
+        }
+        while queues:
+            delays = []
+            for name in list(queues):
+                limiter = self.limiters.get(name)
+                delay = limiter.try_acquire() if limiter else 0.0
+                if delay:
+                    delays.append(delay)
+                    continue
+                queue = queues[name]
+                futures[name].append(
+                    executor.submit(self._call, name, kind, queue.popleft())
+                )
+                if not queue:
+                    del queues[name]
+            # Every account left is throttled, sleep until one may send
+            if delays and len(delays) == len(queues):
+                time.sleep(min(delays))
+        return futures
+
+    def _call(self, name: str, kind: str, argument):
+        """
+        Run one Gmail API call for an account.
+
+        Args:
+            name: Account name
+            kind: "list" to list unread IDs, "get" to fetch one email
+            argument: max_results for "list", message ID for "get"
+
+        Returns:
+            List of message IDs for "list", email record for "get"
+        """
+        client = self.clients[name]
+        if kind == "list":
+            return client.list_unread_ids(argument)
+        return client.fetch_email(argument)
@@ -0,0 +1,154 @@
+"""
+Streaming machine-readable output of emails, for piping into other tools.
+"""
+
+import csv
+import json
+from typing import IO, Any, Callable, Dict, Iterable, List, Sequence, Tuple
+from .email_summary import EmailSummary
+
+# Columns written for each email, in order; keep the README list in step
+FIELDS = (
+    "id",
+    "thread_id",
+    "from",
+    "subject",
+    "date",
+    "internal_date",
+    "message_count",
+)
+# Rows written between flushes of the output stream
+FLUSH_EVERY = 500
+# EmailSummary attributes holding the FIELDS columns
+_SUMMARY_VALUES = EmailSummary.getter(*FIELDS)
+
+
+def write_jsonl(
+    emails: Iterable[EmailSummary],
+    out: IO[str],
+    flush_every: int = FLUSH_EVERY,
+    headers: Sequence[str] = (),
+    snippet: bool = False,
+) -> int:
+    """
+    Write emails as JSON Lines, one object per email.
+
+    Rows are encoded as the emails arrive and written in chunks of
+    flush_every lines, so the full result is never held in memory.
+
+    Args:
+        emails: Email records or dictionaries, e.g. a generator
+        out: Text stream to write to
+        flush_every: Number of rows per written and flushed chunk
+        headers: Extra headers written in a nested "headers" object
+        snippet: Also write the "snippet" of every email
+
+    Returns:
+        Number of emails written
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    count = 0
+    chunk: List[str] = []
+    for _email in emails:
+        row = dict(zip(FIELDS, _values(_email)))
+        if snippet:
+            row["snippet"] = _email.get("snippet") or ""
+        if headers:
+            row["headers"] = dict(
+                zip(headers, _header_values(_email, headers))
+            )
+        chunk.append(encode(row))
+        count += 1
+        if len(chunk) >= flush_every:
+            _write_chunk(out, chunk)
+            chunk = []
+    if chunk:
+        _write_chunk(out, chunk)
+    return count
+
+
+def write_csv(
+    emails: Iterable[EmailSummary],
+    out: IO[str],
+    flush_every: int = FLUSH_EVERY,
+    headers: Sequence[str] = (),
+    snippet: bool = False,
+) -> int:
+    """
+    Write emails as CSV with a header row.
+
+    Args:
+        emails: Email records or dictionaries, e.g. a generator
+        out: Text stream to write to
+        flush_every: Number of rows written between flushes
+        headers: Extra headers written as trailing columns
+        snippet: Also write a "snippet" column, before the headers
+
+    Returns:
+        Number of emails written
+    """
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(FIELDS + ("snippet",) * snippet + tuple(headers))
+    count = 0
+    for _email in emails:
+        row = _values(_email)
+        if snippet:
+            row += (_email.get("snippet") or "",)
+        if headers:
+            row += _header_values(_email, headers)
+        writer.writerow(row)
+        count += 1
+        if count % flush_every == 0:
+            out.flush()
+    out.flush()
+    return count
+
+
+def _values(email_data: Any) -> Tuple:
+    """
+    Extract the FIELDS columns of an email.
+
+    Args:
+        email_data: Email record or dictionary
+
+    Returns:
+        Column values in FIELDS order
+    """
+    if isinstance(email_data, EmailSummary):
+        return _SUMMARY_VALUES(email_data)
+    return tuple(email_data.get(field) for field in FIELDS)
+
+
+def _header_values(email_data: Any, headers: Sequence[str]) -> Tuple:
+    """
+    Extract extra header values of an email.
+
+    Args:
+        email_data: Email record or dictionary
+        headers: Header names
+
+    Returns:
+        Header values in headers order, empty for absent headers
+    """
+    values = email_data.get("headers") or {}
+    return tuple(values.get(name, "") for name in headers)
+
+
+def _write_chunk(out: IO[str], lines: List[str]) -> None:
+    """
+    Write lines with a single call and flush them.
+
+    Args:
+        out: Text stream to write to
+        lines: Lines without their trailing newline
+    """
+    lines.append("")
+    out.write("\n".join(lines))
+    out.flush()
+
+
+# Writer for each --format value other than "table"
+WRITERS: Dict[str, Callable[..., int]] = {
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+}
@@ -0,0 +1,266 @@
+"""
+Rate limiting for Gmail API calls.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+from googleapiclient.errors import HttpError
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at a constant rate."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held, defaults to one second of rate
+            clock: Monotonic clock, for tests
+            sleep: Sleep function, for tests
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, blocking until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if not delay:
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket if they are available, without waiting.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until they
+            will be available
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            # Requests larger than the bucket proceed once it is full
+            needed = min(tokens, self.capacity)
+            if self._tokens >= needed:
+                self._tokens -= tokens
+                return 0.0
+            return (needed - self._tokens) / self.rate
+
+
+class AdaptiveConcurrency:
+    """Cap on in-flight requests that shrinks when Gmail throttles."""
+
+    def __init__(self, max_limit: int):
+        """
+        Initialize the cap at its maximum.
+
+        Args:
+            max_limit: Largest number of requests allowed in flight
+        """
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until another request may start."""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled: bool = False) -> None:
+        """
+        Mark a request finished and adjust the cap.
+
+        The cap halves on throttling and grows back by one request per
+        limit-sized round of successes.
+
+        Args:
+            throttled: Whether Gmail throttled the request
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(
+                    float(self.max_limit), self.limit + 1 / self.limit
+                )
+            self._condition.notify_all()
+
+
+class GmailRateLimiter:
+    """Quota-aware limiter with retries for Gmail API requests."""
+
+    # Quota units charged by Gmail per method call
+    QUOTA_UNITS = {
+        "messages.list": 5,
+        "messages.get": 5,
+        "threads.list": 10,
+        "threads.get": 10,
+        "history.list": 2,
+        "getProfile": 1,
+    }
+    # Gmail's per-user limit in quota units per second
+    UNITS_PER_SECOND = 250
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    RATE_LIMIT_REASONS = ("ratelimitexceeded", "userratelimitexceeded")
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        units_per_second: float = UNITS_PER_SECOND,
+        max_concurrency: int = 1,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            units_per_second: Quota units spent per second at most
+            max_concurrency: Largest number of requests in flight
+            max_retries: Retries of a throttled or failed request
+            base_delay: First backoff delay in seconds
+            max_delay: Largest backoff delay in seconds
+            sleep: Sleep function, for tests
+        """
+        self.bucket = TokenBucket(units_per_second, sleep=sleep)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttled = 0
+        self._sleep = sleep
+
+    def execute(self, request, method: str, calls: int = 1) -> Any:
+        """
+        Execute a request within quota, retrying with backoff.
+
+        429, 5xx and 403 rate limit errors are retried up to max_retries
+        times. Retry-After is honored when Gmail sends it, otherwise the
+        delay is exponential with full jitter.
+
+        Args:
+            request: Request, or batch request, with an execute() method
+            method: Gmail method name, used to look up its quota cost
+            calls: Number of API calls in the request, for batches
+
+        Returns:
+            Result of request.execute()
+
+        Raises:
+            HttpError: If the request fails with a non-retryable error or
+                runs out of retries
+        """
+        units = self.units(method, calls)
+        attempt = 0
+        while True:
+            self.bucket.acquire(units)
+            self.concurrency.acquire()
+            try:
+                result = request.execute()
+            except HttpError as error:
+                retryable = self.is_retryable(error.resp.status, error.content)
+                self.concurrency.release(throttled=retryable)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                self.throttled += 1
+                self._sleep(
+                    self.retry_delay(attempt, error.resp.get("retry-after"))
+                )
+                attempt += 1
+                continue
+            except BaseException:
+                self.concurrency.release()
+                raise
+            self.concurrency.release()
+            return result
+
+    def units(self, method: str, calls: int = 1) -> int:
+        """
+        Return the quota units charged for calls of a Gmail method.
+
+        Args:
+            method: Gmail method name, e.g. "messages.get"
+            calls: Number of calls
+
+        Returns:
+            Quota units
+        """
+        return self.QUOTA_UNITS.get(method, 1) * calls
+
+    def is_retryable(self, status: int, content: bytes) -> bool:
+        """
+        Tell whether an error response is throttling or a transient error.
+
+        Args:
+            status: HTTP status of the response
+            content: Response body
+
+        Returns:
+            True if the request should be retried
+        """
+        if status in self.RETRY_STATUSES:
+            return True
+        if status == 403:
+            text = content.decode("utf-8", "replace").lower()
+            return any(r in text for r in self.RATE_LIMIT_REASONS)
+        return False
+
+    def retry_delay(
+        self, attempt: int, retry_after: Optional[str] = None
+    ) -> float:
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt: Number of retries already made
+            retry_after: Retry-After header of the response, if any
+
+        Returns:
+            Delay in seconds
+        """
+        if retry_after:
+            try:
+                return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        return random.uniform(0, ceiling)
@@ -0,0 +1,56 @@
+"""
+Response model decoding Gmail API responses with orjson when installed.
+
+orjson is optional (``pip install gmail-cli[fast]``); without it responses
+are decoded with the stdlib json module, exactly like googleapiclient's
+own JsonModel.
+"""
+
+import json
+from typing import Any, Callable, Union
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Decoder of JSON bytes or text; both raise a ValueError subclass
+_loads: Callable[[Union[bytes, str]], Any] = (
+    orjson.loads  # pylint: disable=no-member
+    if orjson is not None
+    else json.loads
+)
+
+
+class FastJsonModel(JsonModel):
+    """JsonModel decoding response bodies with orjson if available."""
+
+    @property
+    def backend(self) -> str:
+        """Return the name of the JSON library used to decode responses."""
+        return "orjson" if orjson is not None else "json"
+
+    def deserialize(self, content: Union[bytes, str]) -> Any:
+        """
+        Decode a response body.
+
+        The bytes are decoded in a single pass, without first converting
+        them to text as JsonModel does. Like JsonModel, a body that is not
+        JSON is returned as text.
+
+        Args:
+            content: Response body
+
+        Returns:
+            Decoded body
+        """
+        try:
+            body = _loads(content)
+        except ValueError:
+            if isinstance(content, bytes):
+                return content.decode("utf-8", errors="replace")
+            return content
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
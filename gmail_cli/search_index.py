@@ -0,0 +1,182 @@
+"""
+Local full-text index over fetched message metadata.
+"""
+
+import json
+from typing import Iterable, List, Set
+from .email_summary import EmailSummary
+from .sqlite_store import SQLiteStore
+
+
+class SearchIndex(SQLiteStore):
+    """SQLite FTS5 index of sender, subject, snippet and date."""
+
+    DEFAULT_FILENAME = "search_index.sqlite3"
+
+    def __init__(self, path: str):
+        """
+        Open, creating if needed, the index database.
+
+        Args:
+            path: Path to the SQLite database file
+
+        Raises:
+            sqlite3.OperationalError: If SQLite was built without FTS5
+        """
+        super().__init__(path)
+        # The FTS table indexes the columns of messages without storing
+        # them a second time; the triggers keep both in step
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS messages (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                sender TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                snippet TEXT NOT NULL,
+                date TEXT NOT NULL,
+                internal_date INTEGER,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS messages_internal_date
+                ON messages (internal_date);
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                sender, subject, snippet, date,
+                content='messages', content_rowid='rowid'
+            );
+            CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages
+            BEGIN
+                INSERT INTO messages_fts
+                    (rowid, sender, subject, snippet, date)
+                VALUES (new.rowid, new.sender, new.subject, new.snippet,
+                        new.date);
+            END;
+            CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages
+            BEGIN
+                INSERT INTO messages_fts
+                    (messages_fts, rowid, sender, subject, snippet, date)
+                VALUES ('delete', old.rowid, old.sender, old.subject,
+                        old.snippet, old.date);
+            END;
+            CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages
+            BEGIN
+                INSERT INTO messages_fts
+                    (messages_fts, rowid, sender, subject, snippet, date)
+                VALUES ('delete', old.rowid, old.sender, old.subject,
+                        old.snippet, old.date);
+                INSERT INTO messages_fts
+                    (rowid, sender, subject, snippet, date)
+                VALUES (new.rowid, new.sender, new.subject, new.snippet,
+                        new.date);
+            END;
+            """)
+        self._conn.commit()
+
+    def add_many(self, emails: Iterable[EmailSummary]) -> int:
+        """
+        Index emails not indexed yet.
+
+        Message metadata never changes, so already indexed messages are
+        skipped and feeding every fetched page keeps the index current.
+        The one exception is a message indexed without its snippet, which
+        is filled in once a record carrying the snippet comes along.
+
+        Args:
+            emails: Email records
+
+        Returns:
+            Number of newly indexed or completed emails
+        """
+        rows = [
+            (
+                email_data.id,
+                email_data.sender,
+                email_data.subject,
+                email_data.snippet or "",
+                email_data.date,
+                email_data.internal_date,
+                json.dumps(email_data.to_dict()),
+            )
+            for email_data in emails
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            cursor = self._conn.executemany(
+                "INSERT INTO messages (id, sender, subject, snippet, date, "
+                "internal_date, data) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET snippet = excluded.snippet, "
+                "data = excluded.data "
+                "WHERE messages.snippet = '' AND excluded.snippet != ''",
+                rows,
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def without_snippet(self, message_ids: List[str]) -> Set[str]:
+        """
+        Find messages the index holds no snippet for.
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            IDs of the messages not indexed yet or indexed without snippet
+        """
+        indexed: Set[str] = set()
+        with self._lock:
+            for start in range(0, len(message_ids), self._CHUNK_SIZE):
+                end = start + self._CHUNK_SIZE
+                chunk = message_ids[start:end]
+                placeholders = ",".join("?" * len(chunk))
+                indexed.update(
+                    message_id
+                    for (message_id,) in self._conn.execute(
+                        f"SELECT id FROM messages WHERE snippet != '' "
+                        f"AND id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        return set(message_ids) - indexed
+
+    def search(self, term: str, limit: int = 50) -> List[EmailSummary]:
+        """
+        Find indexed emails matching every word of a search term.
+
+        Words match by prefix in the sender, subject, snippet or date, so
+        "ali invoice" finds mail from alice@example.com about invoices.
+
+        Args:
+            term: Words to search for
+            limit: Maximum number of emails returned
+
+        Returns:
+            Matching email records, newest first
+        """
+        query = self._fts_query(term)
+        if not query:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT messages.data FROM messages_fts "
+                "JOIN messages ON messages.rowid = messages_fts.rowid "
+                "WHERE messages_fts MATCH ? "
+                "ORDER BY messages.internal_date DESC LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [EmailSummary.from_dict(json.loads(data)) for (data,) in rows]
+
+    def _fts_query(self, term: str) -> str:
+        """
+        Turn free text into an FTS5 query of quoted prefix terms.
+
+        Quoting keeps punctuation in addresses and FTS5 keywords such as
+        AND or NEAR from being parsed as query syntax.
+
+        Args:
+            term: Words to search for
+
+        Returns:
+            FTS5 MATCH expression, empty if term has no words
+        """
+        words = term.split()
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
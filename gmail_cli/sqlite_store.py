@@ -0,0 +1,53 @@
+"""
+Base class of the SQLite databases kept next to the OAuth token.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """SQLite database of a messages table shared between threads."""
+
+    DEFAULT_FILENAME = ""
+    # SQLite's default limit on host parameters in a single statement
+    _CHUNK_SIZE = 500
+
+    def __init__(self, path: str):
+        """
+        Open, creating if needed, the database file.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+    @classmethod
+    def default_path(cls, token_file: str) -> str:
+        """
+        Return the default database location, next to the OAuth token file.
+
+        Args:
+            token_file: Path to the OAuth token file
+
+        Returns:
+            Path to the database file
+        """
+        return os.path.join(
+            os.path.dirname(os.path.abspath(token_file)), cls.DEFAULT_FILENAME
+        )
+
+    def __len__(self) -> int:
+        """Return the number of stored messages."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM messages"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,76 @@
+"""
+Local store of the unread message set for incremental Gmail sync.
+"""
+
+import json
+import os
+import sys
+from typing import List, Optional
+
+
+class SyncState:
+    """Last synced Gmail historyId and the unread message IDs at that point."""
+
+    DEFAULT_FILENAME = "sync_state.json"
+
+    def __init__(
+        self,
+        path: str,
+        history_id: Optional[str] = None,
+        unread_ids: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the sync state.
+
+        Args:
+            path: Path of the JSON file backing the state
+            history_id: Gmail historyId the unread set is current at
+            unread_ids: Unread message IDs, newest first
+        """
+        self.path = path
+        self.history_id = history_id
+        self.unread_ids = unread_ids or []
+
+    @classmethod
+    def default_path(cls, token_file: str) -> str:
+        """
+        Return the default state location, next to the OAuth token file.
+
+        Args:
+            token_file: Path to the OAuth token file
+
+        Returns:
+            Path to the state file
+        """
+        return os.path.join(
+            os.path.dirname(os.path.abspath(token_file)), cls.DEFAULT_FILENAME
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "SyncState":
+        """
+        Load the state from disk, starting empty if it is missing or invalid.
+
+        Args:
+            path: Path of the JSON state file
+
+        Returns:
+            Loaded sync state
+        """
+        if not os.path.exists(path):
+            return cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as state_file:
+                data = json.load(state_file)
+            return cls(path, data.get("history_id"), data.get("unread_ids"))
+        except Exception as e:
+            print(f"Error loading sync state: {e}", file=sys.stderr)
+            return cls(path)
+
+    def save(self) -> None:
+        """Write the state to disk."""
+        with open(self.path, "w", encoding="utf-8") as state_file:
+            json.dump(
+                {"history_id": self.history_id, "unread_ids": self.unread_ids},
+                state_file,
+            )
@@ -0,0 +1,39 @@
+# pylint: disable=missing-module-docstring
+
+
+def make_message(
+    message_id, subject=None, sender=None, internal_date=None, **fields
+):
+    """
+    Build a Gmail metadata message resource.
+
+    Args:
+        message_id: Message ID
+        subject: Subject header, "Subject <message_id>" by default
+        sender: From header, "Sender <<message_id>@x.com>" by default
+        internal_date: Internal date in epoch milliseconds, omitted if None
+        **fields: Further top-level fields, e.g. threadId or labelIds
+
+    Returns:
+        Message resource as returned by messages.get
+    """
+    message = {
+        "id": message_id,
+        **fields,
+        "payload": {
+            "headers": [
+                {
+                    "name": "From",
+                    "value": sender or f"Sender <{message_id}@x.com>",
+                },
+                {
+                    "name": "Subject",
+                    "value": subject or f"Subject {message_id}",
+                },
+                {"name": "Date", "value": "Mon, 1 Jan 2024 12:00:00 +0000"},
+            ]
+        },
+    }
+    if internal_date is not None:
+        message["internalDate"] = str(internal_date)
+    return message
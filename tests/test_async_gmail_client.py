@@ -0,0 +1,114 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import asyncio
+from unittest.mock import patch
+import pytest
+from google.oauth2.credentials import Credentials
+from gmail_cli.credential_manager import CredentialManager
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.rate_limiter import GmailRateLimiter
+
+httpx = pytest.importorskip("httpx")
+
+# pylint: disable=wrong-import-position
+from gmail_cli.async_gmail_client import AsyncGmailClient  # noqa: E402
+from tests.conftest import make_message  # noqa: E402
+
+API_ROOT = "http://gmail.test/gmail/v1/users/me/"
+
+
+class FakeGmail:  # pylint: disable=too-few-public-methods
+    """httpx handler serving paginated list and metadata responses."""
+
+    def __init__(self, pages, status=200, throttled=0):
+        self.pages = pages
+        self.status = status
+        self.throttled = throttled
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        assert request.headers["Authorization"] == "Bearer token"
+        if self.throttled:
+            self.throttled -= 1
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if self.status != 200:
+            return httpx.Response(self.status, json={"error": {}})
+
+        path = request.url.path
+        if path.endswith("/messages"):
+            index = int(request.url.params.get("pageToken", "0"))
+            body = {"messages": [{"id": i} for i in self.pages[index]]}
+            if index + 1 < len(self.pages):
+                body["nextPageToken"] = str(index + 1)
+            return httpx.Response(200, json=body)
+
+        assert request.url.params.get_list("metadataHeaders") == [
+            "From",
+            "Subject",
+            "Date",
+        ]
+        return httpx.Response(200, json=make_message(path.rsplit("/", 1)[-1]))
+
+
+def _run(fake, coro_factory, rate_limiter=None):
+    async def _main():
+        async with AsyncGmailClient(
+            api_root=API_ROOT,
+            transport=httpx.MockTransport(fake),
+            rate_limiter=rate_limiter,
+        ) as client:
+            with patch.object(
+                CredentialManager,
+                "get_credentials",
+                return_value=Credentials(token="token"),
+            ):
+                assert await client.authenticate()
+            return await coro_factory(client)
+
+    return asyncio.run(_main())
+
+
+class TestAsyncGmailClient:
+    def test_get_unread_emails_matches_sync_records(self):
+        fake = FakeGmail([["a", "b"]])
+
+        emails = _run(fake, lambda client: client.get_unread_emails(10))
+
+        assert emails == [
+            EmailSummary.from_message(make_message("a")),
+            EmailSummary.from_message(make_message("b")),
+        ]
+
+    def test_iter_unread_emails_walks_pages(self):
+        fake = FakeGmail([["a", "b"], ["c"], ["d"]])
+
+        async def _collect(client):
+            return [e["subject"] async for e in client.iter_unread_emails(3)]
+
+        assert _run(fake, _collect) == ["Subject a", "Subject b", "Subject c"]
+        listed = [r for r in fake.requests if r.url.path.endswith("messages")]
+        assert len(listed) == 2
+
+    def test_get_unread_emails_api_error(self):
+        fake = FakeGmail([["a"]], status=500)
+        limiter = GmailRateLimiter(base_delay=0)
+
+        assert not _run(
+            fake, lambda client: client.get_unread_emails(), limiter
+        )
+        # The transient error is retried before giving up
+        assert len(fake.requests) == limiter.max_retries + 1
+
+    def test_get_unread_emails_retries_throttled_requests(self):
+        fake = FakeGmail([["a", "b"]], throttled=2)
+        limiter = GmailRateLimiter()
+
+        emails = _run(fake, lambda client: client.get_unread_emails(), limiter)
+
+        assert [e["subject"] for e in emails] == ["Subject a", "Subject b"]
+        assert limiter.throttled == 2
+
+    def test_get_unread_emails_not_authenticated(self):
+        client = AsyncGmailClient()
+        assert not asyncio.run(client.get_unread_emails())
@@ -0,0 +1,196 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import os
+import stat
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from gmail_cli.credential_manager import CredentialManager
+from gmail_cli.gmail_client import GmailClient
+
+SCOPES = GmailClient.SCOPES
+
+
+class FakeResponse:  # pylint: disable=too-few-public-methods
+    def __init__(self, body):
+        self.status = 200
+        self.headers = {"content-type": "application/json"}
+        self.data = json.dumps(body).encode("utf-8")
+
+
+class FakeTokenEndpoint:  # pylint: disable=too-few-public-methods
+    """google.auth transport answering refresh requests with new tokens."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, method="GET", body=None, headers=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            count = self.calls
+        time.sleep(self.delay)
+        return FakeResponse(
+            {"access_token": f"token-{count}", "expires_in": 3600}
+        )
+
+
+def _write_token(path, expires_in):
+    expiry = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    with open(path, "w", encoding="utf-8") as token:
+        json.dump(
+            {
+                "token": "token-0",
+                "refresh_token": "refresh",
+                "token_uri": "https://oauth.test/token",
+                "client_id": "client",
+                "client_secret": "secret",
+                "scopes": SCOPES,
+                "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            },
+            token,
+        )
+
+
+def _manager(tmp_path, endpoint, expires_in):
+    token_file = str(tmp_path / "token.json")
+    _write_token(token_file, expires_in)
+    manager = CredentialManager(
+        str(tmp_path / "credentials.json"),
+        token_file,
+        SCOPES,
+        request_factory=lambda: endpoint,
+    )
+    return manager, token_file
+
+
+def _stored_token(token_file):
+    with open(token_file, "r", encoding="utf-8") as token:
+        return json.load(token)["token"]
+
+
+class TestCredentialManager:
+    def test_reuses_token_until_near_expiry(self, tmp_path):
+        endpoint = FakeTokenEndpoint()
+        manager, _ = _manager(tmp_path, endpoint, expires_in=3600)
+
+        first = manager.get_credentials()
+        second = manager.get_credentials()
+
+        assert first is second
+        assert first.token == "token-0"
+        assert endpoint.calls == 0
+
+    def test_refreshes_shortly_before_expiry(self, tmp_path):
+        endpoint = FakeTokenEndpoint()
+        manager, token_file = _manager(tmp_path, endpoint, expires_in=120)
+
+        creds = manager.get_credentials()
+
+        assert creds.token == "token-1"
+        assert endpoint.calls == 1
+        assert _stored_token(token_file) == "token-1"
+
+    def test_concurrent_workers_share_one_refresh(self, tmp_path):
+        endpoint = FakeTokenEndpoint(delay=0.05)
+        manager, _ = _manager(tmp_path, endpoint, expires_in=-60)
+
+        results = []
+        workers = [
+            threading.Thread(
+                target=lambda: results.append(manager.get_credentials())
+            )
+            for _ in range(8)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert endpoint.calls == 1
+        assert {creds.token for creds in results} == {"token-1"}
+
+    def test_expired_credentials_refresh_through_manager(self, tmp_path):
+        endpoint = FakeTokenEndpoint(delay=0.05)
+        manager, token_file = _manager(tmp_path, endpoint, expires_in=3600)
+        creds = manager.get_credentials()
+        # The token expires while the services built on it are running
+        creds.expiry = datetime.now(timezone.utc).replace(
+            tzinfo=None
+        ) - timedelta(minutes=1)
+        _write_token(token_file, expires_in=-60)
+
+        # As done by the HTTP transports of every worker's Gmail service
+        workers = [
+            threading.Thread(target=creds.refresh, args=(endpoint,))
+            for _ in range(8)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert endpoint.calls == 1
+        assert creds.token == "token-1"
+        assert _stored_token(token_file) == "token-1"
+
+    def test_refreshes_rejected_token_that_looks_valid(self, tmp_path):
+        endpoint = FakeTokenEndpoint()
+        manager, token_file = _manager(tmp_path, endpoint, expires_in=3600)
+        creds = manager.get_credentials()
+
+        # As done by AuthorizedHttp after a 401, e.g. for a revoked token
+        creds.refresh(endpoint)
+
+        assert endpoint.calls == 1
+        assert creds.token == "token-1"
+        assert _stored_token(token_file) == "token-1"
+
+    def test_reuses_token_refreshed_by_another_process(self, tmp_path):
+        endpoint = FakeTokenEndpoint()
+        manager, token_file = _manager(tmp_path, endpoint, expires_in=-60)
+        other_process = CredentialManager(
+            manager.credentials_file,
+            token_file,
+            SCOPES,
+            request_factory=lambda: endpoint,
+        )
+
+        assert manager.get_credentials().token == "token-1"
+        assert other_process.get_credentials().token == "token-1"
+        assert endpoint.calls == 1
+
+    def test_writes_token_atomically_and_privately(self, tmp_path):
+        endpoint = FakeTokenEndpoint()
+        manager, token_file = _manager(tmp_path, endpoint, expires_in=-60)
+
+        manager.get_credentials()
+
+        assert sorted(os.listdir(tmp_path)) == [
+            "token.json",
+            "token.json.lock",
+        ]
+        assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+
+    def test_clients_of_a_token_file_share_a_manager(self, tmp_path):
+        token_file = str(tmp_path / "token.json")
+
+        first = GmailClient("credentials.json", token_file)
+        second = GmailClient("credentials.json", token_file)
+
+        assert first.credential_manager is second.credential_manager
+
+    def test_reports_errors_on_stderr(self, tmp_path, capsys):
+        token_file = tmp_path / "token.json"
+        token_file.write_text("not json", encoding="utf-8")
+        manager = CredentialManager(
+            str(tmp_path / "credentials.json"), str(token_file), SCOPES
+        )
+
+        assert manager.get_credentials() is None
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Error loading existing token" in captured.err
+        assert "not found!" in captured.err
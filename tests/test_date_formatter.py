@@ -0,0 +1,70 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import email.utils
+import pytest
+from gmail_cli.date_formatter import DateFormatter
+
+# Date header variants seen in real mailboxes
+DATE_CORPUS = [
+    "Mon, 1 Jan 2024 12:00:00 +0000",
+    "Tue, 02 Jan 2024 08:15:30 -0500",
+    "2 Jan 2024 08:15:30 +0100",
+    "Wed, 3 Jan 2024 09:00:00 +0000 (UTC)",
+    "Thu, 4 Jan 2024 10:00:00 GMT",
+    "Fri, 5 Jan 2024 11:00 +0200",
+    "Sat, 6 Jan 24 12:00:00 +0000",
+    "Sun, 7 Jan 2024 13:00:00 EST",
+    "Mon,  8 Jan 2024 15:00:00 +0000",
+    "mon, 9 jan 2024 16:00:00 +0000",
+    "Wed, 31 Jan 2024 23:59:59 -0800",
+    "Thu, 29 Feb 2024 07:00:00 +0530",
+    "Fri, 12 Jul 2024 18:30:00 +0200 (CEST)",
+    "Tue, 1 Oct 2024 06:05:04 UT",
+]
+MALFORMED = [
+    "2025-01-01 12:00:05",
+    "",
+    "not a date",
+    "Fri, 31 Feb 2024 10:00:00 +0000",
+]
+
+
+def _stdlib_format(date_string):
+    return email.utils.parsedate_to_datetime(date_string).strftime(
+        "%Y-%m-%d %H:%M"
+    )
+
+
+class TestDateFormatter:
+    @pytest.mark.parametrize("date_string", DATE_CORPUS)
+    def test_matches_stdlib_parser(self, date_string):
+        formatter = DateFormatter()
+        assert formatter.format(date_string) == _stdlib_format(date_string)
+        assert not formatter.errors
+
+    @pytest.mark.parametrize("date_string", MALFORMED)
+    def test_malformed_returns_original(self, date_string, capsys):
+        formatter = DateFormatter()
+
+        assert formatter.format(date_string) == date_string
+        assert formatter.errors == [date_string]
+        # Errors are collected, not printed
+        assert capsys.readouterr().out == ""
+
+    def test_memoizes_repeated_headers(self):
+        formatter = DateFormatter()
+        for _ in range(3):
+            formatter.format("2025-01-01 12:00:05")
+
+        assert formatter.errors == ["2025-01-01 12:00:05"]
+
+    def test_fast_path_skips_stdlib_parser(self, monkeypatch):
+        def _fail(_):
+            raise AssertionError("stdlib parser called")
+
+        monkeypatch.setattr(email.utils, "parsedate_to_datetime", _fail)
+
+        formatter = DateFormatter()
+        assert formatter.format("Mon, 1 Jan 2024 12:00:00 +0000") == (
+            "2024-01-01 12:00"
+        )
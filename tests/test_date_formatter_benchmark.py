@@ -0,0 +1,53 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import email.utils
+import pytest
+from gmail_cli.date_formatter import DateFormatter
+from tests.test_date_formatter import DATE_CORPUS, MALFORMED
+
+pytest.importorskip("pytest_benchmark")
+
+# 10k headers drawn from the corpus, as a mailbox would repeat them
+HEADERS = [
+    (DATE_CORPUS + MALFORMED)[i % (len(DATE_CORPUS) + len(MALFORMED))]
+    for i in range(10_000)
+]
+# Distinct headers, so the memo never hits
+UNIQUE_HEADERS = [
+    f"Mon, {i % 28 + 1} Jan 2024 {i % 24:02d}:{i % 60:02d}:00 +0000"
+    for i in range(10_000)
+]
+
+
+def _stdlib(headers):
+    results = []
+    for header in headers:
+        try:
+            results.append(
+                email.utils.parsedate_to_datetime(header).strftime(
+                    "%Y-%m-%d %H:%M"
+                )
+            )
+        except Exception:
+            results.append(header)
+    return results
+
+
+def test_benchmark_stdlib_baseline(benchmark):
+    assert len(benchmark(_stdlib, HEADERS)) == len(HEADERS)
+
+
+def test_benchmark_date_formatter_corpus(benchmark):
+    def _run():
+        formatter = DateFormatter()
+        return [formatter.format(header) for header in HEADERS]
+
+    assert benchmark(_run) == _stdlib(HEADERS)
+
+
+def test_benchmark_date_formatter_unique(benchmark):
+    def _run():
+        formatter = DateFormatter()
+        return [formatter.format(header) for header in UNIQUE_HEADERS]
+
+    assert benchmark(_run) == _stdlib(UNIQUE_HEADERS)
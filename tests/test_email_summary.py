@@ -0,0 +1,132 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import tracemalloc
+import pytest
+from gmail_cli.email_summary import EmailSummary
+from tests.conftest import make_message
+
+
+def _message(index, internal_date="1704110400000"):
+    return make_message(
+        f"id{index}",
+        subject=f"Subject {index}",
+        sender=f"Sender {index} <s@x.com>",
+        internal_date=internal_date,
+        threadId=f"thread{index}",
+        labelIds=["UNREAD", "INBOX"],
+    )
+
+
+def _as_dict(msg):
+    """The email dictionary built per message before EmailSummary."""
+    headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
+    return {
+        "id": msg["id"],
+        "thread_id": msg["threadId"],
+        "from": headers.get("From", ""),
+        "subject": headers.get("Subject", ""),
+        "date": headers.get("Date", ""),
+        "internal_date": int(msg["internalDate"]),
+    }
+
+
+def _traced_size(build, messages):
+    tracemalloc.start()
+    try:
+        records = [build(msg) for msg in messages]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(records) == len(messages)
+    return size
+
+
+class TestEmailSummary:
+    def test_from_message(self):
+        summary = EmailSummary.from_message(_message(1))
+
+        assert summary.id == "id1"
+        assert summary.thread_id == "thread1"
+        assert summary.sender == "Sender 1 <s@x.com>"
+        assert summary.subject == "Subject 1"
+        assert summary.date == "Mon, 1 Jan 2024 12:00:00 +0000"
+        assert summary.internal_date == 1704110400000
+        assert summary.account is None
+        assert summary.snippet is None
+        assert summary.headers is None
+
+    def test_from_message_keeps_snippet(self):
+        message = _message(1)
+        message["snippet"] = "See you at noon"
+
+        assert EmailSummary.from_message(message).snippet == "See you at noon"
+
+    def test_from_message_keeps_extra_headers(self):
+        message = _message(1)
+        message["payload"]["headers"] += [
+            {"name": "List-Id", "value": "<dev.lists.example.com>"},
+            {"name": "From", "value": "Second From"},
+        ]
+
+        summary = EmailSummary.from_message(message)
+
+        assert summary.sender == "Sender 1 <s@x.com>"
+        assert summary.headers == {"List-Id": "<dev.lists.example.com>"}
+
+    def test_from_thread_summarizes_unread_messages(self):
+        read = _message(1, internal_date="3000")
+        read["labelIds"] = ["INBOX"]
+        thread = {
+            "id": "thread1",
+            "messages": [
+                _message(2, internal_date="1000"),
+                _message(3, internal_date="2000"),
+                read,
+            ],
+        }
+
+        summary = EmailSummary.from_thread(thread)
+
+        # Latest unread message, the newer read reply is not counted
+        assert summary.id == "id3"
+        assert summary.message_count == 2
+
+    def test_from_message_without_internal_date(self):
+        summary = EmailSummary.from_message(_message(1, internal_date=None))
+        assert summary.internal_date is None
+
+    def test_dictionary_access(self):
+        summary = EmailSummary.from_message(_message(1))
+
+        assert summary["from"] == "Sender 1 <s@x.com>"
+        assert summary.get("subject") == "Subject 1"
+        assert summary.get("missing", "default") == "default"
+        with pytest.raises(KeyError):
+            summary["sender"]  # pylint: disable=pointless-statement
+
+    def test_getter_reads_fields_by_key(self):
+        summary = EmailSummary.from_message(_message(1))
+
+        assert EmailSummary.getter("from", "subject")(summary) == (
+            "Sender 1 <s@x.com>",
+            "Subject 1",
+        )
+
+    def test_dict_round_trip(self):
+        summary = EmailSummary.from_message(_message(1))
+        summary.account = "work"
+
+        assert EmailSummary.from_dict(summary.to_dict()) == summary
+
+    def test_has_no_instance_dict(self):
+        with pytest.raises(AttributeError):
+            EmailSummary().extra = 1  # pylint: disable=assigning-non-slot
+
+    def test_uses_less_memory_than_dicts(self):
+        messages = [_message(i) for i in range(10000)]
+
+        dict_size = _traced_size(_as_dict, messages)
+        summary_size = _traced_size(EmailSummary.from_message, messages)
+
+        # Measured at about 40% of the dictionaries on CPython 3.11
+        assert summary_size < dict_size * 0.6
@@ -1,10 +1,12 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-class-docstring,missing-function-docstring
+from datetime import datetime
 from unittest.mock import patch, MagicMock
+from gmail_cli.email_summary import EmailSummary
 from gmail_cli.email_table_formatter import EmailTableFormatter
 
 
-class TestEmailTableFormatter:
+class TestEmailTableFormatter:  # pylint: disable=too-many-public-methods
     def test_format_sender(self):
         formatter = EmailTableFormatter()
         # pylint: disable=protected-access
@@ -21,6 +23,17 @@ class TestEmailTableFormatter:
             formatter._format_sender("test@example.com") == "test@example.com"
         )
 
+    def test_format_sender_with_message_count(self):
+        formatter = EmailTableFormatter()
+        # pylint: disable=protected-access
+        assert (
+            formatter._format_sender("John Doe <john@example.com>", 3)
+            == "John Doe (3)\n[dim]john@example.com[/dim]"
+        )
+        assert formatter._format_sender("john@example.com", 1) == (
+            "john@example.com"
+        )
+
     def test_format_sender_empty_string(self):
         formatter = EmailTableFormatter()
         # pylint: disable=protected-access
@@ -62,6 +75,16 @@ class TestEmailTableFormatter:
         # pylint: disable=protected-access
         assert formatter._format_date("") == ""
 
+    def test_format_date_prefers_internal_date(self):
+        formatter = EmailTableFormatter()
+        timestamp_ms = 1704110400000
+        expected = datetime.fromtimestamp(timestamp_ms / 1000).strftime(
+            "%Y-%m-%d %H:%M"
+        )
+        # pylint: disable=protected-access
+        assert formatter._format_date("garbage", timestamp_ms) == expected
+        assert not formatter.date_formatter.errors
+
     @patch("gmail_cli.email_table_formatter.Console")
     def test_display_emails_empty_list(self, mock_console_class):
         mock_console = MagicMock()
@@ -188,3 +211,120 @@ class TestEmailTableFormatter:
         assert table_call.columns[0].style == "cyan"
         assert table_call.columns[1].style == "white"
         assert table_call.columns[2].style == "green"
+
+    def test_render_empty_list(self):
+        formatter = EmailTableFormatter()
+        renderable = formatter.render([])
+        assert renderable.renderable == "No unread emails found! 📭"
+
+    def test_render_groups_table_and_summary(self):
+        formatter = EmailTableFormatter()
+        emails = [
+            {
+                "from": "John Doe <john@example.com>",
+                "subject": "Test Email",
+                "date": "Mon, 1 Jan 2024 12:00:00 +0000",
+            }
+        ]
+        renderable = formatter.render(emails, title="Custom")
+
+        table, summary = renderable.renderables
+        assert table.title == "Custom"
+        assert "Found 1 unread email(s)" in summary
+
+    def test_render_accepts_email_summaries(self):
+        formatter = EmailTableFormatter()
+        emails = [
+            EmailSummary(
+                "a",
+                sender="John Doe <john@example.com>",
+                subject="Test Email",
+                internal_date=1704110400000,
+            )
+        ]
+        renderable = formatter.render(emails)
+
+        table, _ = renderable.renderables
+        assert table.columns[1]._cells == [  # pylint: disable=protected-access
+            "Test Email"
+        ]
+        assert not formatter.date_formatter.errors
+
+    def test_render_extra_headers_and_snippet(self):
+        formatter = EmailTableFormatter(
+            headers=["To", "List-Id"], snippet=True
+        )
+        emails = [
+            EmailSummary(
+                "a",
+                subject="Test Email",
+                snippet="Hello [there]",
+                headers={"To": "me@example.com"},
+            )
+        ]
+        renderable = formatter.render(emails)
+
+        table, _ = renderable.renderables
+        # pylint: disable=protected-access
+        assert [c.header for c in table.columns][3:] == ["To", "List-Id"]
+        assert table.columns[1]._cells == [
+            "Test Email\n[dim]Hello \\[there][/dim]"
+        ]
+        assert table.columns[3]._cells == ["me@example.com"]
+        assert table.columns[4]._cells == [""]
+
+    @patch("gmail_cli.email_table_formatter.Console")
+    def test_display_emails_stream_prints_pages(self, mock_console_class):
+        mock_console = MagicMock()
+        mock_console_class.return_value = mock_console
+
+        formatter = EmailTableFormatter()
+        emails = (
+            {"from": "a@x.com", "subject": f"Email {i}", "date": ""}
+            for i in range(5)
+        )
+        count = formatter.display_emails_stream(emails, page_size=2)
+
+        assert count == 5
+        # Three pages of rows plus the summary
+        assert mock_console.print.call_count == 4
+        tables = [c[0][0] for c in mock_console.print.call_args_list[:3]]
+        assert [t.title for t in tables] == [
+            "📧 Unread Gmail Messages",
+            None,
+            None,
+        ]
+        summary_call = mock_console.print.call_args_list[3][0][0]
+        assert "Found 5 unread email(s)" in str(summary_call)
+
+    @patch("gmail_cli.email_table_formatter.Console")
+    def test_display_emails_stream_is_progressive(self, mock_console_class):
+        mock_console = MagicMock()
+        mock_console_class.return_value = mock_console
+        consumed = []
+        printed_after = []
+        mock_console.print.side_effect = lambda *_: printed_after.append(
+            len(consumed)
+        )
+
+        def _emails():
+            for i in range(100):
+                consumed.append(i)
+                yield {"from": "a@x.com", "subject": str(i), "date": ""}
+
+        formatter = EmailTableFormatter()
+        formatter.display_emails_stream(_emails(), page_size=10)
+
+        # The first page was printed after consuming only ten emails
+        assert printed_after[0] == 10
+
+    @patch("gmail_cli.email_table_formatter.Console")
+    def test_display_emails_stream_empty(self, mock_console_class):
+        mock_console = MagicMock()
+        mock_console_class.return_value = mock_console
+
+        formatter = EmailTableFormatter()
+        assert formatter.display_emails_stream(iter([])) == 0
+
+        panel = mock_console.print.call_args[0][0]
+        assert panel.renderable == "No unread emails found! 📭"
@@ -0,0 +1,70 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+# pylint: disable=protected-access,redefined-outer-name
+import io
+import pytest
+from rich.console import Console
+from gmail_cli.email_table_formatter import EmailTableFormatter
+
+pytest.importorskip("pytest_benchmark")
+
+# The largest sizes take long, so those runs are opt-in with `pytest -m slow`
+SIZES = [10, 1_000, 10_000, pytest.param(100_000, marks=pytest.mark.slow)]
+DISPLAY_SIZES = [
+    10,
+    1_000,
+    pytest.param(10_000, marks=pytest.mark.slow),
+    pytest.param(100_000, marks=pytest.mark.slow),
+]
+
+
+def _emails(count):
+    return [
+        {
+            "from": f"Sender {i} <sender{i}@example.com>",
+            "subject": f"Quarterly report {i} " + "x" * (i % 120),
+            "date": f"Mon, {i % 28 + 1} Jan 2024 {i % 24:02d}:00:00 +0000",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def formatter():
+    formatter = EmailTableFormatter()
+    formatter.console = Console(file=io.StringIO(), width=120)
+    return formatter
+
+
+@pytest.mark.parametrize("count", DISPLAY_SIZES)
+def test_benchmark_display_emails(benchmark, formatter, count):
+    emails = _emails(count)
+    benchmark.pedantic(
+        formatter.display_emails, args=(emails, count + 1), rounds=3
+    )
+    assert (
+        f"Found {count} unread email(s)" in formatter.console.file.getvalue()
+    )
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_benchmark_format_sender(benchmark, formatter, count):
+    senders = [e["from"] for e in _emails(count)]
+    result = benchmark(lambda: [formatter._format_sender(s) for s in senders])
+    assert len(result) == count
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_benchmark_format_subject(benchmark, formatter, count):
+    subjects = [e["subject"] for e in _emails(count)]
+    result = benchmark(
+        lambda: [formatter._format_subject(s) for s in subjects]
+    )
+    assert len(result) == count
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_benchmark_format_date(benchmark, formatter, count):
+    dates = [e["date"] for e in _emails(count)]
+    result = benchmark(lambda: [formatter._format_date(d) for d in dates])
+    assert len(result) == count
@@ -0,0 +1,746 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from unittest.mock import patch
+import httplib2
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpMockSequence
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.gmail_client import GmailClient, build_search_query
+from gmail_cli.metadata_cache import MetadataCache
+from gmail_cli.response_model import FastJsonModel
+from gmail_cli.search_index import SearchIndex
+from gmail_cli.sync_state import SyncState
+from tests.conftest import make_message
+
+BOUNDARY = "batch_boundary"
+
+
+def _batch_response(parts):
+    """Build a multipart batch response from (request_id, status, body)."""
+    chunks = []
+    for request_id, status, body in parts:
+        reason = "OK" if status == 200 else "Error"
+        chunks.append(
+            f"--{BOUNDARY}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-base + {request_id}>\r\n\r\n"
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n\r\n"
+            f"{json.dumps(body)}\r\n"
+        )
+    chunks.append(f"--{BOUNDARY}--")
+    headers = {
+        "status": "200",
+        "content-type": f"multipart/mixed; boundary={BOUNDARY}",
+    }
+    return headers, "".join(chunks)
+
+
+def _client(responses):
+    http = HttpMockSequence(responses)
+    client = GmailClient()
+    client.service = build("gmail", "v1", http=http, static_discovery=True)
+    return client, http
+
+
+def _list_response(ids, next_page_token=None):
+    body = {"messages": [{"id": i} for i in ids]}
+    if next_page_token:
+        body["nextPageToken"] = next_page_token
+    return {"status": "200"}, json.dumps(body)
+
+
+def _lister_service(responses):
+    """Patch the per-thread service build used to list later pages."""
+    http = HttpMockSequence(responses)
+    service = build("gmail", "v1", http=http, static_discovery=True)
+    return patch.object(GmailClient, "_build_service", lambda _: service), http
+
+
+class LatencyHttp:  # pylint: disable=too-few-public-methods
+    """Fake httplib2 transport answering messages.get after a delay."""
+
+    def __init__(self, latency, barrier=None):
+        self.latency = latency
+        self.barrier = barrier
+        self.threads = set()
+        self.in_flight = self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    # pylint: disable=unused-argument
+    def request(
+        self,
+        uri,
+        method="GET",
+        body=None,
+        headers=None,
+        redirections=1,
+        connection_type=None,
+    ):
+        with self._lock:
+            self.threads.add(threading.get_ident())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if self.barrier is not None:
+            self.barrier.wait()
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        path = urllib.parse.urlparse(uri).path
+        message_id = path.rsplit("/", 1)[-1]
+        content = json.dumps(make_message(message_id)).encode("utf-8")
+        return httplib2.Response({"status": "200"}), content
+
+
+class TestGmailClient:  # pylint: disable=too-many-public-methods
+    def test_get_unread_emails_not_authenticated(self):
+        client = GmailClient()
+        assert not client.get_unread_emails()
+
+    def test_get_unread_emails_uses_batch(self):
+        client, http = _client(
+            [
+                _list_response(["a", "b"]),
+                _batch_response(
+                    [
+                        ("1", 200, make_message("b")),
+                        ("0", 200, make_message("a")),
+                    ]
+                ),
+            ]
+        )
+
+        emails = client.get_unread_emails(10)
+
+        assert [e["subject"] for e in emails] == ["Subject a", "Subject b"]
+        assert emails[0]["from"] == "Sender <a@x.com>"
+        assert emails[0]["date"] == "Mon, 1 Jan 2024 12:00:00 +0000"
+        # One list call plus a single batch call
+        assert len(http.request_sequence) == 2
+        assert "batch" in http.request_sequence[1][0]
+
+    def test_get_unread_emails_records_metrics(self):
+        client, _ = _client(
+            [
+                _list_response(["a", "b"]),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a")),
+                        ("1", 200, make_message("b")),
+                    ]
+                ),
+            ]
+        )
+
+        client.get_unread_emails(10)
+
+        summary = client.metrics.summary()
+        assert summary["timings"]["messages.list"]["count"] == 1
+        assert summary["timings"]["messages.get (batch)"]["count"] == 1
+        assert summary["counters"]["calls.messages.get"] == 2
+
+    def test_get_unread_emails_chunks_batches(self):
+        client, http = _client(
+            [
+                _list_response(["a", "b", "c"]),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a")),
+                        ("1", 200, make_message("b")),
+                    ]
+                ),
+                _batch_response([("2", 200, make_message("c"))]),
+            ]
+        )
+        with patch.object(GmailClient, "BATCH_SIZE", 2):
+            emails = client.get_unread_emails(10)
+
+        assert [e["subject"] for e in emails] == [
+            "Subject a",
+            "Subject b",
+            "Subject c",
+        ]
+        assert len(http.request_sequence) == 3
+
+    def test_get_unread_emails_retries_failed_sub_requests(self):
+        client, http = _client(
+            [
+                _list_response(["a", "b"]),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a")),
+                        ("1", 429, {"error": {"code": 429}}),
+                    ]
+                ),
+                (
+                    {"status": "200"},
+                    json.dumps(make_message("b", "Retried b")),
+                ),
+            ]
+        )
+
+        emails = client.get_unread_emails(10)
+
+        assert [e["subject"] for e in emails] == ["Subject a", "Retried b"]
+        assert "/messages/b" in http.request_sequence[2][0]
+
+    def test_get_unread_emails_no_messages(self):
+        client, _ = _client([({"status": "200"}, json.dumps({}))])
+        assert not client.get_unread_emails()
+
+    def test_get_unread_emails_api_error(self):
+        client, _ = _client([({"status": "400"}, "{}")])
+        assert not client.get_unread_emails()
+
+    def test_concurrent_execute_keeps_order(self):
+        client = GmailClient(concurrency=4)
+        ids = [str(i) for i in range(12)]
+        https = []
+
+        def _build_service(_self):
+            http = LatencyHttp(0.01)
+            https.append(http)
+            return build("gmail", "v1", http=http, static_discovery=True)
+
+        with patch.object(GmailClient, "_build_service", _build_service):
+            # pylint: disable=protected-access
+            responses = client._concurrent_execute(
+                client._metadata_request, ids
+            )
+
+        assert [r["id"] for r in responses] == ids
+        assert len(client.request_latencies) == len(ids)
+        assert all(latency >= 0.01 for latency in client.request_latencies)
+        # Every worker owns a distinct service and transport
+        assert 1 < len(https) <= 4
+        assert all(len(http.threads) == 1 for http in https)
+
+    def test_concurrent_execute_reuses_workers_between_calls(self):
+        client = GmailClient(concurrency=4)
+        ids = [str(i) for i in range(12)]
+        https = []
+
+        def _build_service(_self):
+            http = LatencyHttp(0.01)
+            https.append(http)
+            return build("gmail", "v1", http=http, static_discovery=True)
+
+        with patch.object(GmailClient, "_build_service", _build_service):
+            for _ in range(3):
+                # pylint: disable=protected-access
+                client._concurrent_execute(client._metadata_request, ids)
+        client.close()
+
+        # One service per worker thread, however many pages are fetched
+        assert len(https) <= 4
+
+    def test_concurrent_execute_overlaps_requests(self):
+        ids = [str(i) for i in range(16)]
+        client = GmailClient(concurrency=8)
+        # Every request waits until 8 requests are in flight, so a
+        # sequential loop would time out here
+        http = LatencyHttp(0, barrier=threading.Barrier(8, timeout=10))
+
+        def _build_service(_self):
+            return build("gmail", "v1", http=http, static_discovery=True)
+
+        with patch.object(GmailClient, "_build_service", _build_service):
+            # pylint: disable=protected-access
+            emails = client._concurrent_execute(client._metadata_request, ids)
+
+        assert [email["id"] for email in emails] == ids
+        assert http.max_in_flight == 8
+        assert len(http.threads) == 8
+
+    def test_iter_unread_emails_walks_all_pages(self):
+        client, http = _client(
+            [
+                _list_response(["a", "b"], next_page_token="page2"),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a")),
+                        ("1", 200, make_message("b")),
+                    ]
+                ),
+                _batch_response([("0", 200, make_message("c"))]),
+            ]
+        )
+        patcher, lister_http = _lister_service([_list_response(["c"])])
+
+        with patcher:
+            emails = list(client.iter_unread_emails())
+
+        assert [e["subject"] for e in emails] == [
+            "Subject a",
+            "Subject b",
+            "Subject c",
+        ]
+        assert len(http.request_sequence) == 3
+        assert "pageToken=page2" in lister_http.request_sequence[0][0]
+
+    def test_iter_unread_emails_respects_max_results(self):
+        client, _ = _client(
+            [
+                _list_response(["a", "b"], next_page_token="page2"),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a")),
+                        ("1", 200, make_message("b")),
+                    ]
+                ),
+                _batch_response([("0", 200, make_message("c"))]),
+            ]
+        )
+        patcher, lister_http = _lister_service(
+            [_list_response(["c"], next_page_token="page3")]
+        )
+
+        with patch.object(GmailClient, "PAGE_SIZE", 2), patcher:
+            emails = list(client.iter_unread_emails(max_results=3))
+
+        assert len(emails) == 3
+        assert "maxResults=1" in lister_http.request_sequence[0][0]
+
+    def test_iter_unread_emails_is_lazy(self):
+        client, http = _client(
+            [
+                _list_response(["a"], next_page_token="page2"),
+                _batch_response([("0", 200, make_message("a"))]),
+            ]
+        )
+        patcher, _ = _lister_service([_list_response(["b"])])
+
+        with patcher:
+            emails = client.iter_unread_emails()
+            assert next(emails)["subject"] == "Subject a"
+            emails.close()
+
+        # Page 2 metadata was never requested
+        assert len(http.request_sequence) == 2
+
+    def test_get_unread_emails_only_fetches_uncached(self, tmp_path):
+        client, http = _client(
+            [
+                _list_response(["a", "b", "c"]),
+                _batch_response([("0", 200, make_message("b"))]),
+            ]
+        )
+        client.cache = MetadataCache(str(tmp_path / "cache.db"))
+        client.cache.put_many(
+            {
+                "a": EmailSummary("a", sender="A", subject="Cached a"),
+                "c": EmailSummary("c", sender="C", subject="Cached c"),
+            }
+        )
+
+        emails = client.get_unread_emails(10)
+
+        assert [e["subject"] for e in emails] == [
+            "Cached a",
+            "Subject b",
+            "Cached c",
+        ]
+        assert len(http.request_sequence) == 2
+        assert client.cache.get_many(["b"])["b"]["subject"] == "Subject b"
+
+    def test_get_unread_emails_fills_empty_cache(self, tmp_path):
+        client, _ = _client(
+            [
+                _list_response(["a"]),
+                _batch_response([("0", 200, make_message("a"))]),
+            ]
+        )
+        client.cache = MetadataCache(str(tmp_path / "cache.db"))
+
+        client.get_unread_emails(10)
+
+        assert list(client.cache.get_many(["a"])) == ["a"]
+
+    def test_get_unread_emails_feeds_search_index(self, tmp_path):
+        client, _ = _client(
+            [
+                _list_response(["a", "b"]),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a", subject="Invoice a")),
+                        ("1", 200, make_message("b", subject="Lunch b")),
+                    ]
+                ),
+            ]
+        )
+        client.search_index = SearchIndex(str(tmp_path / "index.db"))
+
+        client.get_unread_emails(10)
+
+        assert [e.id for e in client.search_index.search("invoice")] == ["a"]
+
+    def test_get_unread_emails_all_cached(self, tmp_path):
+        client, http = _client([_list_response(["a"])])
+        client.cache = MetadataCache(str(tmp_path / "cache.db"))
+        client.cache.put_many(
+            {"a": EmailSummary("a", sender="A", subject="S")}
+        )
+
+        assert client.get_unread_emails(10)[0]["subject"] == "S"
+        # Only the list call went out
+        assert len(http.request_sequence) == 1
+
+    def test_sync_without_history_does_full_resync(self, tmp_path):
+        client, http = _client(
+            [
+                ({"status": "200"}, json.dumps({"historyId": "100"})),
+                _list_response(["b", "a"]),
+            ]
+        )
+        state = SyncState(str(tmp_path / "state.json"))
+
+        assert client.sync_unread_ids(state) == ["b", "a"]
+        assert state.history_id == "100"
+        assert "/profile" in http.request_sequence[0][0]
+        assert SyncState.load(state.path).unread_ids == ["b", "a"]
+
+    def test_sync_applies_history(self, tmp_path):
+        history = {
+            "historyId": "120",
+            "history": [
+                {"messagesAdded": [{"message": {"id": "c", "labelIds": []}}]},
+                {
+                    "messagesAdded": [
+                        {"message": {"id": "d", "labelIds": ["UNREAD"]}}
+                    ]
+                },
+                {
+                    "labelsRemoved": [
+                        {
+                            "message": {"id": "a", "labelIds": ["INBOX"]},
+                            "labelIds": ["UNREAD"],
+                        }
+                    ]
+                },
+                {
+                    "labelsAdded": [
+                        {
+                            "message": {"id": "c", "labelIds": ["UNREAD"]},
+                            "labelIds": ["UNREAD"],
+                        }
+                    ]
+                },
+                {"messagesDeleted": [{"message": {"id": "b"}}]},
+            ],
+        }
+        client, http = _client([({"status": "200"}, json.dumps(history))])
+        state = SyncState(str(tmp_path / "state.json"), "100", ["b", "a", "z"])
+
+        assert client.sync_unread_ids(state) == ["c", "d", "z"]
+        assert state.history_id == "120"
+        assert len(http.request_sequence) == 1
+        assert "startHistoryId=100" in http.request_sequence[0][0]
+
+    def test_sync_leaves_out_spam_and_trash(self, tmp_path):
+        def _labels(kind, message_id, labels, changed):
+            message = {"id": message_id, "labelIds": labels}
+            return {kind: [{"message": message, "labelIds": changed}]}
+
+        history = {
+            "historyId": "120",
+            "history": [
+                {
+                    "messagesAdded": [
+                        {
+                            "message": {
+                                "id": "s",
+                                "labelIds": ["UNREAD", "SPAM"],
+                            }
+                        }
+                    ]
+                },
+                _labels("labelsAdded", "a", ["UNREAD", "TRASH"], ["TRASH"]),
+                _labels("labelsRemoved", "r", ["UNREAD", "INBOX"], ["SPAM"]),
+                _labels("labelsRemoved", "t", ["INBOX"], ["TRASH"]),
+                _labels(
+                    "labelsAdded", "b", ["UNREAD", "STARRED"], ["STARRED"]
+                ),
+            ],
+        }
+        client, _ = _client([({"status": "200"}, json.dumps(history))])
+        state = SyncState(str(tmp_path / "state.json"), "100", ["b", "a"])
+
+        # Same set as a full relist: the restored unread message comes
+        # back, the trashed one and the spam stay out
+        assert client.sync_unread_ids(state) == ["r", "b"]
+        assert "message(id,labelIds)" in client.HISTORY_FIELDS
+
+    def test_sync_expired_history_falls_back_to_resync(self, tmp_path):
+        client, _ = _client(
+            [
+                ({"status": "404"}, "{}"),
+                ({"status": "200"}, json.dumps({"historyId": "500"})),
+                _list_response(["x"]),
+            ]
+        )
+        state = SyncState(str(tmp_path / "state.json"), "1", ["old"])
+
+        assert client.sync_unread_ids(state) == ["x"]
+        assert state.history_id == "500"
+
+    def test_get_unread_emails_with_sync_state(self, tmp_path):
+        client, _ = _client(
+            [
+                ({"status": "200"}, json.dumps({"historyId": "7"})),
+                _list_response(["a", "b"]),
+                _batch_response([("0", 200, make_message("a"))]),
+            ]
+        )
+        state = SyncState(str(tmp_path / "state.json"))
+
+        emails = client.get_unread_emails(1, sync_state=state)
+
+        assert [e["subject"] for e in emails] == ["Subject a"]
+
+    def test_get_unread_emails_retries_throttled_list(self):
+        client, http = _client(
+            [
+                ({"status": "429", "retry-after": "0"}, "{}"),
+                _list_response(["a"]),
+                _batch_response([("0", 200, make_message("a"))]),
+            ]
+        )
+
+        emails = client.get_unread_emails(10)
+
+        assert [e["subject"] for e in emails] == ["Subject a"]
+        assert len(http.request_sequence) == 3
+        assert client.rate_limiter.throttled == 1
+
+    def test_get_unread_emails_sorted_by_internal_date(self):
+        client, _ = _client(
+            [
+                _list_response(["a", "b", "c"]),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a", internal_date=2000)),
+                        ("1", 200, make_message("b", internal_date=3000)),
+                        ("2", 200, make_message("c", internal_date=1000)),
+                    ]
+                ),
+            ]
+        )
+
+        emails = client.get_unread_emails(10)
+
+        assert [e["internal_date"] for e in emails] == [3000, 2000, 1000]
+
+    def test_get_unread_emails_sends_query(self):
+        client, http = _client(
+            [
+                _list_response(["a"]),
+                _batch_response([("0", 200, make_message("a"))]),
+            ]
+        )
+
+        client.get_unread_emails(10, query="after:100 before:200")
+
+        assert "q=after%3A100+before%3A200" in http.request_sequence[0][0]
+
+    def test_get_unread_emails_filters_by_label(self):
+        client, http = _client(
+            [
+                _list_response(["a"]),
+                _batch_response([("0", 200, make_message("a"))]),
+            ]
+        )
+
+        client.get_unread_emails(10, label_ids=["Label_1", "IMPORTANT"])
+
+        uri = http.request_sequence[0][0]
+        assert "labelIds=UNREAD" in uri
+        assert "labelIds=Label_1" in uri
+        assert "labelIds=IMPORTANT" in uri
+
+    def test_requests_only_needed_fields(self):
+        client, http = _client(
+            [
+                _list_response(["a"]),
+                _batch_response([("0", 200, make_message("a"))]),
+            ]
+        )
+
+        client.get_unread_emails(10)
+
+        assert "fields=messages%2Fid%2CnextPageToken" in (
+            http.request_sequence[0][0]
+        )
+        batch_body = http.request_sequence[1][2]
+        assert (
+            "fields=id%2CthreadId%2CinternalDate%2Cpayload%2Fheaders"
+            in batch_body
+        )
+        assert "snippet" not in batch_body
+
+    def test_extra_headers_and_snippet_are_requested(self):
+        message = make_message("a")
+        message["payload"]["headers"].append({"name": "To", "value": "me"})
+        message["snippet"] = "Hello"
+        client, http = _client(
+            [
+                _list_response(["a"]),
+                _batch_response([("0", 200, message)]),
+            ]
+        )
+        client.extra_headers = ("To", "Cc")
+        client.metadata_headers = ["From", "Subject", "Date", "To", "Cc"]
+        client.snippet = True
+
+        emails = client.get_unread_emails(10)
+
+        batch_body = http.request_sequence[1][2]
+        assert "metadataHeaders=To&metadataHeaders=Cc" in batch_body
+        assert "%2Csnippet" in batch_body
+        # Absent headers are recorded as empty
+        assert emails[0].headers == {"To": "me", "Cc": ""}
+        assert emails[0].snippet == "Hello"
+
+    def test_cached_emails_missing_requested_fields_are_refetched(
+        self, tmp_path
+    ):
+        message = dict(make_message("b"), snippet="Fresh")
+        client, http = _client(
+            [
+                _list_response(["a", "b"]),
+                _batch_response([("0", 200, message)]),
+            ]
+        )
+        client.snippet = True
+        client.cache = MetadataCache(str(tmp_path / "cache.db"))
+        client.cache.put_many(
+            {
+                "a": EmailSummary("a", subject="Cached a", snippet="Old"),
+                "b": EmailSummary("b", subject="Cached b"),
+            }
+        )
+
+        emails = client.get_unread_emails(10)
+
+        assert [e.snippet for e in emails] == ["Old", "Fresh"]
+        assert len(http.request_sequence) == 2
+        assert client.cache.get_many(["b"])["b"].snippet == "Fresh"
+
+    def test_snippets_requested_only_for_messages_the_index_lacks(
+        self, tmp_path
+    ):
+        client, http = _client(
+            [
+                _list_response(["a", "b"]),
+                _batch_response(
+                    [
+                        ("0", 200, make_message("a")),
+                        ("1", 200, dict(make_message("b"), snippet="New")),
+                    ]
+                ),
+            ]
+        )
+        client.search_index = SearchIndex(str(tmp_path / "index.db"))
+        client.search_index.add_many([EmailSummary("a", snippet="Indexed")])
+
+        client.get_unread_emails(10)
+
+        parts = http.request_sequence[1][2].split("Content-ID")
+        assert "snippet" not in next(p for p in parts if "/a?" in p)
+        assert "%2Csnippet" in next(p for p in parts if "/b?" in p)
+        assert client.search_index.search("new")[0].id == "b"
+
+    def test_cached_emails_without_snippet_are_kept_for_the_index(
+        self, tmp_path
+    ):
+        client, http = _client([_list_response(["a"])])
+        client.cache = MetadataCache(str(tmp_path / "cache.db"))
+        client.cache.put_many({"a": EmailSummary("a", subject="Cached a")})
+        client.search_index = SearchIndex(str(tmp_path / "index.db"))
+
+        emails = client.get_unread_emails(10)
+
+        assert [e.subject for e in emails] == ["Cached a"]
+        assert len(http.request_sequence) == 1
+
+    def test_get_unread_threads_fetches_once_per_thread(self):
+        def _thread(thread_id, count):
+            messages = [
+                dict(make_message(f"{thread_id}{i}"), labelIds=["UNREAD"])
+                for i in range(count)
+            ]
+            for i, message in enumerate(messages):
+                message["internalDate"] = str(1000 * (i + 1))
+            return {"id": thread_id, "messages": messages}
+
+        client, http = _client(
+            [
+                (
+                    {"status": "200"},
+                    json.dumps({"threads": [{"id": "t"}, {"id": "u"}]}),
+                ),
+                _batch_response(
+                    [("0", 200, _thread("t", 40)), ("1", 200, _thread("u", 1))]
+                ),
+            ]
+        )
+
+        threads = client.get_unread_threads(10)
+
+        assert [(t.id, t.message_count) for t in threads] == [
+            ("t39", 40),
+            ("u0", 1),
+        ]
+        assert len(http.request_sequence) == 2
+        assert "/threads?" in http.request_sequence[0][0]
+
+    def test_get_unread_threads_reports_api_errors(self, capsys):
+        client, _ = _client([({"status": "404"}, "{}")])
+
+        assert not client.get_unread_threads(10)
+        assert "Gmail API error" in capsys.readouterr().out
+
+    def test_build_search_query(self):
+        since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        until = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+        assert build_search_query() is None
+        assert build_search_query(since=since) == "after:1704067200"
+        assert (
+            build_search_query(since, until)
+            == "after:1704067200 before:1704153600"
+        )
+
+    def test_service_is_built_lazily(self):
+        client = GmailClient()
+        client.credentials = object()
+
+        with patch.object(GmailClient, "_build_service") as build_service:
+            assert client.service is build_service.return_value
+            assert client.service is build_service.return_value
+
+        build_service.assert_called_once()
+
+    def test_build_service_uses_bundled_discovery_document(self):
+        client = GmailClient()
+        client.credentials = AnonymousCredentials()
+
+        with patch("gmail_cli.gmail_client.build") as build_mock:
+            # pylint: disable=protected-access
+            service = client._build_service()
+
+        build_mock.assert_not_called()
+        assert hasattr(service, "new_batch_http_request")
+
+    def test_build_service_uses_response_model(self):
+        client = GmailClient(root_url="http://localhost:1")
+
+        # pylint: disable=protected-access
+        assert isinstance(client.response_model, FastJsonModel)
+        assert client._build_service()._model is client.response_model
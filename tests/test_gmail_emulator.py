@@ -0,0 +1,177 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+# pylint: disable=redefined-outer-name
+import http.client
+import time
+import urllib.parse
+import pytest
+from gmail_cli.gmail_client import GmailClient
+from gmail_cli.gmail_emulator import GmailEmulator
+from gmail_cli.rate_limiter import GmailRateLimiter
+from gmail_cli.sync_state import SyncState
+
+
+@pytest.fixture
+def emulator():
+    with GmailEmulator(message_count=300) as server:
+        yield server
+
+
+def _client(server, concurrency=1):
+    client = GmailClient(
+        concurrency=concurrency,
+        rate_limiter=GmailRateLimiter(
+            units_per_second=1e9,
+            max_concurrency=concurrency,
+            sleep=lambda _: None,
+        ),
+        root_url=server.root_url,
+    )
+    assert client.authenticate()
+    return client
+
+
+class TestGmailEmulator:
+    def test_lists_and_batch_fetches_newest_first(self, emulator):
+        emails = _client(emulator).get_unread_emails(250)
+
+        assert len(emails) == 250
+        assert emails[0].subject == "Synthetic message 299"
+        assert emails[-1].subject == "Synthetic message 50"
+        assert emails[0].internal_date > emails[1].internal_date
+        # Pages of 500 IDs, fetched in batches of 100
+        assert emulator.calls == {
+            "messages.list": 1,
+            "batch": 3,
+            "messages.get": 250,
+        }
+        assert emulator.traffic["requests"] == 4
+        assert emulator.traffic["bytes_sent"] > 250 * 200
+
+    def test_paginates_and_fetches_concurrently(self, emulator):
+        client = _client(emulator, concurrency=4)
+
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(GmailClient, "PAGE_SIZE", 100)
+            emails = list(client.iter_unread_emails())
+
+        assert len(emails) == 300
+        assert len({e.id for e in emails}) == 300
+        assert emulator.calls["messages.list"] == 3
+        assert "batch" not in emulator.calls
+
+    def test_field_masks_trim_responses(self, emulator):
+        client = _client(emulator)
+        client.measure_savings = True
+
+        emails = client.get_unread_emails(20)
+
+        assert emails[0].headers is None
+        assert emails[0].snippet is None
+        counters = client.metrics.summary()["counters"]
+        assert counters["bytes.received"] == emulator.traffic["bytes_sent"]
+        # The mask drops labels, size, history and body of every message
+        assert counters["bytes.saved"] > 20 * 100
+
+    def test_field_masks_keep_requested_fields(self, emulator):
+        client = _client(emulator)
+        client.extra_headers = ("List-Id",)
+        client.metadata_headers = ["From", "Subject", "Date", "List-Id"]
+        client.snippet = True
+
+        emails = client.get_unread_emails(3)
+
+        assert emails[0].snippet.startswith("Body of synthetic message 299")
+        assert [e.headers["List-Id"] for e in emails] == [
+            "",
+            "",
+            "<list3.example.com>",
+        ]
+
+    def test_traffic_counts_each_request_body_once(self, emulator):
+        url = urllib.parse.urlsplit(emulator.root_url)
+        connection = http.client.HTTPConnection(url.hostname, url.port)
+        path = "/gmail/v1/users/me/profile"
+        body = b"x" * 10_000
+
+        # Same keep-alive connection, so the same request handler
+        for method, target, content in [
+            ("POST", "/batch", body),
+            ("GET", path, None),
+            ("GET", path, None),
+        ]:
+            connection.request(method, target, body=content)
+            connection.getresponse().read()
+        connection.close()
+
+        assert emulator.traffic["requests"] == 3
+        assert 10_000 < emulator.traffic["bytes_received"] < 11_000
+
+    def test_label_filter(self, emulator):
+        client = _client(emulator)
+
+        assert len(client.get_unread_emails(10, label_ids=["INBOX"])) == 10
+        assert not client.get_unread_emails(10, label_ids=["Label_1"])
+
+    def test_lists_threads(self, emulator):
+        threads = _client(emulator).get_unread_threads(120)
+
+        assert len(threads) == 120
+        assert threads[0].subject == "Synthetic message 299"
+        assert threads[0].thread_id == threads[0].id
+        assert all(thread.message_count == 1 for thread in threads)
+        assert emulator.calls["threads.list"] == 1
+        assert emulator.calls["threads.get"] == 120
+
+    def test_incremental_sync_from_history(self, emulator, tmp_path):
+        client = _client(emulator)
+        state = SyncState(str(tmp_path / "sync_state.json"))
+        assert len(client.sync_unread_ids(state)) == 300
+
+        new_ids = emulator.deliver(2)
+        emulator.mark_read(state.unread_ids[0])
+        unread = client.sync_unread_ids(state)
+
+        assert unread[:2] == list(reversed(new_ids))
+        assert len(unread) == 301
+        assert emulator.calls["history.list"] == 1
+        assert emulator.calls["messages.list"] == 1
+
+    def test_expired_history_triggers_full_resync(self, emulator, tmp_path):
+        client = _client(emulator)
+        state = SyncState(str(tmp_path / "sync_state.json"))
+        client.sync_unread_ids(state)
+
+        emulator.deliver()
+        emulator.expire_history()
+
+        assert len(client.sync_unread_ids(state)) == 301
+        assert emulator.calls["messages.list"] == 2
+
+    def test_injected_errors_are_retried(self):
+        with GmailEmulator(message_count=200, error_rate=0.2) as server:
+            client = _client(server)
+            emails = client.get_unread_emails(200)
+
+        assert len(emails) == 200
+        assert client.rate_limiter.throttled > 0
+
+    def test_latency_is_added_per_request(self):
+        with GmailEmulator(message_count=10, latency=0.05) as server:
+            client = _client(server)
+            started = time.perf_counter()
+            client.get_unread_emails(10)
+            elapsed = time.perf_counter() - started
+
+        # One list request plus one batch request
+        assert elapsed >= 0.1
+
+    def test_million_message_inbox_is_generated_lazily(self):
+        with GmailEmulator(message_count=1_000_000) as server:
+            client = _client(server)
+            started = time.perf_counter()
+            emails = client.get_unread_emails(100)
+            elapsed = time.perf_counter() - started
+
+        assert emails[0].subject == "Synthetic message 999999"
+        assert elapsed < 5
@@ -0,0 +1,428 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import subprocess
+import sys
+from datetime import datetime
+from unittest.mock import patch
+import pytest
+from click.testing import CliRunner
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.gmail_emulator import GmailEmulator
+from gmail_cli.main import main
+from gmail_cli.search_index import SearchIndex
+
+EMAIL = {
+    "from": "John Doe <john@example.com>",
+    "subject": "Watched Email",
+    "date": "Mon, 1 Jan 2024 12:00:00 +0000",
+}
+
+
+CHECK_IMPORTS = """
+import sys
+from click.testing import CliRunner
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.main import main
+result = CliRunner().invoke(main, [sys.argv[1]])
+assert result.exit_code == 0, result.output
+print(sorted(
+    m for m in sys.modules
+    if m.split(".")[0] in ("googleapiclient", "google_auth_oauthlib")
+))
+"""
+
+
+class TestMain:
+    @pytest.mark.parametrize("flag", ["--help", "--version"])
+    def test_startup_skips_google_client_imports(self, flag):
+        result = subprocess.run(
+            [sys.executable, "-c", CHECK_IMPORTS, flag],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        assert result.stdout.strip() == "[]"
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_lists_unread_emails(self, mock_client_class, tmp_path):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.get_unread_emails.return_value = [EMAIL]
+        client.request_latencies = []
+
+        result = CliRunner().invoke(
+            main, ["--token", str(tmp_path / "token.json")]
+        )
+
+        assert result.exit_code == 0
+        assert "Watched Email" in result.output
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_authentication_failure(self, mock_client_class, tmp_path):
+        mock_client_class.return_value.authenticate.return_value = False
+
+        result = CliRunner().invoke(
+            main, ["--token", str(tmp_path / "token.json")]
+        )
+
+        assert result.exit_code == 1
+        assert "Authentication failed" in result.output
+
+    @patch("gmail_cli.main.time.sleep")
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_watch_reuses_client_and_syncs(
+        self, mock_client_class, mock_sleep, tmp_path
+    ):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.iter_unread_emails.side_effect = lambda *args: iter([EMAIL])
+        mock_sleep.side_effect = [None, KeyboardInterrupt]
+
+        result = CliRunner().invoke(
+            main, ["--watch", "5", "--token", str(tmp_path / "token.json")]
+        )
+
+        assert result.exit_code == 0
+        assert "Watched Email" in result.output
+        assert client.authenticate.call_count == 1
+        assert client.iter_unread_emails.call_count == 2
+        # Watch mode polls through the incremental sync state
+        assert client.iter_unread_emails.call_args[0][1] is not None
+        mock_sleep.assert_called_with(5)
+
+    @patch("gmail_cli.main.time.sleep")
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_watch_keeps_last_table_when_a_poll_fails(
+        self, mock_client_class, mock_sleep, tmp_path
+    ):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.iter_unread_emails.side_effect = [
+            iter([EMAIL]),
+            ConnectionError("network down"),
+        ]
+        mock_sleep.side_effect = [None, KeyboardInterrupt]
+
+        result = CliRunner().invoke(
+            main, ["--watch", "5", "--token", str(tmp_path / "token.json")]
+        )
+
+        assert result.exit_code == 0
+        final_view = result.output.rsplit("Poll failed", 1)
+        assert len(final_view) == 2
+        assert "network down" in final_view[1]
+        assert "No unread emails" not in result.output
+        assert "Watched Email" in result.output
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_since_until_filter_server_side(self, mock_client_class, tmp_path):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.get_unread_emails.return_value = [EMAIL]
+        client.request_latencies = []
+
+        result = CliRunner().invoke(
+            main,
+            [
+                "--since",
+                "2024-01-01",
+                "--until",
+                "2024-01-02",
+                "--sync",
+                "--token",
+                str(tmp_path / "token.json"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        args = client.get_unread_emails.call_args[0]
+        # History sync cannot apply the window, so it is bypassed
+        assert args[1] is None
+        assert args[2] == (
+            f"after:{int(datetime(2024, 1, 1).timestamp())} "
+            f"before:{int(datetime(2024, 1, 2).timestamp())}"
+        )
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_query_and_labels(self, mock_client_class, tmp_path):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.get_unread_emails.return_value = [EMAIL]
+        client.request_latencies = []
+
+        result = CliRunner().invoke(
+            main,
+            [
+                "--query",
+                "from:alice has:attachment",
+                "--since",
+                "2024-01-01",
+                "--label",
+                "Label_1",
+                "--label",
+                "IMPORTANT",
+                "--token",
+                str(tmp_path / "token.json"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        _, _, query, label_ids = client.get_unread_emails.call_args[0]
+        assert query == (
+            "from:alice has:attachment "
+            f"after:{int(datetime(2024, 1, 1).timestamp())}"
+        )
+        assert label_ids == ["Label_1", "IMPORTANT"]
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_format_jsonl_streams_to_stdout(self, mock_client_class, tmp_path):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.iter_unread_emails.return_value = iter([EMAIL, EMAIL])
+
+        result = CliRunner().invoke(
+            main,
+            ["--format", "jsonl", "--token", str(tmp_path / "token.json")],
+        )
+
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()
+        # Only data rows on stdout, no banner or panels
+        assert [json.loads(line)["subject"] for line in lines] == [
+            "Watched Email",
+            "Watched Email",
+        ]
+        client.get_unread_emails.assert_not_called()
+
+    def test_format_rejects_watch(self):
+        result = CliRunner().invoke(main, ["--format", "csv", "--watch", "5"])
+
+        assert result.exit_code == 2
+        assert "cannot be combined" in result.output
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_threads_lists_threads(self, mock_client_class, tmp_path):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.get_unread_threads.return_value = [
+            EmailSummary("a", sender="john", message_count=40)
+        ]
+        client.request_latencies = []
+
+        result = CliRunner().invoke(
+            main, ["--threads", "--token", str(tmp_path / "token.json")]
+        )
+
+        assert result.exit_code == 0
+        assert "john (40)" in result.output
+        client.get_unread_emails.assert_not_called()
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_stream_uses_iterator(self, mock_client_class, tmp_path):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.iter_unread_emails.return_value = iter([EMAIL])
+
+        result = CliRunner().invoke(
+            main, ["--stream", "--token", str(tmp_path / "token.json")]
+        )
+
+        assert result.exit_code == 0
+        assert "Watched Email" in result.output
+        client.get_unread_emails.assert_not_called()
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_profile_prints_breakdown_and_dumps_json(
+        self, mock_client_class, tmp_path
+    ):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.get_unread_emails.return_value = [EMAIL]
+        client.request_latencies = []
+        metrics_file = tmp_path / "metrics.json"
+
+        result = CliRunner().invoke(
+            main,
+            [
+                "--profile",
+                "--metrics-json",
+                str(metrics_file),
+                "--token",
+                str(tmp_path / "token.json"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Profile" in result.output
+        assert "p95 ms" in result.output
+        summary = json.loads(metrics_file.read_text(encoding="utf-8"))
+        assert {"import", "render", "total"} <= set(summary["timings"])
+        # The client records its calls into the CLI's metrics
+        assert mock_client_class.call_args.kwargs["metrics"].keep_samples
+
+    @patch("gmail_cli.gmail_client.GmailClient")
+    def test_metrics_keep_no_samples_without_profile(
+        self, mock_client_class, tmp_path
+    ):
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.get_unread_emails.return_value = [EMAIL]
+        client.request_latencies = []
+
+        result = CliRunner().invoke(
+            main, ["--token", str(tmp_path / "token.json")]
+        )
+
+        assert result.exit_code == 0
+        metrics = mock_client_class.call_args.kwargs["metrics"]
+        assert not metrics.keep_samples
+
+    def test_root_url_runs_against_emulator(self, tmp_path):
+        with GmailEmulator(message_count=30) as server:
+            result = CliRunner().invoke(
+                main,
+                [
+                    "--format",
+                    "jsonl",
+                    "--max-results",
+                    "20",
+                    "--no-cache",
+                    "--root-url",
+                    server.root_url,
+                    "--token",
+                    str(tmp_path / "token.json"),
+                ],
+            )
+
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()
+        assert len(lines) == 20
+        assert json.loads(lines[0])["subject"] == "Synthetic message 29"
+
+    def test_headers_and_snippet_against_emulator(self, tmp_path):
+        with GmailEmulator(message_count=3) as server:
+            result = CliRunner().invoke(
+                main,
+                [
+                    "--format",
+                    "jsonl",
+                    "--headers",
+                    "To, List-Id",
+                    "--snippet",
+                    "--no-cache",
+                    "--profile",
+                    "--measure-savings",
+                    "--root-url",
+                    server.root_url,
+                    "--token",
+                    str(tmp_path / "token.json"),
+                ],
+            )
+
+        assert result.exit_code == 0
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+        assert set(rows[0]["headers"]) == {"To", "List-Id"}
+        assert [bool(row["headers"]["List-Id"]) for row in rows] == [
+            False,
+            False,
+            True,
+        ]
+        assert rows[0]["snippet"].startswith("Body of synthetic message 2")
+        assert "Field masks saved" in result.stderr
+
+    def test_metrics_json_adds_no_api_calls(self, tmp_path):
+        with GmailEmulator(message_count=3) as server:
+            result = CliRunner().invoke(
+                main,
+                [
+                    "--metrics-json",
+                    str(tmp_path / "metrics.json"),
+                    "--root-url",
+                    server.root_url,
+                    "--token",
+                    str(tmp_path / "token.json"),
+                ],
+            )
+            calls = server.calls
+
+        assert result.exit_code == 0
+        assert calls["messages.get"] == 3
+
+    def test_search_answers_from_index_filled_by_listing(self, tmp_path):
+        token = str(tmp_path / "token.json")
+        with GmailEmulator(message_count=30) as server:
+            listing = CliRunner().invoke(
+                main, ["--root-url", server.root_url, "--token", token]
+            )
+
+        result = CliRunner().invoke(
+            main,
+            ["--token", token, "search", "sender", "7"],
+        )
+
+        assert listing.exit_code == 0
+        assert result.exit_code == 0
+        assert "Synthetic message 7" in result.output
+        assert "1 match(es) from the local index" in result.output
+
+    def test_search_covers_snippets_without_snippet_flag(self, tmp_path):
+        token = str(tmp_path / "token.json")
+        with GmailEmulator(message_count=3) as server:
+            CliRunner().invoke(
+                main, ["--root-url", server.root_url, "--token", token]
+            )
+
+        result = CliRunner().invoke(
+            main,
+            ["--token", token, "search", "--format", "jsonl", "agreed"],
+        )
+
+        assert len(result.stdout.splitlines()) == 3
+
+    def test_search_jsonl(self, tmp_path):
+        token = str(tmp_path / "token.json")
+        SearchIndex(SearchIndex.default_path(token)).add_many(
+            [EmailSummary("a", sender="Alice", subject="Invoice")]
+        )
+
+        result = CliRunner().invoke(
+            main,
+            ["--token", token, "search", "--format", "jsonl", "alice"],
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["subject"] == "Invoice"
+
+    def test_search_without_index(self, tmp_path):
+        result = CliRunner().invoke(
+            main,
+            ["--token", str(tmp_path / "token.json"), "search", "alice"],
+        )
+
+        assert result.exit_code == 1
+        assert "No search index yet" in result.output
+
+
+class TestAccountsOption:
+    @patch("gmail_cli.main._poll_accounts")
+    def test_accounts_rejects_single_account_options(self, mock_poll):
+        result = CliRunner().invoke(
+            main,
+            ["--accounts", "cfg.json", "--watch", "30", "--label", "WORK"],
+        )
+
+        assert result.exit_code == 2
+        assert "--watch, --label cannot be combined with --accounts" in (
+            result.output
+        )
+        mock_poll.assert_not_called()
+
+    @patch("gmail_cli.main._poll_accounts")
+    def test_accounts_polls_with_shared_options(self, mock_poll):
+        result = CliRunner().invoke(
+            main, ["--accounts", "cfg.json", "--max-results", "10"]
+        )
+
+        assert result.exit_code == 0
+        assert mock_poll.call_args[0][:2] == ("cfg.json", 10)
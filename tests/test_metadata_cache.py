@@ -0,0 +1,53 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import os
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.metadata_cache import MetadataCache
+
+
+def _email(subject):
+    return EmailSummary(subject.lower(), "t", "a@x.com", subject, "d", 1000)
+
+
+class TestMetadataCache:
+    def test_default_path_next_to_token(self, tmp_path):
+        token = os.path.join(str(tmp_path), "token.json")
+        assert MetadataCache.default_path(token) == os.path.join(
+            str(tmp_path), "metadata_cache.sqlite3"
+        )
+
+    def test_put_and_get(self, tmp_path):
+        cache = MetadataCache(str(tmp_path / "cache.db"))
+        cache.put_many({"a": _email("A"), "b": _email("B")})
+
+        assert cache.get_many(["a", "b", "c"]) == {
+            "a": _email("A"),
+            "b": _email("B"),
+        }
+        assert len(cache) == 2
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache = MetadataCache(path)
+        cache.put_many({"a": _email("A")})
+        cache.close()
+
+        assert MetadataCache(path).get_many(["a"]) == {"a": _email("A")}
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = MetadataCache(str(tmp_path / "cache.db"), max_entries=2)
+        cache.put_many({"a": _email("A")})
+        cache.put_many({"b": _email("B")})
+        # Touch "a" so "b" becomes the least recently used entry
+        cache.get_many(["a"])
+        cache.put_many({"c": _email("C")})
+
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+        assert len(cache) == 2
+
+    def test_get_many_large_id_list(self, tmp_path):
+        cache = MetadataCache(str(tmp_path / "cache.db"))
+        ids = [str(i) for i in range(1200)]
+        cache.put_many({i: _email(i) for i in ids})
+
+        assert len(cache.get_many(ids)) == 1200
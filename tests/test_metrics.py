@@ -0,0 +1,66 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import pytest
+from gmail_cli.metrics import Metrics
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMetrics:
+    def test_percentiles_of_recorded_timings(self):
+        metrics = Metrics()
+        for millis in range(1, 101):
+            metrics.record("messages.get", millis / 1000)
+
+        stats = metrics.summary()["timings"]["messages.get"]
+
+        assert stats["count"] == 100
+        assert stats["p50_ms"] == pytest.approx(50)
+        assert stats["p95_ms"] == pytest.approx(95)
+        assert stats["p99_ms"] == pytest.approx(99)
+        assert stats["max_ms"] == pytest.approx(100)
+        assert stats["total_ms"] == pytest.approx(5050)
+
+    def test_totals_without_samples(self):
+        metrics = Metrics(keep_samples=False)
+        for millis in range(1, 101):
+            metrics.record("messages.get", millis / 1000)
+
+        stats = metrics.summary()["timings"]["messages.get"]
+
+        assert stats == {
+            "count": 100,
+            "total_ms": pytest.approx(5050),
+            "max_ms": pytest.approx(100),
+        }
+        # pylint: disable-next=protected-access
+        assert not metrics._timings
+
+    def test_timer_records_also_on_error(self):
+        clock = FakeClock()
+        metrics = Metrics(clock)
+
+        with pytest.raises(ValueError):
+            with metrics.timer("auth"):
+                clock.now += 0.25
+                raise ValueError("boom")
+
+        assert metrics.summary()["timings"]["auth"]["total_ms"] == 250
+
+    def test_counters_and_json_dump(self, tmp_path):
+        metrics = Metrics()
+        metrics.increment("cache.hits")
+        metrics.increment("cache.hits", 2)
+        path = tmp_path / "metrics.json"
+
+        metrics.dump(str(path))
+
+        summary = json.loads(path.read_text(encoding="utf-8"))
+        assert summary == {"timings": {}, "counters": {"cache.hits": 3}}
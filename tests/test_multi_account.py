@@ -0,0 +1,168 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import os
+import time
+from unittest.mock import MagicMock
+import pytest
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.multi_account import (
+    AccountConfig,
+    MultiAccountPoller,
+    load_accounts_config,
+)
+from gmail_cli.rate_limiter import TokenBucket
+
+
+def _fake_client(name, message_ids, calls):
+    client = MagicMock()
+    client.service = object()
+    client.list_unread_ids.side_effect = lambda _max: message_ids
+
+    def _fetch(message_id):
+        calls.append((name, message_id))
+        return EmailSummary(message_id, sender=name, subject=message_id)
+
+    client.fetch_email.side_effect = _fetch
+    return client
+
+
+def _poller(id_lists, max_workers=1):
+    accounts = [AccountConfig(name, "c.json", "t.json") for name in id_lists]
+    poller = MultiAccountPoller(accounts, max_workers)
+    calls = []
+    for name, message_ids in id_lists.items():
+        poller.clients[name] = _fake_client(name, message_ids, calls)
+    return poller, calls
+
+
+class TestLoadAccountsConfig:
+    def test_resolves_relative_paths(self, tmp_path):
+        path = tmp_path / "accounts.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "max_workers": 4,
+                    "accounts": [
+                        {
+                            "name": "work",
+                            "credentials": "work/credentials.json",
+                            "token": "work/token.json",
+                            "rate_limit": 10,
+                        }
+                    ],
+                }
+            ),
+            encoding="utf-8",
+        )
+
+        config = load_accounts_config(str(path))
+
+        assert config["max_workers"] == 4
+        account = config["accounts"][0]
+        assert account.name == "work"
+        assert account.token == os.path.join(str(tmp_path), "work/token.json")
+        assert account.rate_limit == 10
+
+    def test_missing_key(self, tmp_path):
+        path = tmp_path / "accounts.json"
+        path.write_text(
+            json.dumps({"accounts": [{"name": "x"}]}), encoding="utf-8"
+        )
+
+        with pytest.raises(ValueError):
+            load_accounts_config(str(path))
+
+    def test_no_accounts(self, tmp_path):
+        path = tmp_path / "accounts.json"
+        path.write_text("{}", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            load_accounts_config(str(path))
+
+
+class TestMultiAccountPoller:
+    def test_poll_tags_emails_by_account(self):
+        poller, _ = _poller({"a": ["1", "2"], "b": ["3"]}, max_workers=4)
+
+        results = poller.poll()
+
+        assert [e["subject"] for e in results["a"]] == ["1", "2"]
+        assert [e["subject"] for e in results["b"]] == ["3"]
+        assert all(e.account == "a" for e in results["a"])
+
+    def test_poll_interleaves_accounts(self):
+        poller, calls = _poller({"a": ["1", "2", "3"], "b": ["4", "5"]})
+
+        poller.poll()
+
+        assert calls == [
+            ("a", "1"),
+            ("b", "4"),
+            ("a", "2"),
+            ("b", "5"),
+            ("a", "3"),
+        ]
+
+    def test_poll_records_account_errors(self):
+        poller, _ = _poller({"a": ["1"], "b": ["2"]}, max_workers=2)
+        poller.clients["b"].list_unread_ids.side_effect = RuntimeError("boom")
+
+        results = poller.poll()
+
+        assert len(results["a"]) == 1
+        assert not results["b"]
+        assert poller.errors == {"b": "boom"}
+
+    def test_poll_applies_account_rate_limit(self):
+        accounts = [AccountConfig("a", "c.json", "t.json", rate_limit=100)]
+        poller = MultiAccountPoller(accounts)
+        poller.clients["a"] = _fake_client("a", ["1", "2"], [])
+        poller.limiters["a"] = MagicMock()
+        poller.limiters["a"].try_acquire.return_value = 0.0
+
+        poller.poll()
+
+        # One list call plus one call per message
+        assert poller.limiters["a"].try_acquire.call_count == 3
+
+    def test_throttled_account_does_not_slow_down_others(self):
+        poller, _ = _poller(
+            {"slow": [f"s{i}" for i in range(16)], "fast": []}, max_workers=8
+        )
+        poller.limiters["slow"] = TokenBucket(10, capacity=1)
+        finished = []
+
+        def _fetch(message_id):
+            time.sleep(0.01)
+            finished.append(time.monotonic())
+            return EmailSummary(message_id)
+
+        fast = poller.clients["fast"]
+        fast.list_unread_ids.side_effect = lambda _max: [
+            f"f{i}" for i in range(20)
+        ]
+        fast.fetch_email.side_effect = _fetch
+        started = time.monotonic()
+
+        results = poller.poll()
+
+        assert len(results["slow"]) == 16
+        assert len(results["fast"]) == 20
+        # slow needs 1.6s for its 17 calls; waiting for its tokens in the
+        # 8 workers would hold fast back for about 0.7s
+        assert max(finished) - started < 0.3
+
+    def test_clients_admit_as_many_requests_as_workers(self):
+        accounts = [AccountConfig("a", "c.json", "t.json")]
+        poller = MultiAccountPoller(accounts, max_workers=8)
+
+        limiter = poller.clients["a"].rate_limiter
+        assert limiter.concurrency.max_limit == 8
+
+    def test_authenticate_reports_failures(self):
+        poller, _ = _poller({"a": [], "b": []})
+        poller.clients["a"].authenticate.return_value = True
+        poller.clients["b"].authenticate.return_value = False
+
+        assert poller.authenticate() == ["b"]
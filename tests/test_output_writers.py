@@ -0,0 +1,126 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import csv
+import io
+import json
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.output_writers import FIELDS, write_csv, write_jsonl
+
+
+def _emails(count):
+    return [
+        EmailSummary(
+            f"id{i}",
+            f"thread{i}",
+            f"Sender {i} <s{i}@x.com>",
+            f'Subject, "quoted" é {i}',
+            "Mon, 1 Jan 2024 12:00:00 +0000",
+            1704110400000 + i,
+        )
+        for i in range(count)
+    ]
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class TestWriteJsonl:
+    def test_writes_one_object_per_line(self):
+        out = io.StringIO()
+
+        assert write_jsonl(_emails(3), out) == 3
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [row["id"] for row in rows] == ["id0", "id1", "id2"]
+        assert rows[0] == {
+            "id": "id0",
+            "thread_id": "thread0",
+            "from": "Sender 0 <s0@x.com>",
+            "subject": 'Subject, "quoted" é 0',
+            "date": "Mon, 1 Jan 2024 12:00:00 +0000",
+            "internal_date": 1704110400000,
+            "message_count": 1,
+        }
+
+    def test_accepts_dictionaries(self):
+        out = io.StringIO()
+
+        write_jsonl([{"from": "a@x.com", "subject": "S"}], out)
+
+        assert json.loads(out.getvalue())["from"] == "a@x.com"
+
+    def test_writes_in_chunks(self):
+        out = CountingStream()
+
+        write_jsonl(_emails(5), out, flush_every=2)
+
+        assert out.writes == 3
+        assert out.flushes == 3
+        assert len(out.getvalue().splitlines()) == 5
+
+    def test_consumes_lazily(self):
+        out = io.StringIO()
+        seen = []
+
+        def _generate():
+            for email in _emails(4):
+                seen.append(email.id)
+                # Earlier chunks are written before later emails exist
+                assert out.getvalue().count("\n") >= (len(seen) - 1) // 2 * 2
+                yield email
+
+        write_jsonl(_generate(), out, flush_every=2)
+
+        assert len(seen) == 4
+
+    def test_writes_requested_headers_and_snippet(self):
+        email_data = EmailSummary(
+            "a", snippet="Hello", headers={"To": "me@x.com"}
+        )
+        out = io.StringIO()
+
+        write_jsonl([email_data], out, headers=["To", "Cc"], snippet=True)
+
+        row = json.loads(out.getvalue())
+        assert row["snippet"] == "Hello"
+        assert row["headers"] == {"To": "me@x.com", "Cc": ""}
+
+
+class TestWriteCsv:
+    def test_writes_header_and_rows(self):
+        out = io.StringIO()
+
+        assert write_csv(_emails(2), out) == 2
+
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        assert rows[0] == list(FIELDS)
+        assert rows[1][3] == 'Subject, "quoted" é 0'
+        assert rows[2][0] == "id1"
+
+    def test_writes_requested_headers_and_snippet(self):
+        email_data = EmailSummary("a", headers={"Cc": "you@x.com"})
+        out = io.StringIO()
+
+        write_csv([email_data], out, headers=["To", "Cc"], snippet=True)
+
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        assert rows[0] == [*FIELDS, "snippet", "To", "Cc"]
+        assert rows[1][-3:] == ["", "", "you@x.com"]
+
+    def test_empty(self):
+        out = io.StringIO()
+
+        assert write_csv([], out) == 0
+        assert out.getvalue() == ",".join(FIELDS) + "\n"
@@ -0,0 +1,36 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import io
+import pytest
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.output_writers import WRITERS
+
+pytest.importorskip("pytest_benchmark")
+
+COUNT = 20_000
+
+
+def _emails(count):
+    return [
+        EmailSummary(
+            f"id{i}",
+            f"thread{i}",
+            f"Sender {i} <sender{i}@example.com>",
+            f"Quarterly report {i} " + "x" * (i % 120),
+            f"Mon, {i % 28 + 1} Jan 2024 {i % 24:02d}:00:00 +0000",
+            1704110400000 + i,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("output_format", sorted(WRITERS))
+def test_benchmark_writer(benchmark, output_format):
+    emails = _emails(COUNT)
+    writer = WRITERS[output_format]
+
+    written = benchmark.pedantic(
+        lambda: writer(emails, io.StringIO()), rounds=3
+    )
+
+    assert written == COUNT
@@ -0,0 +1,174 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import pytest
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence
+from gmail_cli.rate_limiter import (
+    AdaptiveConcurrency,
+    GmailRateLimiter,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_acquire_within_capacity_does_not_wait(self):
+        clock = FakeClock()
+        bucket = TokenBucket(5, clock=clock, sleep=clock.sleep)
+
+        for _ in range(5):
+            assert bucket.acquire() == 0
+
+        assert not clock.sleeps
+
+    def test_acquire_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2, capacity=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire(2)
+
+        assert bucket.acquire() == 0.5
+        assert clock.now == 0.5
+
+    def test_refill_is_capped_at_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(1, capacity=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire(2)
+        clock.now = 100.0
+
+        bucket.acquire(2)
+        assert bucket.acquire() == 1.0
+
+    def test_try_acquire_does_not_wait(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2, capacity=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire(2)
+
+        assert bucket.try_acquire() == 0.5
+        clock.now = 0.5
+        assert bucket.try_acquire() == 0
+        assert not clock.sleeps
+
+    def test_request_larger_than_capacity_waits_for_full_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(1, capacity=1, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire(5) == 0
+        assert bucket.acquire(1) == 5.0
+
+
+def _list_request(responses):
+    http = HttpMockSequence(responses)
+    service = build("gmail", "v1", http=http, static_discovery=True)
+    # pylint: disable=no-member
+    return service.users().messages().list(userId="me"), http
+
+
+OK = ({"status": "200"}, json.dumps({"messages": []}))
+
+
+class TestAdaptiveConcurrency:
+    def test_throttle_halves_limit(self):
+        concurrency = AdaptiveConcurrency(8)
+        concurrency.acquire()
+        concurrency.release(throttled=True)
+
+        assert concurrency.limit == 4
+
+    def test_success_grows_limit_back(self):
+        concurrency = AdaptiveConcurrency(2)
+        concurrency.limit = 1.0
+        concurrency.acquire()
+        concurrency.release()
+
+        assert concurrency.limit == 2.0
+
+    def test_limit_never_below_one(self):
+        concurrency = AdaptiveConcurrency(1)
+        for _ in range(3):
+            concurrency.acquire()
+            concurrency.release(throttled=True)
+
+        assert concurrency.limit == 1.0
+
+
+class TestGmailRateLimiter:
+    def test_execute_charges_quota_units(self):
+        request, _ = _list_request([OK])
+        limiter = GmailRateLimiter()
+
+        limiter.execute(request, "messages.list", calls=2)
+
+        # pylint: disable=protected-access
+        assert limiter.bucket._tokens == pytest.approx(240, abs=1)
+
+    def test_execute_honors_retry_after(self):
+        request, http = _list_request(
+            [({"status": "429", "retry-after": "3"}, "{}"), OK]
+        )
+        sleeps = []
+        limiter = GmailRateLimiter(sleep=sleeps.append)
+
+        assert limiter.execute(request, "messages.list") == {"messages": []}
+        assert sleeps == [3.0]
+        assert len(http.request_sequence) == 2
+
+    def test_execute_backs_off_with_jitter(self):
+        request, _ = _list_request(
+            [({"status": "503"}, "{}"), ({"status": "500"}, "{}"), OK]
+        )
+        sleeps = []
+        limiter = GmailRateLimiter(base_delay=1.0, sleep=sleeps.append)
+
+        limiter.execute(request, "messages.list")
+
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 1.0
+        assert 0 <= sleeps[1] <= 2.0
+        assert limiter.throttled == 2
+
+    def test_execute_retries_403_rate_limit(self):
+        error = {"error": {"errors": [{"reason": "rateLimitExceeded"}]}}
+        request, _ = _list_request(
+            [({"status": "403"}, json.dumps(error)), OK]
+        )
+        limiter = GmailRateLimiter(sleep=lambda _: None)
+
+        assert limiter.execute(request, "messages.list") == {"messages": []}
+
+    def test_execute_does_not_retry_other_errors(self):
+        request, http = _list_request([({"status": "404"}, "{}")])
+        limiter = GmailRateLimiter(sleep=lambda _: None)
+
+        with pytest.raises(HttpError):
+            limiter.execute(request, "messages.list")
+        assert len(http.request_sequence) == 1
+
+    def test_execute_gives_up_after_max_retries(self):
+        request, http = _list_request([({"status": "429"}, "{}")] * 3)
+        limiter = GmailRateLimiter(max_retries=2, sleep=lambda _: None)
+
+        with pytest.raises(HttpError):
+            limiter.execute(request, "messages.list")
+        assert len(http.request_sequence) == 3
+
+    def test_throttling_reduces_concurrency(self):
+        request, _ = _list_request([({"status": "429"}, "{}"), OK])
+        limiter = GmailRateLimiter(max_concurrency=8, sleep=lambda _: None)
+
+        limiter.execute(request, "messages.list")
+
+        assert limiter.concurrency.limit < 8
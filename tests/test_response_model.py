@@ -0,0 +1,59 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+from gmail_cli import response_model
+from gmail_cli.response_model import FastJsonModel
+
+MESSAGE = {
+    "id": "18c",
+    "internalDate": "1704110400000",
+    "payload": {
+        "headers": [
+            {"name": "From", "value": "Zoë <zoe@example.com>"},
+            {"name": "Subject", "value": "Café"},
+        ]
+    },
+}
+
+
+class TestFastJsonModel:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            json.dumps(MESSAGE).encode(),
+            json.dumps(MESSAGE, ensure_ascii=False).encode(),
+            json.dumps(MESSAGE),
+        ],
+    )
+    def test_decodes_like_json_model(self, content):
+        assert FastJsonModel().deserialize(content) == (
+            JsonModel().deserialize(content)
+        )
+
+    def test_non_json_body_is_returned_as_text(self):
+        assert FastJsonModel().deserialize(b"Not Found") == "Not Found"
+        assert FastJsonModel().deserialize("Not Found") == "Not Found"
+
+    def test_data_wrapper(self):
+        model = FastJsonModel(data_wrapper=True)
+
+        assert model.deserialize(b'{"data": {"id": "a"}}') == {"id": "a"}
+
+    def test_error_status_raises(self):
+        response = httplib2.Response({"status": "404"})
+
+        with pytest.raises(HttpError):
+            FastJsonModel().response(response, b'{"error": {}}')
+
+    def test_falls_back_to_stdlib_json(self, monkeypatch):
+        monkeypatch.setattr(response_model, "orjson", None)
+        monkeypatch.setattr(response_model, "_loads", json.loads)
+        model = FastJsonModel()
+
+        assert model.backend == "json"
+        assert model.deserialize(json.dumps(MESSAGE).encode()) == MESSAGE
+        assert model.deserialize(b"<html>") == "<html>"
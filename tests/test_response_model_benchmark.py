@@ -0,0 +1,48 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import json
+import httplib2
+import pytest
+from googleapiclient.model import JsonModel
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.gmail_client import GmailClient
+from gmail_cli.gmail_emulator import GmailEmulator
+from gmail_cli.response_model import FastJsonModel
+
+pytest.importorskip("pytest_benchmark")
+
+COUNT = 5_000
+RESPONSE = httplib2.Response({"status": "200"})
+
+
+def _bodies(fields):
+    """Encode metadata responses as served by the Gmail emulator."""
+    query = "format=metadata&metadataHeaders=From&metadataHeaders=Subject"
+    query += "&metadataHeaders=Date"
+    if fields:
+        query += f"&fields={fields}"
+    bodies = []
+    # The emulator binds its socket on creation; close it when done
+    with GmailEmulator(message_count=COUNT) as emulator:
+        for index in range(COUNT):
+            _, body = emulator.handle(
+                "GET", f"/gmail/v1/users/me/messages/{index:016x}?{query}"
+            )
+            bodies.append(json.dumps(body).encode())
+    return bodies
+
+
+@pytest.mark.parametrize("fields", ["", GmailClient.MESSAGE_FIELDS])
+@pytest.mark.parametrize("model", [JsonModel, FastJsonModel])
+def test_benchmark_response_model(benchmark, model, fields):
+    bodies = _bodies(fields)
+    response = model().response
+
+    emails = benchmark(
+        lambda: [
+            EmailSummary.from_message(response(RESPONSE, body))
+            for body in bodies
+        ]
+    )
+
+    assert emails[-1].subject == f"Synthetic message {COUNT - 1}"
@@ -0,0 +1,100 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import time
+from gmail_cli.email_summary import EmailSummary
+from gmail_cli.search_index import SearchIndex
+
+
+def _email(message_id, sender, subject, snippet="", internal_date=0):
+    return EmailSummary(
+        message_id,
+        sender=sender,
+        subject=subject,
+        date="Mon, 1 Jan 2024 12:00:00 +0000",
+        internal_date=internal_date,
+        snippet=snippet,
+    )
+
+
+EMAILS = [
+    _email("a", "Alice <alice@example.com>", "Invoice March", "", 1),
+    _email("b", "Bob <bob@example.com>", "Lunch", "Invoice attached", 2),
+    _email("c", "Carol <carol@example.org>", "Weekly report", "", 3),
+]
+
+
+class TestSearchIndex:
+    def test_matches_sender_subject_and_snippet(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+        index.add_many(EMAILS)
+
+        # Newest first
+        assert [e.id for e in index.search("invoice")] == ["b", "a"]
+        assert [e.id for e in index.search("carol")] == ["c"]
+        assert [e.id for e in index.search("2024")] == ["c", "b", "a"]
+
+    def test_every_word_must_match_by_prefix(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+        index.add_many(EMAILS)
+
+        assert [e.id for e in index.search("ali inv")] == ["a"]
+        assert not index.search("alice lunch")
+
+    def test_query_syntax_is_searched_literally(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+        index.add_many(EMAILS)
+
+        assert [e.id for e in index.search("alice@example.com")] == ["a"]
+        assert not index.search('AND "NEAR(')
+        assert not index.search("   ")
+
+    def test_returns_full_records(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+        index.add_many(EMAILS)
+
+        assert index.search("weekly") == [EMAILS[2]]
+
+    def test_adds_only_new_emails(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+
+        assert index.add_many(EMAILS[:2]) == 2
+        assert index.add_many(EMAILS) == 1
+        assert len(index) == 3
+
+    def test_fills_in_missing_snippets(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+        index.add_many([_email("a", "Alice", "Hello")])
+
+        assert not index.search("attached")
+        assert index.add_many([_email("a", "Alice", "Hello", "Attached")]) == 1
+        assert index.search("attached")[0].snippet == "Attached"
+        assert len(index) == 1
+
+    def test_without_snippet(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+        index.add_many(EMAILS)
+
+        assert index.without_snippet(["a", "b", "d"]) == {"a", "d"}
+        assert index.without_snippet([]) == set()
+
+    def test_persists_between_runs(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        index = SearchIndex(path)
+        index.add_many(EMAILS)
+        index.close()
+
+        assert len(SearchIndex(path).search("report")) == 1
+
+    def test_searches_large_index_in_milliseconds(self, tmp_path):
+        index = SearchIndex(str(tmp_path / "index.db"))
+        index.add_many(
+            _email(str(i), f"Sender {i % 500}", f"Subject {i}", "", i)
+            for i in range(20_000)
+        )
+
+        started = time.perf_counter()
+        matches = index.search("subject 12345")
+        elapsed = time.perf_counter() - started
+
+        assert [e.id for e in matches] == ["12345"]
+        assert elapsed < 0.05
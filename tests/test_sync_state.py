@@ -0,0 +1,29 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring,missing-function-docstring
+from gmail_cli.sync_state import SyncState
+
+
+class TestSyncState:
+    def test_load_missing_file(self, tmp_path):
+        state = SyncState.load(str(tmp_path / "state.json"))
+        assert state.history_id is None
+        assert not state.unread_ids
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "state.json")
+        SyncState(path, "42", ["b", "a"]).save()
+
+        state = SyncState.load(path)
+        assert state.history_id == "42"
+        assert state.unread_ids == ["b", "a"]
+
+    def test_load_invalid_file(self, tmp_path, capsys):
+        path = tmp_path / "state.json"
+        path.write_text("not json", encoding="utf-8")
+
+        state = SyncState.load(str(path))
+        assert state.history_id is None
+        # stdout may carry --format jsonl/csv output
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Error loading sync state" in captured.err